@@ -1 +1,24 @@
-from .assistant import Assistant
+# Heavy subsystems are imported on first use so that CLI startup stays cheap
+_LAZY_ATTRIBUTES = {
+    "Assistant": ".assistant",
+    "DeviceModel": ".dts.device",
+    "load_device": ".dts.device",
+    "load_device_data": ".dts.artifacts",
+    "PinmuxMatrix": ".dts.pinmux_matrix",
+    "load_dts": ".dts.dts_parser",
+    "parse_dts": ".dts.dts_parser",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRIBUTES))
@@ -1,8 +1,20 @@
 import logging
+from importlib import import_module
 from logging import Logger
-from .logger import setup_logger
+from .logger import enable_async_logging, redirect_stdout_handlers, setup_logger
 import sys
-from .dts.builder import DeviceTreeSourceBuilder
+
+# Action handlers: action -> (module, class, method). Modules are imported on demand so that
+# argument parsing and --help do not pay for the parsers, builders, yaml and zipfile.
+ACTIONS = {
+    "build_dts": ("nxp_utils.dts.builder", "DeviceTreeSourceBuilder", "build"),
+    "query_dts": ("nxp_utils.dts.builder", "DeviceTreeSourceBuilder", "query"),
+    "diff_archives": ("nxp_utils.dts.archive_diff", "ArchiveDiff", "diff"),
+    "catalog": ("nxp_utils.dts.catalog", "PackageCatalog", "search"),
+    "diff_dts": ("nxp_utils.dts.dts_import", "DtsImport", "diff"),
+    "import_dts": ("nxp_utils.dts.dts_import", "DtsImport", "import_config"),
+    "query_stream": ("nxp_utils.dts.query_stream", "QueryStream", "run"),
+}
 
 
 class Assistant:
@@ -17,6 +29,14 @@ class Assistant:
             handler.setFormatter(formatter)
             self.log.addHandler(handler)
 
+    def enable_async_logging(self):
+        """Moves log formatting and output to a background writer thread."""
+        enable_async_logging(self.log)
+
+    def log_to_stderr(self):
+        """Moves log output off stdout, for actions whose results are written to stdout."""
+        redirect_stdout_handlers(self.log)
+
     def set_log_level(self, level: str):
         """Sets the logging level based on a string input."""
         log: Logger = self.log
@@ -27,14 +47,21 @@ class Assistant:
         log.debug(f"Log level set to {level.upper()}")
 
     def run(self, **kwargs) -> bool:
+        profile_path = kwargs.pop("profile_path", None)
+        stats_path = kwargs.pop("stats_path", None)
+        if profile_path or stats_path:
+            from .profiling import run_instrumented
+            return run_instrumented(lambda: self._run(**kwargs), profile_path=profile_path, stats_path=stats_path)
+        return self._run(**kwargs)
+
+    def _run(self, **kwargs) -> bool:
         log: Logger = self.log
         log.debug("running assistant", extra=kwargs)
 
-        if kwargs.get("action") == "build_dts":
-            builder = DeviceTreeSourceBuilder(logger=self.log, **kwargs)
-            return builder.build()
-        elif kwargs.get("action") == "query_dts":
-            builder = DeviceTreeSourceBuilder(logger=self.log, **kwargs)
-            return builder.query()
-        
+        handler = ACTIONS.get(kwargs.get("action"))
+        if handler:
+            module_name, class_name, method_name = handler
+            handler_class = getattr(import_module(module_name), class_name)
+            return getattr(handler_class(logger=self.log, **kwargs), method_name)()
+
         raise Exception(f"No valid action specified in run command. Got: {kwargs.get("action")}")
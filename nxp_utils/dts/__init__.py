@@ -1 +1,47 @@
-from .builder import DeviceTreeSourceBuilder
\ No newline at end of file
+# Submodules are imported on first use, so that importing one handler module does not pull
+# in the loader, the parsers and yaml along with this package
+_LAZY_ATTRIBUTES = {
+    "DeviceTreeSourceBuilder": ".builder",
+    "DeviceModel": ".device",
+    "load_device": ".device",
+    "clear_device_cache": ".device",
+    "device_cache_info": ".device",
+    "set_device_cache_size": ".device",
+    "PinmuxMatrix": ".pinmux_matrix",
+    "PIN_DECODERS": ".pin_decoders",
+    "PinDecoder": ".pin_decoders",
+    "PinLocation": ".pin_decoders",
+    "decoder_for": ".pin_decoders",
+    "register_pin_decoder": ".pin_decoders",
+    "PinPropertyIndex": ".pin_properties",
+    "QUERY_HANDLERS": ".query_stream",
+    "PinQueryIndex": ".query_stream",
+    "QueryStream": ".query_stream",
+    "register_query": ".query_stream",
+    "dump_device_data": ".artifacts",
+    "load_device_data": ".artifacts",
+    "normalize_device_data": ".artifacts",
+    "DtsSyntaxError": ".dts_parser",
+    "load_dts": ".dts_parser",
+    "parse_dts": ".dts_parser",
+    "BoardConfigError": ".board_config",
+    "ConfigIssue": ".board_config",
+    "clear_fragment_cache": ".board_config",
+    "fragment_cache_info": ".board_config",
+    "load_board_config": ".board_config",
+    "resolve_board_config": ".board_config",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRIBUTES))
@@ -0,0 +1,178 @@
+import hashlib
+import json
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from logging import Logger
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from .loader import ConfigToolsDataLoader
+from ..logger import redirect_stdout_handlers
+from ..profiling import record_count, stage
+
+# (alt_mode, peripheral, signal, mux_value, func_label)
+Connection = Tuple[str, str, str, str, str]
+
+
+def pin_connections(signal_to_pin_map: Dict[str, Any]) -> Dict[str, Tuple[Connection, ...]]:
+    """Inverts the Peripheral -> Signal -> options map into Pin -> sorted connection set."""
+    pins: Dict[str, List[Connection]] = {}
+    for peri_id, signals in signal_to_pin_map.items():
+        for sig_id, options in signals.items():
+            for opt in options:
+                pins.setdefault(opt["base_pin"], []).append(
+                    (opt["alt_mode"], peri_id, sig_id, opt["mux_value"], opt["func_label"]))
+    return {pin: tuple(sorted(set(connections))) for pin, connections in pins.items()}
+
+
+def connection_digest(connections: Tuple[Connection, ...]) -> str:
+    """
+    Stable digest of a pin's connection set. hash() is salted per process, so it cannot be
+    compared across the worker processes that parse the two archives.
+    """
+    return hashlib.blake2b(repr(connections).encode("utf-8"), digest_size=8).hexdigest()
+
+
+def load_archive_pins(archive_path: str) -> Dict[str, Any]:
+    """
+    Loads one archive and returns its identity and per-pin connection sets with digests.
+    Runs in a worker process; the result only holds plain data so it pickles cheaply.
+    """
+    log = logging.getLogger("nxp_utils.archive_diff")
+    loader = ConfigToolsDataLoader(logger=log, user_board_config_file=None, data_file=archive_path, mode="diff_archives")
+    if not loader.load_all():
+        raise RuntimeError(f"Failed to load ConfigToolsData archive {archive_path}")
+    signal_data = loader.load_signal_config()
+    if not signal_data:
+        raise RuntimeError(f"Failed to parse the signal configuration of {archive_path}")
+
+    pins = pin_connections(signal_data.signal_to_pin_map)
+    return {
+        "path": archive_path,
+        "data_version": loader.data_version,
+        "processor": loader.mex_config.get_processor_name(),
+        "package": loader.mex_config.get_package_name(),
+        "pins": pins,
+        "digests": {pin: connection_digest(connections) for pin, connections in pins.items()},
+    }
+
+
+@dataclass
+class ConnectionChange:
+    kind: str    # "added", "removed" or "changed"
+    peripheral: str
+    signal: str
+    alt_mode: str
+    before: Optional[Dict[str, str]] = None
+    after: Optional[Dict[str, str]] = None
+
+
+@dataclass
+class PinChange:
+    pin: str
+    kind: str    # "added", "removed" or "changed"
+    connections: List[ConnectionChange] = field(default_factory=list)
+
+
+def _describe(connection: Connection) -> Dict[str, str]:
+    alt_mode, _, _, mux_value, func_label = connection
+    return {"alt_mode": alt_mode, "mux_value": mux_value, "func_label": func_label}
+
+
+def diff_pin(pin: str, before: Tuple[Connection, ...], after: Tuple[Connection, ...]) -> PinChange:
+    """
+    Detailed comparison of one pin; connections are matched by (peripheral, signal, alt_mode),
+    since a pin may route the same signal through more than one alternate.
+    """
+    old = {(c[1], c[2], c[0]): c for c in before}
+    new = {(c[1], c[2], c[0]): c for c in after}
+    change = PinChange(pin, "changed")
+    for key, connection in old.items():
+        other = new.get(key)
+        if other is None:
+            change.connections.append(ConnectionChange("removed", *key, before=_describe(connection)))
+        elif other != connection:
+            change.connections.append(ConnectionChange("changed", *key, before=_describe(connection), after=_describe(other)))
+    for key, connection in new.items():
+        if key not in old:
+            change.connections.append(ConnectionChange("added", *key, after=_describe(connection)))
+    return change
+
+
+def diff_archive_pins(a: Dict[str, Any], b: Dict[str, Any], pins: Optional[Iterable[str]] = None) -> List[PinChange]:
+    """
+    Compares the per-pin digests of two loaded archives and walks the connection sets only
+    for pins whose digests differ. `pins` restricts the comparison, e.g. to a board config.
+    """
+    names = set(pins) if pins is not None else set(a["digests"]) | set(b["digests"])
+    changes: List[PinChange] = []
+    for pin in sorted(names):
+        digest_a = a["digests"].get(pin)
+        digest_b = b["digests"].get(pin)
+        if digest_a == digest_b:
+            continue
+        if digest_a is None:
+            changes.append(PinChange(pin, "added", [ConnectionChange("added", c[1], c[2], c[0], after=_describe(c)) for c in b["pins"][pin]]))
+        elif digest_b is None:
+            changes.append(PinChange(pin, "removed", [ConnectionChange("removed", c[1], c[2], c[0], before=_describe(c)) for c in a["pins"][pin]]))
+        else:
+            changes.append(diff_pin(pin, a["pins"][pin], b["pins"][pin]))
+    return changes
+
+
+class ArchiveDiff:
+    """Compares the pin connections of two ConfigToolsData releases."""
+
+    def __init__(self, logger: Logger, **kwargs):
+        self.log = logger
+        self.archive_paths: List[str] = kwargs.get("archive_paths") or []
+        self.user_board_config_file: Optional[str] = kwargs.get("user_board_config_file_path")
+        self.report_path: Optional[str] = kwargs.get("diff_report_path")
+
+    def _board_pins(self) -> Optional[List[str]]:
+        if not self.user_board_config_file:
+            return None
+        loader = ConfigToolsDataLoader(logger=self.log, user_board_config_file=self.user_board_config_file, data_file=None)
+        board_config = loader.parse_user_board_config(self.user_board_config_file).get("board_config", {})
+        return [entry["pin"] for entry in board_config.get("mapping", []) if entry.get("pin")]
+
+    def diff(self) -> bool:
+        log: Logger = self.log
+        if len(self.archive_paths) != 2:
+            log.error("Archive diff needs exactly two archives", extra={"archive_paths": self.archive_paths})
+            return False
+
+        board_pins = self._board_pins()
+
+        # Both archives are parsed at the same time in separate processes
+        with stage(log, "diff.load_archives"):
+            with ProcessPoolExecutor(max_workers=2) as pool:
+                a, b = pool.map(load_archive_pins, self.archive_paths)
+
+        with stage(log, "diff.compare") as info:
+            changes = diff_archive_pins(a, b, board_pins)
+            compared = len(board_pins) if board_pins is not None else len(set(a["digests"]) | set(b["digests"]))
+            info["pins_compared"] = compared
+            info["pins_changed"] = len(changes)
+        record_count("diff.pins_compared", compared)
+        record_count("diff.pins_changed", len(changes))
+
+        report = {
+            "archives": [{k: archive[k] for k in ("path", "data_version", "processor", "package")} for archive in (a, b)],
+            "filter": {"board_config": self.user_board_config_file, "pins": board_pins},
+            "summary": {
+                "pins_compared": compared,
+                "unchanged": compared - len(changes),
+                **{kind: sum(1 for c in changes if c.kind == kind) for kind in ("changed", "added", "removed")},
+            },
+            "changes": [asdict(c) for c in changes],
+        }
+
+        if self.report_path:
+            with open(self.report_path, "w") as f:
+                json.dump(report, f, indent=2)
+            log.info("Archive diff report written to %s", self.report_path, extra=report["summary"])
+        else:
+            # stdout carries the report
+            redirect_stdout_handlers(log)
+            print(json.dumps(report, indent=2))
+        return True
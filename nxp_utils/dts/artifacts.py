@@ -0,0 +1,157 @@
+from types import MappingProxyType
+from typing import Any, Dict, List
+import yaml
+from .board_config import SafeLoader
+from .device import DeviceModel, freeze
+from .pin_decoders import decoder_for
+from .pin_properties import PinPropertyIndex
+from .signal_config import SignalConfiguration
+
+SafeDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+# expanded: one YAML file per parsed structure, as held in memory
+# normalized: a single file where types, pins and descriptions are written once
+ARTIFACT_FORMATS = ("expanded", "normalized")
+NORMALIZED_FILE = "device_data.yaml"
+NORMALIZED_FORMAT = "nxp-utils/device-data/1"
+
+# Columns of a connection row; pin is the pin's coords, the key of the pins table
+CONNECTION_FIELDS = ("pin", "func_label", "mux_value", "alt_mode")
+
+
+def expanded_artifacts(signal_config: SignalConfiguration) -> Dict[str, Any]:
+    """File name -> content of the expanded artifacts."""
+    return {
+        "signal_to_pin_map.yaml": {"signal_to_pin_map": signal_config.signal_to_pin_map},
+        "peripherals.yaml": {"peripherals": signal_config.peripherals},
+        "peripheral_types.yaml": {"peripheral_types": signal_config.peripheral_types},
+        "functional_properties.yaml": {"functional_properties": signal_config.functional_properties},
+    }
+
+
+def normalize_device_data(signal_config: SignalConfiguration, archive_path: str = "", processor: str = "",
+                          package: str = "", data_version: str = "unknown") -> Dict[str, Any]:
+    """
+    The normalized form of a parsed package. Peripherals name their type instead of carrying
+    its spec. Each pin is written once under its coords, referencing its set of functional
+    properties, and a connection is a row of CONNECTION_FIELDS referencing the pin. A function
+    label's description is written once; a pin only lists the descriptions that differ from it.
+    """
+    pins: Dict[str, Dict[str, Any]] = {}
+    descriptions: Dict[str, str] = {}
+    connections: Dict[str, Dict[str, List[List[Any]]]] = {}
+    for peri_id, signals in signal_config.signal_to_pin_map.items():
+        rows = connections[peri_id] = {}
+        for sig_id, options in signals.items():
+            rows[sig_id] = [[opt["coords"], opt["func_label"], opt["mux_value"], opt["alt_mode"]] for opt in options]
+            for opt in options:
+                pin = pins.get(opt["coords"])
+                if pin is None:
+                    pin = pins[opt["coords"]] = {"name": opt["base_pin"], "routable": opt["is_routable"]}
+                label, description = opt["func_label"], opt["description"]
+                if descriptions.setdefault(label, description) != description:
+                    pin.setdefault("descriptions", {})[label] = description
+
+    # Pins mostly share the same functional properties, each distinct set is written once
+    property_sets: List[Dict[str, List[str]]] = []
+    set_ids: Dict[Any, int] = {}
+    for pin in pins.values():
+        states = signal_config.pin_properties.pins.get(pin["name"]) if pin["routable"] else None
+        if states:
+            key = tuple(states.items())
+            if key not in set_ids:
+                set_ids[key] = len(property_sets)
+                property_sets.append({prop_id: sorted(s) for prop_id, s in states.items()})
+            pin["properties"] = set_ids[key]
+
+    return {
+        "format": NORMALIZED_FORMAT,
+        "archive_path": archive_path,
+        "processor": processor,
+        "package": package,
+        "data_version": data_version,
+        "part_num": signal_config.part_num,
+        "controller_type": signal_config.controller_type,
+        "counts": signal_config.element_counts(),
+        "functional_properties": signal_config.functional_properties,
+        "peripheral_types": signal_config.peripheral_types,
+        "peripherals": {peri_id: {"name": p["name"], "type": p["type"]} for peri_id, p in signal_config.peripherals.items()},
+        "descriptions": descriptions,
+        "pin_property_sets": property_sets,
+        "pins": pins,
+        "connection_fields": list(CONNECTION_FIELDS),
+        "connections": connections,
+    }
+
+
+def expand_device_data(data: Dict[str, Any]) -> DeviceModel:
+    """Rebuilds the in-memory views of normalized device data as a read-only DeviceModel."""
+    if data.get("format") != NORMALIZED_FORMAT:
+        raise ValueError(f"unsupported device data format {data.get('format')!r}, expected {NORMALIZED_FORMAT!r}")
+    if tuple(data.get("connection_fields") or ()) != CONNECTION_FIELDS:
+        raise ValueError(f"unsupported connection fields {data.get('connection_fields')!r}")
+
+    peripheral_types = data.get("peripheral_types") or {}
+    peripherals = {}
+    for peri_id, p in (data.get("peripherals") or {}).items():
+        if p["type"] not in peripheral_types:
+            raise ValueError(f"peripheral type {p['type']} for {peri_id} not found in peripheral types registry")
+        peripherals[peri_id] = {"id": peri_id, "name": p["name"], "type": p["type"], "signals": {},
+                                "peripheral_spec": peripheral_types[p["type"]]}
+
+    pins = data.get("pins") or {}
+    descriptions = data.get("descriptions") or {}
+    signal_to_pin_map: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+    for peri_id, signals in (data.get("connections") or {}).items():
+        mapped = signal_to_pin_map[peri_id] = {}
+        for sig_id, rows in signals.items():
+            options = mapped[sig_id] = []
+            for coords, func_label, mux_value, alt_mode in rows:
+                pin = pins[coords]
+                overrides = pin.get("descriptions")
+                description = overrides[func_label] if overrides and func_label in overrides else descriptions.get(func_label, "")
+                options.append({
+                    "base_pin": pin["name"],
+                    "is_routable": pin["routable"],
+                    "mux_value": mux_value,
+                    "alt_mode": alt_mode,
+                    "coords": coords,
+                    "func_label": func_label,
+                    "description": description,
+                })
+
+    property_sets = [{prop_id: frozenset(states) for prop_id, states in props.items()}
+                     for props in data.get("pin_property_sets") or []]
+    pin_states = {pin["name"]: property_sets[pin["properties"]] for pin in pins.values() if "properties" in pin}
+    functional_properties = data.get("functional_properties") or {}
+    # Pin locations are not stored; decoding the pin names again is cheaper than reading them
+    controller_type = data.get("controller_type")
+    pin_locations = decoder_for(controller_type).locate(pin["name"] for pin in pins.values() if pin["routable"])
+    return DeviceModel(archive_path=data.get("archive_path", ""),
+                       processor=data.get("processor", ""),
+                       package=data.get("package", ""),
+                       data_version=data.get("data_version", "unknown"),
+                       part_num=data.get("part_num"),
+                       peripheral_types=freeze(peripheral_types),
+                       peripherals=freeze(peripherals),
+                       functional_properties=freeze(functional_properties),
+                       pin_properties=PinPropertyIndex(functional_properties, pin_states),
+                       controller_type=controller_type,
+                       pin_locations=MappingProxyType(pin_locations),
+                       signal_to_pin_map=freeze(signal_to_pin_map),
+                       counts=freeze(data.get("counts") or {}))
+
+
+def dump_device_data(data: Dict[str, Any], path: str):
+    """Writes normalized device data with libyaml's emitter when available."""
+    with open(path, "w", encoding="utf-8") as f:
+        yaml.dump(data, f, Dumper=SafeDumper, default_flow_style=None, sort_keys=False, width=120)
+
+
+def load_device_data(path: str) -> DeviceModel:
+    """Reads a device_data.yaml written with --artifact-format normalized, see expand_device_data."""
+    with open(path, encoding="utf-8") as f:
+        data = yaml.load(f, Loader=SafeLoader)
+    if not isinstance(data, dict):
+        raise ValueError(f"{path} does not hold device data")
+    return expand_device_data(data)
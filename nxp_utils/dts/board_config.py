@@ -0,0 +1,445 @@
+import copy
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+import yaml
+from .builders.generate_gpio_logic_nodes import INTERRUPT_MAP
+from ..profiling import record_count
+
+# libyaml's loader when PyYAML was built with it, the pure-Python one otherwise
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+RESOLVE_CACHE_SIZE = 65536
+
+
+class BoardConfigLoader(SafeLoader):
+    """
+    SafeLoader memoizing the implicit tag of plain scalars. Keys and enumerated values repeat
+    on every mapping entry, and matching them against the implicit resolver regexes is most
+    of the construction time of large configs.
+    """
+    _plain_tags: Dict[str, str] = {}
+
+    def resolve(self, kind, value, implicit):
+        if kind is not yaml.ScalarNode or not implicit[0]:
+            return super().resolve(kind, value, implicit)
+        tag = self._plain_tags.get(value)
+        if tag is None:
+            tag = super().resolve(kind, value, implicit)
+            if len(self._plain_tags) >= RESOLVE_CACHE_SIZE:
+                self._plain_tags.clear()
+            self._plain_tags[value] = tag
+        return tag
+
+# Keys of a board_config section naming other fragments, merged in this order before the section itself
+INCLUDE_KEYS = ("extends", "include")
+
+# An overlay entry with this key set drops the matching entry instead of merging into it
+REMOVE_KEY = "remove"
+
+# (pin, signal)
+MappingKey = Tuple[Optional[str], Optional[str]]
+
+# Schemas map a key to its type(s) or to its allowed values
+Spec = Any
+
+SECTION_SCHEMA: Dict[str, Spec] = {
+    "name": str,
+    "mapping": list,
+    "clocks": dict,
+    "extends": (str, list),
+    "include": (str, list),
+}
+
+# Keys of a mapping entry. Other keys are peripheral options and only checked when listed here.
+ENTRY_SCHEMA: Dict[str, Spec] = {
+    "signal": str,
+    "pin": str,
+    "label": str,
+    "pull": ("up", "down", "none", "disable"),
+    "drive_strength": ("low", "high"),
+    "slew_rate": ("fast", "slow"),
+    "open_drain": (True, False, "enable", "disable"),
+    "passive_filter": (True, False, "enable", "disable"),
+    "digital_filter": (True, False, "enable", "disable"),
+    "gpio_init_state": bool,
+    "gpio_interrupt": tuple(INTERRUPT_MAP) + ("kPORT_InterruptOrDMADisabled",),
+    REMOVE_KEY: bool,
+    "baud": int,
+    "sample_rate": int,
+    "clock_frequency": (int, str),
+    "protocol": str,
+    "bit_format": str,
+}
+
+REQUIRED_ENTRY_KEYS = ("signal", "pin")
+
+# A location inside a document: mapping keys and sequence indexes from the root
+KeyPath = Tuple[Any, ...]
+
+
+@dataclass(frozen=True)
+class ConfigIssue:
+    path: str
+    line: Optional[int]
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.path}:{self.line}: {self.message}" if self.line else f"{self.path}: {self.message}"
+
+
+class BoardConfigError(ValueError):
+    """A board config that cannot be read; holds every issue found."""
+
+    def __init__(self, issues: Sequence[ConfigIssue]):
+        super().__init__("\n".join(str(issue) for issue in issues))
+        self.issues = list(issues)
+
+
+class _FragmentCache:
+    """
+    Parsed board config files, keyed by content hash. A file whose real path, mtime and size
+    were seen before is not read again; a file with new identity but known content is read and
+    hashed but not parsed again. Cached fragments are shared and must not be modified.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._digests: Dict[Tuple[str, int, int], str] = {}
+        self._fragments: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: str) -> Dict[str, Any]:
+        real_path = os.path.realpath(path)
+        st = os.stat(real_path)
+        identity = (real_path, st.st_mtime_ns, st.st_size)
+        with self._lock:
+            digest = self._digests.get(identity)
+            fragment = self._fragments.get(digest) if digest else None
+            if fragment is not None:
+                self.hits += 1
+                return fragment
+
+        with open(real_path, "rb") as f:
+            data = f.read()
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        with self._lock:
+            fragment = self._fragments.get(digest)
+            if fragment is not None:
+                self.hits += 1
+                self._digests[identity] = digest
+                return fragment
+
+        fragment = _decode(data, real_path)
+        with self._lock:
+            self._fragments[digest] = fragment
+            self._digests[identity] = digest
+            self.misses += 1
+        record_count("board_config.fragments_parsed")
+        return fragment
+
+    def clear(self):
+        with self._lock:
+            self._digests.clear()
+            self._fragments.clear()
+            self.hits = self.misses = 0
+
+    def info(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._fragments)}
+
+
+_cache = _FragmentCache()
+
+
+def _decode(data: bytes, path: str) -> Dict[str, Any]:
+    """JSON or YAML by extension; other extensions are read as JSON when they start with a brace."""
+    text = data.decode("utf-8")
+    _, ext = os.path.splitext(path.lower())
+    try:
+        if ext == ".json" or (ext not in (".yaml", ".yml") and text.lstrip().startswith("{")):
+            content = json.loads(text)
+        else:
+            content = yaml.load(text, Loader=BoardConfigLoader)
+    except json.JSONDecodeError as e:
+        raise BoardConfigError([ConfigIssue(path, e.lineno, e.msg)]) from e
+    except yaml.MarkedYAMLError as e:
+        mark = e.problem_mark or e.context_mark
+        raise BoardConfigError([ConfigIssue(path, mark.line + 1 if mark else None, e.problem or str(e))]) from e
+    if not isinstance(content, dict):
+        raise BoardConfigError([ConfigIssue(path, 1, f"expected a mapping at the top level, got {type(content).__name__}")])
+    return content
+
+
+def load_fragment(path: str) -> Dict[str, Any]:
+    """Parsed content of one board config file, shared through the fragment cache; do not modify."""
+    return _cache.get(path)
+
+
+def clear_fragment_cache():
+    _cache.clear()
+
+
+def fragment_cache_info() -> Dict[str, int]:
+    """Hit and miss counts and the number of distinct fragments parsed."""
+    return _cache.info()
+
+
+def compile_check(spec: Spec) -> Callable[[Any], Optional[str]]:
+    """A function returning the problem with a value, or None when the value fits the spec."""
+    types = spec if isinstance(spec, tuple) else (spec,)
+    if all(isinstance(t, type) for t in types):
+        expected = " or ".join(t.__name__ for t in types)
+        # bool is an int subclass, but a flag is not a number
+        strict_bool = bool not in types
+
+        def check_type(value: Any) -> Optional[str]:
+            if isinstance(value, types) and not (strict_bool and isinstance(value, bool)):
+                return None
+            return f"expected {expected}, got {value!r}"
+
+        return check_type
+
+    # Compared with their type, so that True does not match 1
+    allowed = frozenset((type(v), v) for v in spec)
+    expected = ", ".join(repr(v) for v in spec)
+
+    def check_value(value: Any) -> Optional[str]:
+        try:
+            if (type(value), value) in allowed:
+                return None
+        except TypeError:
+            pass
+        return f"expected one of {expected}, got {value!r}"
+
+    return check_value
+
+
+def compile_schema(schema: Dict[str, Spec]) -> Dict[str, Callable[[Any], Optional[str]]]:
+    return {key: compile_check(spec) for key, spec in schema.items()}
+
+
+# Compiled once at import
+SECTION_CHECKS = compile_schema(SECTION_SCHEMA)
+ENTRY_CHECKS = compile_schema(ENTRY_SCHEMA)
+
+
+def check_section(section: Dict[str, Any], prefix: KeyPath = ()) -> List[Tuple[KeyPath, str]]:
+    """Every schema violation of one board_config section, as (location, message)."""
+    problems: List[Tuple[KeyPath, str]] = []
+    for key, value in section.items():
+        check = SECTION_CHECKS.get(key)
+        problem = check(value) if check else f"unknown key {key!r}"
+        if problem:
+            problems.append((prefix + (key,), f"{key}: {problem}" if check else problem))
+    for key in INCLUDE_KEYS:
+        value = section.get(key)
+        if isinstance(value, list) and not all(isinstance(reference, str) for reference in value):
+            problems.append((prefix + (key,), f"{key}: expected a list of paths"))
+
+    mapping = section.get("mapping")
+    if not isinstance(mapping, list):
+        return problems
+    entry_checks = ENTRY_CHECKS
+    for i, entry in enumerate(mapping):
+        location = prefix + ("mapping", i)
+        if not isinstance(entry, dict):
+            problems.append((location, f"mapping entry {i}: expected a mapping, got {entry!r}"))
+            continue
+        name = entry.get("signal") or f"mapping entry {i}"
+        for key in REQUIRED_ENTRY_KEYS:
+            if key not in entry:
+                problems.append((location, f"{name}: missing {key}"))
+        for key, value in entry.items():
+            check = entry_checks.get(key)
+            if check is not None:
+                problem = check(value)
+                if problem:
+                    problems.append((location + (key,), f"{name}: {key}: {problem}"))
+    return problems
+
+
+def locate(path: str, locations: Iterable[KeyPath]) -> List[Optional[int]]:
+    """
+    1-based line of each location in a YAML or JSON file, or of its deepest existing parent.
+    The file is composed into nodes once for all locations; only called when issues exist.
+    """
+    locations = list(locations)
+    try:
+        with open(path, encoding="utf-8") as f:
+            root = yaml.compose(f, Loader=SafeLoader)
+    except (OSError, UnicodeDecodeError, yaml.YAMLError):
+        return [None] * len(locations)
+
+    lines: List[Optional[int]] = []
+    for location in locations:
+        node = root
+        for step in location:
+            if isinstance(node, yaml.MappingNode):
+                child = next((value for key, value in node.value if key.value == step), None)
+            elif isinstance(node, yaml.SequenceNode) and isinstance(step, int) and step < len(node.value):
+                child = node.value[step]
+            else:
+                child = None
+            if child is None:
+                break
+            node = child
+        lines.append(node.start_mark.line + 1 if node is not None else None)
+    return lines
+
+
+def mapping_key(entry: Dict[str, Any]) -> MappingKey:
+    return entry.get("pin"), entry.get("signal")
+
+
+def merge_mappings(base: List[Dict[str, Any]], overlay: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Merges the mapping entries of an overlay into those of its base, keyed by (pin, signal).
+    A matching entry keeps its position and takes the overlay's fields; an entry with
+    `remove: true` drops it; other entries are appended in overlay order. Entries are only
+    matched against the base, so repeated entries within one fragment are kept as written.
+    """
+    merged: List[Optional[Dict[str, Any]]] = list(base)
+    index: Dict[MappingKey, int] = {mapping_key(entry): i for i, entry in enumerate(base)}
+    for entry in overlay:
+        if not isinstance(entry, dict):
+            # Reported by check_section
+            continue
+        key = mapping_key(entry)
+        position = index.get(key)
+        if entry.get(REMOVE_KEY):
+            if position is not None:
+                merged[position] = None
+                del index[key]
+            continue
+        if position is not None:
+            merged[position] = {**merged[position], **entry}
+        else:
+            merged.append(entry)
+    return [entry for entry in merged if entry is not None]
+
+
+def merge_board_configs(base: Dict[str, Any], overlay: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Merges two board_config sections: mappings with merge_mappings, nested sections such as
+    `clocks` key by key, any other value replaced by the overlay's. Neither input is modified.
+    """
+    merged = dict(base)
+    for key, value in overlay.items():
+        current = merged.get(key)
+        if key == "mapping":
+            merged[key] = merge_mappings(current or [], value if isinstance(value, list) else [])
+        elif isinstance(value, dict) and isinstance(current, dict):
+            merged[key] = {**current, **value}
+        else:
+            merged[key] = value
+    return merged
+
+
+def _references(section: Dict[str, Any], key: str) -> List[str]:
+    value = section.get(key)
+    if isinstance(value, str):
+        return [value]
+    return [reference for reference in value if isinstance(reference, str)] if isinstance(value, list) else []
+
+
+class _Resolver:
+    """
+    Resolves one board config with its fragments. With validation, each fragment is checked
+    against the schema as it is loaded, and the (pin, signal) origins of mapping entries are
+    kept to locate conflicts in the merged mapping.
+    """
+
+    def __init__(self, validate: bool = False):
+        self.validate = validate
+        self.issues: List[ConfigIssue] = []
+        # (pin, signal) -> file and location of the entry that last set it
+        self.origins: Dict[MappingKey, Tuple[str, KeyPath]] = {}
+
+    def resolve(self, path: str, stack: Tuple[str, ...] = ()) -> Dict[str, Any]:
+        real_path = os.path.realpath(path)
+        if real_path in stack:
+            raise BoardConfigError([ConfigIssue(stack[-1], None, f"include cycle: {' -> '.join(stack + (real_path,))}")])
+        try:
+            fragment = load_fragment(real_path)
+        except OSError as e:
+            raise BoardConfigError([ConfigIssue(stack[-1] if stack else path, None, f"cannot read {path}: {e.strerror}")]) from e
+        # Fragments may hold a board_config section or just its content
+        wrapped = "board_config" in fragment
+        section = fragment["board_config"] if wrapped else fragment
+        prefix: KeyPath = ("board_config",) if wrapped else ()
+        if not isinstance(section, dict):
+            raise BoardConfigError([ConfigIssue(real_path, None, f"board_config is {type(section).__name__}, expected a mapping")])
+
+        if self.validate:
+            problems = check_section(section, prefix)
+            if problems:
+                lines = locate(real_path, (location for location, _ in problems))
+                self.issues.extend(ConfigIssue(real_path, line, message) for (_, message), line in zip(problems, lines))
+            mapping = section.get("mapping")
+            for i, entry in enumerate(mapping if isinstance(mapping, list) else []):
+                if isinstance(entry, dict):
+                    self.origins[mapping_key(entry)] = (real_path, prefix + ("mapping", i))
+
+        merged: Dict[str, Any] = {}
+        base_dir = os.path.dirname(real_path)
+        for key in INCLUDE_KEYS:
+            for reference in _references(section, key):
+                merged = merge_board_configs(merged, self.resolve(os.path.join(base_dir, reference), stack + (real_path,)))
+        record_count("board_config.fragments")
+        return merge_board_configs(merged, {k: v for k, v in section.items() if k not in INCLUDE_KEYS})
+
+    def check_pin_conflicts(self, mapping: List[Dict[str, Any]], path: str):
+        """Reports every pin assigned to more than one signal in the merged mapping."""
+        pin_usage: Dict[Any, Any] = {}
+        conflicts: List[Tuple[MappingKey, str]] = []
+        for entry in mapping:
+            signal_key, chosen_pin = entry.get("signal"), entry.get("pin")
+            if chosen_pin is None:
+                continue
+            if chosen_pin in pin_usage:
+                conflicts.append(((chosen_pin, signal_key),
+                                  f"pin {chosen_pin} is assigned to both '{pin_usage[chosen_pin]}' and '{signal_key}'"))
+            else:
+                pin_usage[chosen_pin] = signal_key
+
+        by_file: Dict[str, List[Tuple[KeyPath, str]]] = {}
+        for key, message in conflicts:
+            file_path, location = self.origins.get(key, (path, ()))
+            by_file.setdefault(file_path, []).append((location, message))
+        for file_path, problems in by_file.items():
+            lines = locate(file_path, (location for location, _ in problems))
+            self.issues.extend(ConfigIssue(file_path, line, message) for (_, message), line in zip(problems, lines))
+
+
+def _fresh_copy(section: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of a merged section detached from the cached fragments; entries are flat, so they are copied shallowly."""
+    return {key: [dict(entry) for entry in value] if key == "mapping" else copy.deepcopy(value)
+            for key, value in section.items()}
+
+
+def resolve_board_config(path: str) -> Dict[str, Any]:
+    """
+    Loads a board config and everything it extends or includes, relative to the including
+    file. Bases listed in `extends` merge first, then the fragments in `include`, then the
+    file's own keys; later fragments win. Returns the merged board_config section as a
+    fresh copy that callers may modify.
+    """
+    return _fresh_copy(_Resolver().resolve(path))
+
+
+def load_board_config(path: str) -> Tuple[Dict[str, Any], List[ConfigIssue]]:
+    """
+    resolve_board_config with validation: every fragment is checked against the compiled
+    schema and the merged mapping for pins used twice. All issues are collected, with the
+    file and line they come from. Unreadable files raise BoardConfigError.
+    """
+    resolver = _Resolver(validate=True)
+    board_config = _fresh_copy(resolver.resolve(path))
+    resolver.check_pin_conflicts(board_config.get("mapping", []), os.path.realpath(path))
+    record_count("board_config.issues", len(resolver.issues))
+    return board_config, resolver.issues
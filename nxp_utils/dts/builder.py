@@ -1,7 +1,14 @@
 from logging import Logger
 from .mex_config import MicrocontrollerExportConfiguration
 from .loader import ConfigToolsDataLoader
-from .builders import generate_board_dtsi
+from .artifacts import NORMALIZED_FILE, dump_device_data, expanded_artifacts, normalize_device_data
+from .builders import PinTable, board_config_peripherals, parse_peripheral_groups
+from .emitters import EmitterContext, emit_targets
+from .name_index import NameIndex
+from .pinmux_matrix import PinmuxMatrix, parse_requirement
+from ..logger import redirect_stdout_handlers
+from ..profiling import record_output, stage
+import json
 import traceback
 from pathlib import Path
 import yaml
@@ -22,12 +29,20 @@ class DeviceTreeSourceBuilder:
         self.mex_config: MicrocontrollerExportConfiguration = None
         self.query_type: str = kwargs.get("query_type")
         self.query_args: List[str] = kwargs.get("query_args")
+        self.targets: List[str] = kwargs.get("targets") or ["zephyr"]
+        self.query_limit: int = kwargs.get("query_limit") or 20
+        self.query_with: List[str] = kwargs.get("query_with") or []
+        # Parse only the peripherals named by the board config unless asked otherwise
+        self.full_parse: bool = bool(kwargs.get("full_parse"))
+        self.write_artifacts: bool = not kwargs.get("no_artifacts")
+        self.artifact_format: str = kwargs.get("artifact_format") or "expanded"
 
         self.loader = ConfigToolsDataLoader(logger=logger,
                                             user_board_config_file=kwargs.get("user_board_config_file_path"),
                                             data_file=kwargs.get("config_tools_data_file_path"),
                                             mex_file=kwargs.get("mex_file_path"),
-                                            mode=kwargs.get("action"))
+                                            mode=kwargs.get("action"),
+                                            parse_workers=kwargs.get("parse_workers") or 1)
 
         if not self.loader.load_all():
             raise RuntimeError("ConfigToolsDataLoader failed to synchronize data sources.")
@@ -46,6 +61,7 @@ class DeviceTreeSourceBuilder:
                            "data_source": self.loader.data_file,
                            "mex_source": self.loader.mex_file,
                            "output_path": self.output_path,
+                           "targets": self.targets,
                            "is_mex_file_archived": self.loader.is_mex_file_archived
                        })
 
@@ -55,7 +71,11 @@ class DeviceTreeSourceBuilder:
         log.info(f"Starting DTS build process for {self.controller_type}")
 
         try:
-            signal_data = self.loader.load_signal_config()
+            # The artifacts describe the whole package; parsing it once beats a selective parse
+            # followed by a full one, so the selective parse only serves --no-artifacts builds.
+            parse_all = self.full_parse or self.write_artifacts
+            selection = None if parse_all else board_config_peripherals(self.loader.user_board_config)
+            signal_data = self.loader.load_signal_config(selection, controller_type=self.controller_type)
             if not signal_data:
                 self.log.error("Could not obtain signal configuration data. Aborting.")
                 return False
@@ -63,28 +83,53 @@ class DeviceTreeSourceBuilder:
             # uart_pins = signal_data.get_pins_by_peripheral("UART0")
             # log.debug(f"Found {len(uart_pins)} pins for UART0")
 
-            dts_content = generate_board_dtsi(self.loader.user_board_config, signal_data.signal_to_pin_map, log)
-
-            with open(self.output_path, "w") as f:
-                f.write(dts_content)
-                log.info("Wrote DTS to %s", self.output_path)
-
-            with open(Path.joinpath(Path(self.output_path).parent, "signal_to_pin_map.yaml"), 'w') as file:
-                yaml.dump({"signal_to_pin_map": signal_data.signal_to_pin_map}, file, default_flow_style=False, sort_keys=False)
-
-            with open(Path.joinpath(Path(self.output_path).parent, "board_mapping_config.yaml"), 'w') as file:
-                yaml.dump(self.loader.user_board_config, file, default_flow_style=False, sort_keys=False)
-
-            with open(Path.joinpath(Path(self.output_path).parent, "peripherals.yaml"), 'w') as file:
-                yaml.dump({"peripherals": signal_data.peripherals}, file, default_flow_style=False, sort_keys=False)
-
-            with open(Path.joinpath(Path(self.output_path).parent, "peripheral_types.yaml"), 'w') as file:
-                yaml.dump({"peripheral_types": signal_data.peripheral_types}, file, default_flow_style=False, sort_keys=False)
-
-            with open(Path.joinpath(Path(self.output_path).parent, "functional_properties.yaml"), 'w') as file:
-                yaml.dump({"functional_properties": signal_data.functional_properties}, file, default_flow_style=False, sort_keys=False)
-
-
+            # Resolve the board mapping once; every output target shares the result.
+            with stage(log, "resolve.peripheral_groups"):
+                peripheral_groups = parse_peripheral_groups(self.loader.user_board_config, signal_data.signal_to_pin_map, log,
+                                                            full_map=lambda: signal_data.full().signal_to_pin_map,
+                                                            pin_properties=signal_data.pin_properties)
+            clock_tree = self.loader.load_clock_tree()
+            if clock_tree is not None and self.loader.user_board_config.get("clocks"):
+                # Board-level clock settings, e.g. clocks: {OSC0: 12MHz, BUS_CLK: {divider: 3}}
+                clock_tree = clock_tree.with_overrides(self.loader.user_board_config["clocks"])
+
+            ctx = EmitterContext(board_name=self.mex_config.get_board_name(),
+                                 board_config=self.loader.user_board_config,
+                                 peripheral_groups=peripheral_groups,
+                                 pin_table=PinTable.from_groups(peripheral_groups, signal_data.pin_locations,
+                                                                signal_data.controller_type),
+                                 signal_config=signal_data,
+                                 output_path=self.output_path,
+                                 log=log,
+                                 clock_tree=clock_tree)
+            for target, paths in emit_targets(ctx, self.targets).items():
+                log.info("Wrote %s output to %s", target, ", ".join(paths))
+                for path in paths:
+                    record_output(path)
+
+            if not self.write_artifacts:
+                log.info("DTS build successful")
+                return True
+
+            full_data = signal_data.full()
+            artifacts = {"board_mapping_config.yaml": self.loader.user_board_config}
+            if self.artifact_format == "normalized":
+                artifact_path = Path.joinpath(Path(self.output_path).parent, NORMALIZED_FILE)
+                with stage(log, f"write.{NORMALIZED_FILE}", path=str(artifact_path)):
+                    dump_device_data(normalize_device_data(full_data,
+                                                           archive_path=self.loader.data_file,
+                                                           processor=self.mex_config.get_processor_name(),
+                                                           package=self.mex_config.get_package_name(),
+                                                           data_version=self.loader.data_version), str(artifact_path))
+                record_output(str(artifact_path))
+            else:
+                artifacts.update(expanded_artifacts(full_data))
+            for file_name, content in artifacts.items():
+                artifact_path = Path.joinpath(Path(self.output_path).parent, file_name)
+                with stage(log, f"write.{file_name}", path=str(artifact_path)):
+                    with open(artifact_path, 'w') as file:
+                        yaml.dump(content, file, default_flow_style=False, sort_keys=False)
+                record_output(str(artifact_path))
 
             log.info("DTS build successful")
             return True
@@ -100,10 +145,12 @@ class DeviceTreeSourceBuilder:
     def query(self) -> bool:
         """Executes the DTS query."""
         log: Logger = self.log
+        # stdout carries the query results
+        redirect_stdout_handlers(log)
         log.info(f"Starting DTS query for {self.controller_type}")
 
-        if self.query_type == "find_base_pin":
-            if len(self.query_args) != 1:
+        if self.query_type in ["find_base_pin", "complete", "routable"]:
+            if len(self.query_args or []) != 1:
                 log.error("The base_pin query argument not found", extra={"query_type": self.query_type, "query_args": self.query_args})
                 return False
         else:
@@ -111,13 +158,39 @@ class DeviceTreeSourceBuilder:
             return False
 
         try:
-            signal_data = self.loader.load_signal_config()
+            signal_data = self.loader.load_signal_config(controller_type=self.controller_type)
             if not signal_data:
                 self.log.error("Could not obtain signal configuration data. Aborting.")
                 return False
 
             if self.query_type == "find_base_pin":
                 pass
+            elif self.query_type == "complete":
+                with stage(log, "index.build"):
+                    name_index = NameIndex.from_signal_to_pin_map(signal_data.signal_to_pin_map)
+                with stage(log, "index.complete", prefix=self.query_args[0]) as info:
+                    completions = name_index.complete(self.query_args[0], limit=self.query_limit)
+                    info["results"] = len(completions)
+                for name in completions:
+                    print(name)
+            elif self.query_type == "routable":
+                with stage(log, "matrix.build") as info:
+                    matrix = PinmuxMatrix.from_signal_to_pin_map(signal_data.signal_to_pin_map)
+                    info["pins"] = len(matrix.pins)
+                    info["columns"] = len(matrix.columns)
+                name, signals = parse_requirement(self.query_args[0])
+                candidates = [(peripheral, signals) for peripheral in matrix.peripherals_matching(name)]
+                if not candidates:
+                    log.error("No peripheral matches the query", extra={"query_args": self.query_args})
+                    return False
+                used = [parse_requirement(spec) for spec in self.query_with]
+                try:
+                    with stage(log, "matrix.routable", candidates=len(candidates), used=len(used)):
+                        results = matrix.routable(candidates, used)
+                except (KeyError, ValueError) as e:
+                    log.error("Routing query failed", extra={"reason": str(e).strip("'"), "used": self.query_with})
+                    return False
+                print(json.dumps({"used": self.query_with, "candidates": results}, indent=2))
 
             log.debug("DTS query successful")
             return True
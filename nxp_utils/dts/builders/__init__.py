@@ -1,2 +1,5 @@
 from .pinctrl_builder import calculate_pcr_address
-from .generate_board_dtsi import generate_board_dtsi
\ No newline at end of file
+from .generate_board_dtsi import generate_board_dtsi, generate_board_document
+from .parse_peripheral_groups import board_config_peripherals, parse_peripheral_groups, resolve_signal
+from .pin_table import PinTable
+from .node_generators import NODE_GENERATORS, RATE_CHECKS, NodeTemplate, check_peripheral_rates, register_node_generator, register_rate_check
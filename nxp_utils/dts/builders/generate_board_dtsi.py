@@ -1,43 +1,78 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, Mapping, Optional
 from logging import Logger
-from .pin_entry import PinEntry
+from ...profiling import stage
+from ..clock_tree import ClockTree
+from ..pin_decoders import PinLocation
+from ..pin_properties import PinPropertyIndex
+from ..source_tree import DtsDocument, DtsNode
+from .pin_table import PinTable
 from .generate_pinctrl_entry import generate_pinctrl_entry
 from .generate_gpio_logic_nodes import generate_gpio_logic_nodes
 from .parse_peripheral_groups import parse_peripheral_groups
-from .generate_node_uart import generate_uart_node
-from .generate_node_i2s import generate_i2s_node
+from .node_generators import generate_peripheral_nodes
+# Built-in peripheral node generators register themselves on import
+from . import generate_node_uart, generate_node_i2s, generate_node_i2c, generate_node_spi
 
 
-def generate_board_dtsi(board_config: dict, signal_to_pin_map: Dict[str, Any], log=Logger) -> str:
+def generate_board_dtsi(board_config: dict,
+                        signal_to_pin_map: Dict[str, Any],
+                        log=Logger,
+                        peripherals: Optional[Dict[str, Any]] = None,
+                        clock_tree: Optional[ClockTree] = None,
+                        pin_properties: Optional[PinPropertyIndex] = None,
+                        pin_locations: Optional[Mapping[str, PinLocation]] = None,
+                        controller_type: Optional[str] = None) -> DtsDocument:
     """
-    Generates a full DTSI content including pinctrl and functional GPIO nodes.
+    Generates a full DTSI document including pinctrl and functional GPIO nodes.
+    With pin_properties, unsupported electrical settings are reported and left out.
+    pin_locations supplies the decoded port and index of each pin, see PinTable;
+    controller_type is the pin controller family they were decoded for.
     """
-    dtsi_content = []
-
     # First, parse the raw data into organized groups of PinEntry objects
     # This centralizes the lookup logic so you only do it once.
-    peripheral_groups = parse_peripheral_groups(board_config, signal_to_pin_map, log)
+    peripheral_groups = parse_peripheral_groups(board_config, signal_to_pin_map, log, pin_properties=pin_properties)
+
+    # Lay the groups out as a columnar table so port, index and electrical signature are
+    # derived once and shared by every generator below.
+    pin_table = PinTable.from_groups(peripheral_groups, pin_locations, controller_type)
+    return generate_board_document(pin_table, board_config, peripherals, log, clock_tree)
+
+
+def generate_board_document(pin_table: PinTable,
+                            board_config: Optional[dict] = None,
+                            peripherals: Optional[Dict[str, Any]] = None,
+                            log: Optional[Logger] = None,
+                            clock_tree: Optional[ClockTree] = None) -> DtsDocument:
+    """
+    Generates the DTSI document from already resolved pins.
+    The peripherals registry supplies the type used to pick each peripheral node generator;
+    the clock tree, when known, their module clocks.
+    """
+    document = DtsDocument()
+    peripheral_tables = pin_table.group_by("peripheral")
+
+    if not pin_table.port_controlled and len(pin_table) and log:
+        # K64_PSEL and &gpioX only describe PORT controllers
+        log.warning("Pins left out of pinctrl and GPIO nodes, no pinmux macros for controller type",
+                    extra={"controller_type": pin_table.controller_type,
+                           "pins": sorted({p.base_pin for p in pin_table.entry})})
 
     # Build the Pinctrl section. This defines the "Hardware Wiring".
-    dtsi_content.append("&pinctrl {")
-    for peri_id, pins in peripheral_groups.items():
-        node_name = f"{peri_id.lower()}_default"
-        dtsi_content.append(generate_pinctrl_entry(node_name, pins))
-    dtsi_content.append("};\n")
+    with stage(log, "generate.pinctrl"):
+        pinctrl = document.add(DtsNode("&pinctrl"))
+        for peri_id, pins in peripheral_tables.items():
+            node_name = f"{peri_id.lower()}_default"
+            pinctrl.add_child(generate_pinctrl_entry(node_name, pins))
 
     # Build the GPIO Functional section (LEDs/Buttons). This defines the "Software Logic" (Init states, Interrupts).
-    # Flatten the peripheral_groups list to give the GPIO generator all pins at once.
-    all_pins: List[PinEntry] = []
-    for pins in peripheral_groups.values():
-        all_pins.extend(pins)
-    gpio_logic = generate_gpio_logic_nodes(all_pins)
-    dtsi_content.append(gpio_logic)
-
-    # Generate Peripheral Nodes (I2S, UART, etc.)
-    for peri_id, pins in peripheral_groups.items():
-        if "I2S" in peri_id:
-            dtsi_content.append(generate_i2s_node(peri_id, pins))
-        elif "UART" in peri_id:
-            dtsi_content.append(generate_uart_node(peri_id, pins))
-
-    return "\n".join(dtsi_content)
+    # The GPIO generator receives the whole table at once.
+    with stage(log, "generate.gpio_logic"):
+        for node in generate_gpio_logic_nodes(pin_table):
+            document.add(node)
+
+    # Generate Peripheral Nodes (I2S, UART, etc.) through the generator registry
+    with stage(log, "generate.peripheral_nodes"):
+        for node in generate_peripheral_nodes(peripheral_tables, peripherals, board_config, clock_tree, log):
+            document.add(node)
+
+    return document
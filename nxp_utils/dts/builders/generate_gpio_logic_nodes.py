@@ -1,6 +1,6 @@
-import re
-from typing import List, Dict
-from .pin_entry import PinEntry
+from typing import List
+from ..source_tree import DtsCells, DtsNode
+from .pin_table import PinTable
 
 INTERRUPT_MAP = {
     'kPORT_InterruptRisingEdge': 'GPIO_INT_EDGE_RISING',
@@ -10,40 +10,26 @@ INTERRUPT_MAP = {
     'kPORT_InterruptLogicOne': 'GPIO_INT_LEVEL_HIGH',
 }
 
-def generate_gpio_logic_nodes(pins: List[PinEntry]) -> str:
+def generate_gpio_logic_nodes(pins: PinTable) -> List[DtsNode]:
     """
     Generates high-level GPIO nodes for LEDs, Buttons, or general 
     GPIO configuration based on init states and interrupts.
     """
-    output = []
-    
-    # Sort pins by port for clean grouping (gpioa, gpiob, etc.)
-    port_groups: Dict[str, List[PinEntry]] = {}
-    
-    for p in pins:
-        # We only care about GPIO signals here
-        if "GPIO" not in p.func_label:
-            continue
+    nodes: List[DtsNode] = []
 
-        # Ensure base_pin access is consistent
-        match = re.match(r"PT([A-E])(\d+)", p.base_pin)
-        if not match: 
-            continue
+    # We only care about GPIO signals with a decoded port here; &gpioX names PORT controller ports
+    if not pins.port_controlled:
+        return nodes
+    gpio_pins = pins.filter(lambda i: "GPIO" in pins.entry[i].func_label and pins.port[i] is not None)
 
-        port_letter = match.group(1).lower()
-        
-        if port_letter not in port_groups:
-            port_groups[port_letter] = []
-        port_groups[port_letter].append(p)
+    # Sort pins by port for clean grouping (gpioa, gpiob, etc.)
+    port_groups = gpio_pins.group_by("port")
 
-    for port, group_pins in sorted(port_groups.items()):
-        output.append(f"&gpio{port} {{")
-        output.append("    status = \"okay\";")
-        
-        for p in group_pins:
-            match = re.match(r"PT([A-E])(\d+)", p.base_pin)
-            idx = match.group(2)
-            
+    for port_letter, group in sorted(port_groups.items()):
+        port = port_letter.lower()
+        port_node = DtsNode(f"&gpio{port}").set("status", "okay")
+
+        for p, idx in zip(group.entry, group.index):
             # Determine Flags
             flags = []
             if p.pull == "up": flags.append("GPIO_PULL_UP")
@@ -59,17 +45,15 @@ def generate_gpio_logic_nodes(pins: List[PinEntry]) -> str:
             
             flag_str = " | ".join(flags) if flags else "0"
             node_name = (p.user_label or f"pin_{idx}").lower().replace(" ", "_")
-            
-            output.append(f"    {node_name} {{")
-            output.append(f"        gpios = <&gpio{port} {idx} ({flag_str})>;")
-            
+
+            pin_node = port_node.add_child(DtsNode(node_name))
+            pin_node.set("gpios", DtsCells([f"&gpio{port}", idx, f"({flag_str})"]))
+
             # Add Init State (logical)
             if p.gpio_init_state is not None:
                 state_str = "high" if p.gpio_init_state else "low"
-                output.append(f"        output-{state_str};")
-                
-            output.append("    };")
-            
-        output.append("};\n")
-        
-    return "\n".join(output)
\ No newline at end of file
+                pin_node.set(f"output-{state_str}")
+
+        nodes.append(port_node)
+
+    return nodes
@@ -0,0 +1,20 @@
+from typing import Any, Dict, Optional
+from ..source_tree import DtsNode
+from .node_generators import NodeTemplate, register_node_generator
+
+I2C_TEMPLATE = NodeTemplate(
+    properties=[
+        ("pinctrl-0", "<&{name}_default>"),
+        ("pinctrl-names", '"default"'),
+        ("clock-frequency", "<{clock_frequency}>"),
+        ("status", '"okay"'),
+    ],
+    defaults={"clock_frequency": "I2C_BITRATE_STANDARD"},
+)
+
+
+@register_node_generator("I2C", "LPI2C")
+def generate_i2c_node(peri_id: str, pins: list, options: Optional[Dict[str, Any]] = None) -> DtsNode:
+    """Standard I2C controller template. Options: clock_frequency."""
+    name = peri_id.lower()
+    return I2C_TEMPLATE.render(f"&{name}", {**(options or {}), "name": name})
@@ -1,20 +1,74 @@
-def generate_i2s_node(peri_id: str, pins: list) -> str:
-    """Templates for 16kHz, 16-bit PCM Audio."""
-    return f"""
-&{peri_id.lower()} {{
-    pinctrl-0 = <&{peri_id.lower()}_default>;
-    pinctrl-names = "default";
-    status = "okay";
-
-    /* Audio Format Configuration */
-    protocol = "i2s";
-    bit-format = "s16le";      /* Signed 16-bit Little Endian */
-    sample-rate = <16000>;     /* 16 kHz */
-
-    /* INMP441 Specifics */
-    receiver {{
-        /* Sync RX to the TX clocks we defined on PTB18/19 */
-        sync-mode = <1>; 
-        data-lane = <0>;
-    }};
-}};"""
+import re
+from typing import Any, Dict, Optional
+from ..clock_tree import I2S_TOLERANCE, RateCheck, i2s_sample_rate
+from ..source_tree import DtsCells, DtsNode
+from .node_generators import NodeTemplate, register_node_generator, register_rate_check
+
+RECEIVER_TEMPLATE = NodeTemplate(
+    properties=[
+        ("sync-mode", "<1>"),
+        ("data-lane", "<0>"),
+    ],
+    comments={"": "INMP441 Specifics"},
+    leading_comments={"sync-mode": "Sync RX to the TX clocks we defined on PTB18/19"},
+)
+
+
+def describe_bit_format(values: Dict[str, Any]) -> Optional[str]:
+    """s16le -> Signed 16-bit Little Endian; None for other notations."""
+    match = re.fullmatch(r"([su])(\d+)(le|be)", str(values["bit_format"]).lower())
+    if not match:
+        return None
+    sign, bits, endian = match.groups()
+    return f"{'Signed' if sign == 's' else 'Unsigned'} {bits}-bit {'Little' if endian == 'le' else 'Big'} Endian"
+
+
+def describe_sample_rate(values: Dict[str, Any]) -> Optional[str]:
+    """16000 -> 16 kHz."""
+    try:
+        return f"{float(values['sample_rate']) / 1000:g} kHz"
+    except (TypeError, ValueError):
+        return None
+
+
+I2S_TEMPLATE = NodeTemplate(
+    properties=[
+        ("pinctrl-0", "<&{name}_default>"),
+        ("pinctrl-names", '"default"'),
+        ("status", '"okay"'),
+        ("protocol", '"{protocol}"'),
+        ("bit-format", '"{bit_format}"'),
+        ("sample-rate", "<{sample_rate}>"),
+    ],
+    children=[("receiver", RECEIVER_TEMPLATE)],
+    defaults={"protocol": "i2s", "bit_format": "s16le", "sample_rate": 16000},
+    comments={"bit-format": describe_bit_format, "sample-rate": describe_sample_rate},
+    leading_comments={"protocol": "Audio Format Configuration"},
+)
+
+
+@register_node_generator("I2S", "SAI")
+def generate_i2s_node(peri_id: str, pins: list, options: Optional[Dict[str, Any]] = None) -> DtsNode:
+    """
+    Templates for PCM Audio, 16kHz 16-bit by default.
+    Options: protocol, bit_format, sample_rate, clock_hz (emitted as clock-frequency).
+    """
+    name = peri_id.lower()
+    node = I2S_TEMPLATE.render(f"&{name}", {**(options or {}), "name": name})
+    if (options or {}).get("clock_hz"):
+        node.set("clock-frequency", DtsCells([str(round(options["clock_hz"]))]))
+    return node
+
+
+def slot_bits(bit_format: str) -> int:
+    """Bits per channel slot: s16le -> 16, s24le and s32le -> 32."""
+    match = re.search(r"(\d+)", bit_format)
+    return 16 if match and int(match.group(1)) <= 16 else 32
+
+
+@register_rate_check("I2S", "SAI")
+def check_i2s_rate(peri_id: str, peripheral_type: str, clock_hz: float, options: Dict[str, Any]) -> RateCheck:
+    values = {**I2S_TEMPLATE.defaults, **options}
+    rate = float(values["sample_rate"])
+    return RateCheck(peri_id, "sample_rate", rate, clock_hz, i2s_sample_rate(clock_hz, rate, slot_bits(str(values["bit_format"]))),
+                     I2S_TOLERANCE)
@@ -0,0 +1,18 @@
+from typing import Any, Dict, Optional
+from ..source_tree import DtsNode
+from .node_generators import NodeTemplate, register_node_generator
+
+SPI_TEMPLATE = NodeTemplate(
+    properties=[
+        ("pinctrl-0", "<&{name}_default>"),
+        ("pinctrl-names", '"default"'),
+        ("status", '"okay"'),
+    ],
+)
+
+
+@register_node_generator("SPI", "DSPI", "LPSPI")
+def generate_spi_node(peri_id: str, pins: list, options: Optional[Dict[str, Any]] = None) -> DtsNode:
+    """Standard SPI controller template."""
+    name = peri_id.lower()
+    return SPI_TEMPLATE.render(f"&{name}", {**(options or {}), "name": name})
@@ -1,9 +1,31 @@
-def generate_uart_node(peri_id: str, pins: list) -> str:
-    """Standard UART template."""
-    return f"""
-&{peri_id.lower()} {{
-    pinctrl-0 = <&{peri_id.lower()}_default>;
-    pinctrl-names = "default";
-    current-speed = <115200>;
-    status = "okay";
-}};"""
+from typing import Any, Dict, Optional
+from ..clock_tree import UART_TOLERANCE, RateCheck, uart_baud
+from ..source_tree import DtsCells, DtsNode
+from .node_generators import NodeTemplate, register_node_generator, register_rate_check
+
+UART_TEMPLATE = NodeTemplate(
+    properties=[
+        ("pinctrl-0", "<&{name}_default>"),
+        ("pinctrl-names", '"default"'),
+        ("current-speed", "<{baud}>"),
+        ("status", '"okay"'),
+    ],
+    defaults={"baud": 115200},
+)
+
+
+@register_node_generator("UART", "LPUART")
+def generate_uart_node(peri_id: str, pins: list, options: Optional[Dict[str, Any]] = None) -> DtsNode:
+    """Standard UART template. Options: baud, clock_hz (emitted as clock-frequency)."""
+    name = peri_id.lower()
+    node = UART_TEMPLATE.render(f"&{name}", {**(options or {}), "name": name})
+    if (options or {}).get("clock_hz"):
+        node.set("clock-frequency", DtsCells([str(round(options["clock_hz"]))]))
+    return node
+
+
+@register_rate_check("UART", "LPUART")
+def check_uart_rate(peri_id: str, peripheral_type: str, clock_hz: float, options: Dict[str, Any]) -> RateCheck:
+    baud = float(options.get("baud", UART_TEMPLATE.defaults["baud"]))
+    return RateCheck(peri_id, "baud", baud, clock_hz, uart_baud(clock_hz, baud, oversampling=peripheral_type == "LPUART"),
+                     UART_TOLERANCE)
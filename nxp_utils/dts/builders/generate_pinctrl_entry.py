@@ -1,58 +1,41 @@
-import re
-from typing import List, Dict, Any, Tuple
-from .pin_entry import PinEntry
+from ..source_tree import DtsCells, DtsNode
+from .pin_table import PinTable
 
-def generate_pinctrl_entry(node_name: str, pins: List[PinEntry]) -> str:
+def generate_pinctrl_entry(node_name: str, pins: PinTable) -> DtsNode:
     """
-    Generates a pinctrl node string with sub-grouping for differing electrical properties.
+    Generates a pinctrl node with sub-grouping for differing electrical properties.
     """
-    dts: List[str] = [f"    {node_name.lower()}: {node_name.lower()} {{"]
+    node = DtsNode(node_name.lower(), label=node_name.lower())
 
-    # Signature: (pull, drive_strength, slew_rate, open_drain, passive_filter)
-    sub_groups: Dict[Tuple[Any, ...], List[PinEntry]] = {}
+    # Signature: (pull, drive_strength, slew_rate, open_drain, passive_filter, digital_filter)
+    sub_groups = pins.group_by("signature")
 
-    for p in pins:
-        config_sig = (p.pull, p.drive_strength, p.slew_rate, p.open_drain, p.passive_filter, p.digital_filter)
+    for i, (sig_id, group) in enumerate(sub_groups.items(), 1):
+        pull, drive, slew, od, p_filter, d_filter = pins.signature_of(sig_id)
+        group_node = node.add_child(DtsNode(f"group{i}"))
 
-        if config_sig not in sub_groups:
-            sub_groups[config_sig] = []
-        sub_groups[config_sig].append(p)
-
-    for i, (config, group_pins) in enumerate(sub_groups.items(), 1):
-        pull, drive, slew, od, p_filter, d_filter = config
-
-        dts.append(f"        group{i} {{")
-        dts.append("            pinmux = <")
-
-        for j, p in enumerate(group_pins):
-            comma = "," if j < len(group_pins) - 1 else ""
-
-            # Use regex to extract Port and Pin Index
-            match = re.match(r"PT([A-E])(\d+)", p.base_pin)
-            if not match:
+        # Only PORT pins with a decoded Port and Pin Index can be muxed with K64_PSEL
+        psels = []
+        labels = []
+        for p, port, idx in zip(group.entry, group.port, group.index):
+            if port is None or not group.port_controlled:
                 continue
+            psels.append(f"K64_PSEL({port}, {idx}, {p.mux_value})")
+            labels.append(p.user_label or p.func_label or p.base_pin)
+        group_node.set("pinmux", DtsCells(psels, labels, multiline=True))
 
-            port, idx = match.groups()
-            label = p.user_label or p.func_label or p.base_pin
-
-            dts.append(f"                K64_PSEL({port}, {idx}, {p.mux_value}){comma} /* {label} */")
-
-        dts.append("            >;")
-
-        # Property translation to DTS strings
+        # Property translation to DTS properties
         if pull in ['up', 'down']:
-            dts.append(f"            bias-pull-{pull};")
+            group_node.set(f"bias-pull-{pull}")
         if drive:
-            dts.append(f"            drive-strength = \"{drive}\";")
+            group_node.set("drive-strength", drive)
         if slew:
-            dts.append(f"            slew-rate = \"{slew}\";")
+            group_node.set("slew-rate", slew)
         if od in [True, 'enable']:
-            dts.append("            drive-open-drain;")
+            group_node.set("drive-open-drain")
         if p_filter in [True, 'enable']:
-            dts.append("            passive-filter;")
+            group_node.set("passive-filter")
         if d_filter in [True, 'enable']:
-            dts.append("            digital-filter;")
-        dts.append("        };")
+            group_node.set("digital-filter")
 
-    dts.append("    };")
-    return "\n".join(dts)
+    return node
@@ -0,0 +1,240 @@
+import re
+from functools import lru_cache
+from logging import Logger
+from string import Formatter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+from ..clock_tree import ClockTree, RateCheck
+from ..source_tree import DtsCells, DtsNode
+from .pin_table import PinTable
+
+# Mapping entry keys that describe the pin itself; everything else is a peripheral option (baud, sample_rate, ...)
+PIN_KEYS = frozenset([
+    'signal', 'pin', 'label', 'pull', 'drive_strength', 'slew_rate', 'open_drain', 'passive_filter', 'digital_filter',
+    'gpio_init_state', 'gpio_interrupt'
+])
+
+ENTRY_POINT_GROUP = "nxp_utils.node_generators"
+
+# A generator receives the peripheral id, its pins and the merged options from the board config
+NodeGenerator = Callable[[str, PinTable, Dict[str, Any]], Optional[DtsNode]]
+
+# A fixed comment, or one derived from the template options, e.g. the sample rate in kHz
+Comment = Union[str, Callable[[Dict[str, Any]], Optional[str]]]
+
+NODE_GENERATORS: Dict[str, NodeGenerator] = {}
+
+# A rate check receives the peripheral id and type, its module clock in Hz and its options
+RateChecker = Callable[[str, str, float, Dict[str, Any]], Optional[RateCheck]]
+
+RATE_CHECKS: Dict[str, RateChecker] = {}
+
+
+def register_node_generator(*peripheral_types: str) -> Callable[[NodeGenerator], NodeGenerator]:
+    """
+    Decorator registering a peripheral node generator for one or more peripheral types,
+    as found in SignalConfiguration.peripherals[...]['type'], e.g. @register_node_generator("UART", "LPUART").
+    """
+
+    def decorator(fn: NodeGenerator) -> NodeGenerator:
+        for peripheral_type in peripheral_types:
+            NODE_GENERATORS[peripheral_type] = fn
+        return fn
+
+    return decorator
+
+
+def register_rate_check(*peripheral_types: str) -> Callable[[RateChecker], RateChecker]:
+    """
+    Decorator registering the check of a peripheral's requested rate (baud, sample rate, ...)
+    against its module clock, e.g. @register_rate_check("UART", "LPUART").
+    """
+
+    def decorator(fn: RateChecker) -> RateChecker:
+        for peripheral_type in peripheral_types:
+            RATE_CHECKS[peripheral_type] = fn
+        return fn
+
+    return decorator
+
+
+@lru_cache(maxsize=None)
+def load_plugin_generators() -> int:
+    """
+    Imports third-party generators advertised under the `nxp_utils.node_generators` entry point group.
+    Each entry point module registers itself with register_node_generator on import. Runs once.
+    """
+    # importlib.metadata is slow to import; only pay for it when generating nodes
+    from importlib.metadata import entry_points
+    plugins = entry_points(group=ENTRY_POINT_GROUP)
+    for plugin in plugins:
+        plugin.load()
+    return len(plugins)
+
+
+def peripheral_type_of(peri_id: str, peripherals: Optional[Dict[str, Any]] = None) -> str:
+    """Returns the peripheral type; without signal configuration data, "UART0" falls back to "UART"."""
+    info = (peripherals or {}).get(peri_id)
+    if info and info.get("type"):
+        return info["type"]
+    return re.sub(r"\d+$", "", peri_id)
+
+
+def collect_peripheral_options(board_config: Optional[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Gathers per-peripheral options from the board config mapping, keyed by signal key.
+    e.g. {"signal": "UART0_TX", "pin": "PTB17", "baud": 9600} -> {"UART0_TX": {"baud": 9600}}
+    """
+    options: Dict[str, Dict[str, Any]] = {}
+    for entry in (board_config or {}).get('mapping', []):
+        extra = {k: v for k, v in entry.items() if k not in PIN_KEYS}
+        if extra and entry.get('signal'):
+            options.setdefault(entry['signal'], {}).update(extra)
+    return options
+
+
+class NodeTemplate:
+    """
+    A peripheral node template compiled once into property builders.
+
+    Property specs use DTS notation with str.format fields, e.g. ("current-speed", "<{baud}>"),
+    ("protocol", '"{protocol}"') or ("status", '"okay"'). A spec of None is a boolean flag.
+    Comments are keyed by property name, "" being the node itself; a callable comment is
+    computed from the options.
+    """
+
+    def __init__(self,
+                 properties: Iterable[Tuple[str, Optional[str]]],
+                 children: Iterable[Tuple[str, "NodeTemplate"]] = (),
+                 defaults: Optional[Dict[str, Any]] = None,
+                 comments: Optional[Dict[str, Comment]] = None,
+                 leading_comments: Optional[Dict[str, Comment]] = None):
+        self.defaults: Dict[str, Any] = dict(defaults or {})
+        self.comments: Dict[str, Comment] = dict(comments or {})
+        self.leading_comments: Dict[str, Comment] = dict(leading_comments or {})
+        self.children = list(children)
+        self.specs = list(properties)
+        self.properties = [(name, compile_property(spec)) for name, spec in self.specs]
+
+    def render(self, name: str, options: Dict[str, Any]) -> DtsNode:
+        values = {**self.defaults, **options}
+        node = DtsNode(name, comment=_comment(self.comments.get(""), values))
+        for prop_name, build in self.properties:
+            node.set(prop_name, build(values), comment=_comment(self.comments.get(prop_name), values),
+                     leading_comment=_comment(self.leading_comments.get(prop_name), values))
+        for child_name, child in self.children:
+            node.add_child(child.render(child_name, values))
+        return node
+
+    def options_of(self, node: DtsNode) -> Dict[str, Any]:
+        """
+        Inverse of render(): the options read back from a node's properties, e.g.
+        current-speed = <9600> -> {"baud": 9600}. Options equal to the defaults are left out.
+        """
+        options: Dict[str, Any] = {}
+        for prop_name, spec in self.specs:
+            prop = node.properties.get(prop_name)
+            pattern = compile_property_pattern(spec)
+            if prop is None or pattern is None or prop.value is None:
+                continue
+            field, regex = pattern
+            text = " ".join(prop.value.items) if isinstance(prop.value, DtsCells) else prop.value
+            match = regex.fullmatch(text)
+            if not match:
+                continue
+            value: Any = int(match.group(1)) if match.group(1).isdigit() else match.group(1)
+            if field != "name" and value != self.defaults.get(field):
+                options[field] = value
+        return options
+
+
+def _comment(comment: Optional[Comment], values: Dict[str, Any]) -> Optional[str]:
+    return comment(values) if callable(comment) else comment
+
+
+@lru_cache(maxsize=None)
+def compile_property_pattern(spec: Optional[str]) -> Optional[Tuple[str, "re.Pattern[str]"]]:
+    """(field, regex) reading the single format field of a property spec back; None for other specs."""
+    if spec is None or len(spec) < 2 or spec[0] + spec[-1] not in ('<>', '""'):
+        return None
+    fields = [(literal, field) for literal, field, _, _ in Formatter().parse(spec[1:-1])]
+    named = [field for _, field in fields if field]
+    if len(named) != 1:
+        return None
+    regex = "".join(re.escape(literal) + ("(.+)" if field else "") for literal, field in fields)
+    return named[0], re.compile(regex)
+
+
+@lru_cache(maxsize=None)
+def compile_property(spec: Optional[str]) -> Callable[[Dict[str, Any]], Any]:
+    """Parses a property spec once and returns a function building its value from template options."""
+    if spec is None:
+        return lambda values: None
+    if spec.startswith("<") and spec.endswith(">"):
+        fmt = spec[1:-1].format
+        return lambda values: DtsCells([fmt(**values)])
+    if spec.startswith('"') and spec.endswith('"'):
+        fmt = spec[1:-1].format
+        return lambda values: fmt(**values)
+    raise ValueError(f"Unsupported property template: {spec}")
+
+
+def check_peripheral_rates(peripheral_options: Dict[str, Dict[str, Any]],
+                           clock_tree: ClockTree,
+                           peripherals: Optional[Dict[str, Any]] = None) -> List[RateCheck]:
+    """
+    Checks the requested rate of every peripheral with a registered rate check and a known
+    module clock. Clock frequencies are cached by the tree, so checking many board variants
+    (ClockTree.with_overrides) only re-evaluates the clocks that changed.
+    """
+    checks: List[RateCheck] = []
+    for peri_id, options in peripheral_options.items():
+        peripheral_type = peripheral_type_of(peri_id, peripherals)
+        checker = RATE_CHECKS.get(peripheral_type)
+        clock_hz = clock_tree.module_frequency(peri_id)
+        if checker is None or clock_hz is None:
+            continue
+        check = checker(peri_id, peripheral_type, clock_hz, options)
+        if check is not None:
+            checks.append(check)
+    return checks
+
+
+def generate_peripheral_nodes(peripheral_tables: Dict[str, PinTable],
+                              peripherals: Optional[Dict[str, Any]] = None,
+                              board_config: Optional[Dict[str, Any]] = None,
+                              clock_tree: Optional[ClockTree] = None,
+                              log: Optional[Logger] = None) -> List[DtsNode]:
+    """
+    Dispatches every peripheral to the generator registered for its type. Peripherals without a
+    generator (e.g. GPIO ports) produce no node.
+    With a clock tree, generators receive the module clock as the `clock_hz` option and
+    requested rates the clock cannot produce within tolerance are logged as warnings.
+    """
+    load_plugin_generators()
+    signal_options = collect_peripheral_options(board_config)
+
+    nodes: List[DtsNode] = []
+    for peri_id, pins in peripheral_tables.items():
+        generator = NODE_GENERATORS.get(peripheral_type_of(peri_id, peripherals))
+        if generator is None:
+            continue
+
+        options: Dict[str, Any] = {}
+        for p in pins:
+            options.update(signal_options.get(p.func_label, {}))
+
+        if clock_tree is not None:
+            clock_hz = clock_tree.module_frequency(peri_id)
+            if clock_hz is not None:
+                options["clock_hz"] = clock_hz
+                for check in check_peripheral_rates({peri_id: options}, clock_tree, peripherals):
+                    if not check.ok and log is not None:
+                        log.warning("%s %s %d is not achievable from its %d Hz clock", check.peripheral, check.option,
+                                    round(check.requested), round(check.clock_hz),
+                                    extra={"peripheral": check.peripheral, "requested": check.requested,
+                                           "achieved": check.achieved, "error": check.error, "clock": clock_tree.module_clock(peri_id)})
+
+        node = generator(peri_id, pins, options)
+        if node is not None:
+            nodes.append(node)
+    return nodes
@@ -1,35 +1,113 @@
-from typing import Dict, Any, List
+from typing import Callable, Dict, Any, List, Optional, Set, Tuple
 from logging import Logger
+from ...profiling import record_count
 from .pin_entry import PinEntry
+from ..pin_properties import PinPropertyIndex
+from ..name_index import GPIO_KEY, PIN, SIGNAL, SIGNAL_KINDS, NameIndex
 
 def find_pin_entry(signal_to_pin_map, peri_id, sig_id, chosen_pin):
     """
     Search helper. Tries specific lookup, then searches the whole peripheral.
     """
+    return _find_pin_entry(signal_to_pin_map, peri_id, sig_id, chosen_pin)[0]
+
+
+def _find_pin_entry(signal_to_pin_map, peri_id, sig_id, chosen_pin) -> Tuple[Optional[Dict[str, Any]], bool]:
+    """Same as find_pin_entry; also reports whether the match came from the exact signal lookup."""
     # Try exact signal name (e.g., UART0 -> RX)
     options = signal_to_pin_map.get(peri_id, {}).get(sig_id, [])
     match = next((opt for opt in options if opt['base_pin'] == chosen_pin), None)
     if match:
-        return match
+        return match, True
 
     # Fallback: Search all signals in that peripheral (e.g., GPIOB -> GPIO)
     all_signals = signal_to_pin_map.get(peri_id, {})
     for _, options_list in all_signals.items():
         match = next((opt for opt in options_list if opt['base_pin'] == chosen_pin), None)
         if match:
-            return match
-    return None
+            return match, False
+    return None, False
+
+
+def board_config_peripherals(board_config: dict) -> Set[str]:
+    """
+    Every peripheral id resolve_signal may look up for the board config, i.e. each prefix of
+    each signal key, e.g. "ENET0_1588_TMR0" -> {"ENET0", "ENET0_1588"}.
+    """
+    peripherals: Set[str] = set()
+    for entry in board_config.get('mapping', []):
+        parts = (entry.get('signal') or "").split('_')
+        for i in range(1, len(parts)):
+            peripherals.add("_".join(parts[:i]))
+    return peripherals
+
+
+def resolve_signal(signal_to_pin_map: Dict[str, Any], signal_key: str,
+                   chosen_pin: str) -> Tuple[str, str, Optional[Dict[str, Any]], bool]:
+    """
+    Resolves a board config signal such as "UART0_RX" on a pin such as "PTB16".
+    Returns (peri_id, sig_id, match, exact); match is None when the pin cannot carry the signal.
+    """
+    # Split key to get Peripheral and Signal name. Every split point is tried, e.g.
+    # (ENET0, 1588_TMR0), then (ENET0_1588, TMR0), giving peri_id="I2S0", sig_id="TX_BCLK"
+    # for "I2S0_TX_BCLK".
+    parts = signal_key.split('_')
+    for i in range(1, len(parts)):
+        temp_peri = "_".join(parts[:i])
+        temp_sig = "_".join(parts[i:])
+        match, exact = _find_pin_entry(signal_to_pin_map, temp_peri, temp_sig, chosen_pin)
+        record_count("resolver.lookups")
+        if match:
+            return temp_peri, temp_sig, match, exact
+    return "", "", None, False
+
+
+def _shortlist(names: List[str], limit: int = 8) -> str:
+    return ", ".join(names[:limit]) + (", ..." if len(names) > limit else "")
+
 
+def describe_miss(name_index: NameIndex, signal_key: str, chosen_pin: str) -> str:
+    """Did-you-mean hint for a board config entry that failed to resolve."""
+    kinds = name_index.kinds_of(signal_key)
+    if PIN in kinds:
+        # A pin name used as the signal key, e.g. PTB22 instead of GPIOB_22
+        gpio_keys = name_index.signals_on(signal_key, kinds=(GPIO_KEY,))
+        if gpio_keys:
+            return f"{signal_key} is a pin name, did you mean {gpio_keys[0]}?"
+    if kinds & set(SIGNAL_KINDS):
+        # Right signal, wrong pin: where the signal is available and what the pin carries instead
+        pins = name_index.pins_for(signal_key)
+        hint = f"{signal_key} is available on {_shortlist(pins)}" if pins else f"{signal_key} is not routable"
+        # Board config keys only: GPIOB_17 rather than the GPIOB_GPIO signal
+        carried = [name for name in name_index.signals_on(chosen_pin, kinds=(SIGNAL, GPIO_KEY))
+                   if not name.endswith("_GPIO")]
+        return f"{hint}; {chosen_pin} carries {_shortlist(carried)}" if carried else hint
+    suggestions = [name for name, _ in name_index.suggest(signal_key, limit=3, kinds=SIGNAL_KINDS)]
+    if suggestions:
+        return f"Did you mean {', '.join(suggestions)}?"
+    return "No similar signal name found"
 
-def parse_peripheral_groups(board_config: dict, signal_to_pin_map: Dict[str, Any], log=Logger) -> Dict[str, List[PinEntry]]:
+
+def parse_peripheral_groups(board_config: dict,
+                            signal_to_pin_map: Dict[str, Any],
+                            log=Logger,
+                            full_map: Optional[Callable[[], Dict[str, Any]]] = None,
+                            pin_properties: Optional[PinPropertyIndex] = None) -> Dict[str, List[PinEntry]]:
     """
     Bridges board.json with the parsed XML map to generate final DTS.
+    When signal_to_pin_map only holds the board's peripherals, full_map supplies the
+    complete map for the hints printed on unresolved entries.
+    With pin_properties, the electrical settings of every entry are checked against the
+    functional properties of its pin. Unsupported settings are left out of the PinEntry and
+    all of them are reported together.
     """
     # We group by peripheral to create clean DTS nodes (e.g., all UART0 pins in one node)
     # Grouping logic: { "UART0": [pin_entry1, pin_entry2], "GPIO": [...] }
     peripheral_groups: Dict[str, List[PinEntry]] = {}
 
     mapping_list: List[Dict] = board_config.get('mapping', [])
+    name_index: Optional[NameIndex] = None
+    violations: List[str] = []
 
     for entry in mapping_list:
         signal_key = entry.get('signal')    # e.g., "UART0_RX"
@@ -38,38 +116,28 @@ def parse_peripheral_groups(board_config: dict, signal_to_pin_map: Dict[str, Any
         if not signal_key or not chosen_pin:
             continue
 
-        # signal_key is "UART0_RX", chosen_pin is "PTB16"
-        # Split key to get Peripheral and Signal name
-        # We split from the right once to handle cases like "ENET0_1588_TMR0"
-        # This results in peri_id="I2S0", sig_id="TX_BCLK" (Correct!)
-
-        parts = signal_key.split('_')
-        match = None
-        peri_id = ""
-        sig_id = ""
-
-        # Try every possible split point
-        # e.g., (ENET0, 1588_TMR0), then (ENET0_1588, TMR0)
-        for i in range(1, len(parts)):
-            temp_peri = "_".join(parts[:i])
-            temp_sig = "_".join(parts[i:])    
-            match = find_pin_entry(signal_to_pin_map, temp_peri, temp_sig, chosen_pin)
-            if match:
-                peri_id, sig_id = temp_peri, temp_sig
-                break
+        peri_id, sig_id, match, exact = resolve_signal(signal_to_pin_map, signal_key, chosen_pin)
+        record_count("resolver.exact_hits" if exact else "resolver.fallback_hits" if match else "resolver.misses")
 
         if match:
+            settings = entry
+            if pin_properties:
+                found = pin_properties.check(chosen_pin, entry)
+                if found:
+                    rejected = {field for field, _ in found}
+                    settings = {k: v for k, v in entry.items() if k not in rejected}
+                    violations.extend(f"{signal_key}: {message}" for _, message in found)
             pin_obj = PinEntry(
                 base_pin=chosen_pin,
                 mux_value=match['mux_value'],
                 func_label=signal_key,
                 user_label=entry.get('label'),
-                pull=entry.get('pull'),
-                drive_strength=entry.get('drive_strength'),
-                slew_rate=entry.get('slew_rate'),
-                open_drain=entry.get('open_drain'),
-                passive_filter=entry.get('passive_filter'),
-                digital_filter=entry.get('digital_filter'),
+                pull=settings.get('pull'),
+                drive_strength=settings.get('drive_strength'),
+                slew_rate=settings.get('slew_rate'),
+                open_drain=settings.get('open_drain'),
+                passive_filter=settings.get('passive_filter'),
+                digital_filter=settings.get('digital_filter'),
                 gpio_init_state=entry.get('gpio_init_state'),
                 gpio_interrupt=entry.get('gpio_interrupt')
             )
@@ -77,6 +145,16 @@ def parse_peripheral_groups(board_config: dict, signal_to_pin_map: Dict[str, Any
                 peripheral_groups[peri_id] = []
             peripheral_groups[peri_id].append(pin_obj)
         else:
-            print(f"WARNING: No hardware match for {signal_key} on {chosen_pin}")
+            # The name index is only built once something fails to resolve
+            if name_index is None:
+                name_index = NameIndex.from_signal_to_pin_map(full_map() if full_map else signal_to_pin_map)
+            hint = describe_miss(name_index, signal_key, chosen_pin)
+            log.warning("No hardware match for %s on %s. %s", signal_key, chosen_pin, hint,
+                        extra={"signal": signal_key, "pin": chosen_pin, "hint": hint})
+
+    if violations:
+        record_count("resolver.property_violations", len(violations))
+        log.warning("Board config requests functional property states its pins do not support",
+                    extra={"count": len(violations), "violations": violations})
 
     return peripheral_groups
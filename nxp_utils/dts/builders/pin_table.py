@@ -0,0 +1,116 @@
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+from .pin_entry import PinEntry
+from ..pin_decoders import DEFAULT_CONTROLLER, PinLocation, decode_pin
+
+
+class PinTable:
+    """
+    Columnar table of resolved PinEntry rows.
+
+    Every column is a plain list indexed by row number. The port, pin index and electrical
+    signature are derived once when the table is built, so the generators can sort and group
+    rows without re-parsing pin names or re-hashing property tuples. Ports and indexes come
+    from the pin locations decoded during the signal configuration parse.
+
+    The K64_PSEL cells, &gpioX nodes and fsl_port code written from the table only describe
+    PORT controllers; `port_controlled` tells the generators whether they apply.
+    """
+
+    def __init__(self,
+                 entry: List[PinEntry],
+                 peripheral: List[str],
+                 port: List[Optional[str]],
+                 index: List[Optional[int]],
+                 signature: List[int],
+                 signatures: List[Tuple[Any, ...]],
+                 controller_type: str = DEFAULT_CONTROLLER):
+        self.entry = entry
+        self.peripheral = peripheral
+        self.port = port
+        self.index = index
+        # Interned signature ids; the actual tuples live in the shared `signatures` list.
+        self.signature = signature
+        self.signatures = signatures
+        self.controller_type = controller_type
+
+    @classmethod
+    def from_groups(cls, peripheral_groups: Dict[str, List[PinEntry]],
+                    locations: Optional[Mapping[str, PinLocation]] = None,
+                    controller_type: Optional[str] = None) -> "PinTable":
+        """
+        Builds a table from the output of parse_peripheral_groups, keeping its order.
+        Pins missing from `locations` (SignalConfiguration.pin_locations) are decoded for
+        `controller_type` instead.
+        """
+        locations = locations or {}
+        entry: List[PinEntry] = []
+        peripheral: List[str] = []
+        port: List[Optional[str]] = []
+        index: List[Optional[int]] = []
+        signature: List[int] = []
+        signatures: List[Tuple[Any, ...]] = []
+        signature_ids: Dict[Tuple[Any, ...], int] = {}
+
+        for peri_id, pins in peripheral_groups.items():
+            for p in pins:
+                location = locations.get(p.base_pin) or decode_pin(p.base_pin, controller_type)
+                config_sig = p.get_config_sig()
+                sig_id = signature_ids.get(config_sig)
+                if sig_id is None:
+                    sig_id = signature_ids[config_sig] = len(signatures)
+                    signatures.append(config_sig)
+
+                entry.append(p)
+                peripheral.append(peri_id)
+                port.append(location.port if location else None)
+                index.append(location.index if location else None)
+                signature.append(sig_id)
+
+        return cls(entry, peripheral, port, index, signature, signatures, controller_type or DEFAULT_CONTROLLER)
+
+    def __len__(self) -> int:
+        return len(self.entry)
+
+    def __iter__(self) -> Iterator[PinEntry]:
+        return iter(self.entry)
+
+    def __repr__(self) -> str:
+        return f"PinTable({len(self)} rows)"
+
+    @property
+    def port_controlled(self) -> bool:
+        """Whether the pins sit on Kinetis/MCX PORT modules."""
+        return self.controller_type == "PORT"
+
+    def take(self, rows: Sequence[int]) -> "PinTable":
+        """Returns a new table holding only the given rows, in the given order."""
+        return PinTable([self.entry[i] for i in rows], [self.peripheral[i] for i in rows], [self.port[i] for i in rows],
+                        [self.index[i] for i in rows], [self.signature[i] for i in rows], self.signatures,
+                        self.controller_type)
+
+    def filter(self, predicate: Callable[[int], bool]) -> "PinTable":
+        """Returns the rows for which predicate(row_number) is true."""
+        return self.take([i for i in range(len(self.entry)) if predicate(i)])
+
+    def sort_by(self, *columns: str) -> "PinTable":
+        """Returns a copy sorted by the given columns. Missing values sort last."""
+        cols = [getattr(self, c) for c in columns]
+
+        def key(i: int) -> tuple:
+            return tuple((col[i] is None, col[i] if col[i] is not None else 0) for col in cols)
+
+        return self.take(sorted(range(len(self.entry)), key=key))
+
+    def group_by(self, column: str) -> Dict[Any, "PinTable"]:
+        """Splits the table by the values of a column, keeping first-seen order of keys and rows."""
+        buckets: Dict[Any, List[int]] = {}
+        for i, value in enumerate(getattr(self, column)):
+            rows = buckets.get(value)
+            if rows is None:
+                rows = buckets[value] = []
+            rows.append(i)
+        return {value: self.take(rows) for value, rows in buckets.items()}
+
+    def signature_of(self, sig_id: int) -> Tuple[Any, ...]:
+        """Resolves an interned signature id back to its property tuple."""
+        return self.signatures[sig_id]
@@ -1,4 +1,5 @@
-import re
+from typing import Mapping, Optional
+from ..pin_decoders import PinLocation, decode_pin
 
 # The K64F Port Base Addresses
 PORT_BASES = {
@@ -9,20 +10,17 @@ PORT_BASES = {
     'E': 0x4004D000
 }
 
-def calculate_pcr_address(base_pin: str) -> int:
+def calculate_pcr_address(base_pin: str, locations: Optional[Mapping[str, PinLocation]] = None) -> Optional[int]:
     """
     Converts 'PTE1' to 0x4004D004
+    The pin is looked up in `locations` (SignalConfiguration.pin_locations) when given.
     """
-    # Regex to pull 'E' and '1' from 'PTE1'
-    match = re.match(r"PT([A-E])(\d+)", base_pin)
-    if not match:
+    location = (locations or {}).get(base_pin) or decode_pin(base_pin, "PORT")
+    if location is None:
+        return None
+
+    base_addr = PORT_BASES.get(location.port)
+    if base_addr is None or location.offset is None:
         return None
-    
-    port_letter = match.group(1)  # 'E'
-    pin_index = int(match.group(2))  # 1
-    
-    base_addr = PORT_BASES.get(port_letter)
     # Each PCR register is 4 bytes (32-bit)
-    pcr_address = base_addr + (pin_index * 4)
-    
-    return pcr_address
\ No newline at end of file
+    return base_addr + location.offset
@@ -0,0 +1,196 @@
+import hashlib
+import json
+import logging
+import os
+import pickle
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from logging import Logger
+from typing import Any, Dict, List, Optional, Sequence
+from .builders.parse_peripheral_groups import resolve_signal
+from .loader import ConfigToolsDataLoader
+from .mex_config import controller_type_of
+from .signal_config import SignalConfiguration
+from ..logger import redirect_stdout_handlers
+from ..profiling import record_count, stage
+
+# processors/<processor>/ksdk2_0/<package>/signal_configuration.xml
+SIGNAL_CONFIG_PATTERN = re.compile(r"^processors/([^/]+)/ksdk2_0/([^/]+)/signal_configuration\.xml$")
+
+# Bump when the cached payload changes shape or how it is derived, e.g. pin name decoding
+CACHE_FORMAT = 2
+
+
+def default_cache_dir() -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "nxp_utils", "catalog")
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    archive_path: str
+    processor: str
+    package: str
+    member: str
+    # CRC and size of the zip member; together with the member name they key the cache
+    crc: int
+    size: int
+
+    @property
+    def cache_key(self) -> str:
+        key = f"{CACHE_FORMAT}:{self.member}:{self.crc:08x}:{self.size}"
+        return hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+
+
+@dataclass
+class PackageReport:
+    archive_path: str
+    processor: str
+    package: str
+    part_number: Optional[str] = None
+    pins: int = 0
+    signals: int = 0
+    cached: bool = False
+    # None when no board config was checked
+    compatible: Optional[bool] = None
+    reasons: List[str] = field(default_factory=list)
+
+
+def list_packages(archive_path: str) -> List[CatalogEntry]:
+    """Enumerates every processor/package with a signal configuration in the archive."""
+    entries = []
+    with zipfile.ZipFile(archive_path) as archive:
+        for info in archive.infolist():
+            match = SIGNAL_CONFIG_PATTERN.match(info.filename)
+            if match:
+                entries.append(CatalogEntry(os.path.abspath(archive_path), match.group(1), match.group(2), info.filename,
+                                            info.CRC, info.file_size))
+    return entries
+
+
+def load_package_data(entry: CatalogEntry, cache_dir: Optional[str], log: Logger) -> Dict[str, Any]:
+    """
+    Returns the part number, counts and signal_to_pin_map of a package, from the cache when
+    the archive member is unchanged, otherwise by parsing it (and filling the cache).
+    """
+    cache_path = os.path.join(cache_dir, f"{entry.cache_key}.pickle") if cache_dir else None
+    if cache_path and os.path.exists(cache_path):
+        try:
+            with open(cache_path, "rb") as f:
+                return {**pickle.load(f), "cached": True}
+        except (OSError, pickle.UnpicklingError, EOFError):
+            log.warning("Ignoring unreadable catalog cache entry", extra={"path": cache_path})
+
+    with zipfile.ZipFile(entry.archive_path) as archive:
+        data = archive.read(entry.member)
+    signal_data = SignalConfiguration(data, log, controller_type=controller_type_of(entry.processor))
+    counts = signal_data.element_counts()
+    payload = {"part_number": signal_data.part_num, "pins": counts["pins"], "signals": counts["signals"],
+               "signal_to_pin_map": signal_data.signal_to_pin_map}
+
+    if cache_path:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write then rename so concurrent workers never read a partial file
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    return {**payload, "cached": False}
+
+
+def check_mapping(mapping: Sequence[Dict[str, Any]], signal_to_pin_map: Dict[str, Any]) -> List[str]:
+    """Reasons why the board config mapping cannot be used unchanged; empty when it can."""
+    pins = {opt["base_pin"] for signals in signal_to_pin_map.values() for options in signals.values() for opt in options}
+    reasons = []
+    for entry in mapping:
+        signal_key = entry.get("signal")
+        chosen_pin = entry.get("pin")
+        if not signal_key or not chosen_pin:
+            continue
+        if chosen_pin not in pins:
+            reasons.append(f"pin {chosen_pin} ({signal_key}) does not exist in this package")
+            continue
+        _, _, match, _ = resolve_signal(signal_to_pin_map, signal_key, chosen_pin)
+        if match is None:
+            alternatives = _signal_pins(signal_to_pin_map, signal_key)
+            hint = f", available on {', '.join(alternatives[:5])}" if alternatives else ", signal not present"
+            reasons.append(f"{signal_key} cannot be routed to {chosen_pin}{hint}")
+    return reasons
+
+
+def _signal_pins(signal_to_pin_map: Dict[str, Any], signal_key: str) -> List[str]:
+    """Pins that can carry the signal, trying every peripheral/signal split like resolve_signal."""
+    parts = signal_key.split("_")
+    for i in range(1, len(parts)):
+        options = signal_to_pin_map.get("_".join(parts[:i]), {}).get("_".join(parts[i:]))
+        if options:
+            return sorted({opt["base_pin"] for opt in options})
+    return []
+
+
+def check_package(entry: CatalogEntry, mapping: Optional[List[Dict[str, Any]]], cache_dir: Optional[str]) -> PackageReport:
+    """Worker: loads one package and checks the board config mapping against it."""
+    log = logging.getLogger("nxp_utils.catalog")
+    data = load_package_data(entry, cache_dir, log)
+    report = PackageReport(entry.archive_path, entry.processor, entry.package, data["part_number"],
+                           data["pins"], data["signals"], data["cached"])
+    if mapping is not None:
+        report.reasons = check_mapping(mapping, data["signal_to_pin_map"])
+        report.compatible = not report.reasons
+    return report
+
+
+class PackageCatalog:
+    """Lists every processor/package of one or more archives and checks a board config against them."""
+
+    def __init__(self, logger: Logger, **kwargs):
+        self.log = logger
+        self.archive_paths: List[str] = kwargs.get("archive_paths") or []
+        self.user_board_config_file: Optional[str] = kwargs.get("user_board_config_file_path")
+        self.report_path: Optional[str] = kwargs.get("catalog_report_path")
+        self.workers: Optional[int] = kwargs.get("catalog_workers")
+        self.cache_dir: Optional[str] = None if kwargs.get("no_cache") else (kwargs.get("cache_dir") or default_cache_dir())
+
+    def _board_mapping(self) -> Optional[List[Dict[str, Any]]]:
+        if not self.user_board_config_file:
+            return None
+        loader = ConfigToolsDataLoader(logger=self.log, user_board_config_file=self.user_board_config_file, data_file=None)
+        return loader.parse_user_board_config(self.user_board_config_file).get("board_config", {}).get("mapping", [])
+
+    def search(self) -> bool:
+        log: Logger = self.log
+        if not self.archive_paths:
+            log.error("No ConfigToolsData archive given for the catalog")
+            return False
+
+        with stage(log, "catalog.list") as info:
+            entries = [entry for path in self.archive_paths for entry in list_packages(path)]
+            info["packages"] = len(entries)
+        if not entries:
+            log.error("No processor packages found", extra={"archive_paths": self.archive_paths})
+            return False
+
+        mapping = self._board_mapping()
+        with stage(log, "catalog.check", packages=len(entries)):
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                reports = list(pool.map(check_package, entries, [mapping] * len(entries), [self.cache_dir] * len(entries)))
+        record_count("catalog.packages", len(reports))
+        record_count("catalog.cache_hits", sum(1 for r in reports if r.cached))
+
+        result: Dict[str, Any] = {"board_config": self.user_board_config_file, "packages": [asdict(r) for r in reports]}
+        if mapping is not None:
+            result["compatible"] = [f"{r.processor}/{r.package}" for r in reports if r.compatible]
+            result["incompatible"] = [f"{r.processor}/{r.package}" for r in reports if not r.compatible]
+
+        if self.report_path:
+            with open(self.report_path, "w") as f:
+                json.dump(result, f, indent=2)
+            log.info("Catalog report written to %s", self.report_path,
+                     extra={"packages": len(reports), "compatible": len(result.get("compatible", []))})
+        else:
+            # stdout carries the report
+            redirect_stdout_handlers(log)
+            print(json.dumps(result, indent=2))
+        return True
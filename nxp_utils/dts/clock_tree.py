@@ -0,0 +1,284 @@
+import re
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set
+
+MODULE_CLOCKS_FILE = "module_clocks.xml"
+
+# Attribute and tag spellings accepted by the parser; the first attribute present wins
+ID_ATTRS = ("id", "name")
+FREQUENCY_ATTRS = ("frequency", "freq", "value", "hz")
+SOURCE_ATTRS = ("source", "parent", "input", "clock_source", "src")
+MULTIPLIER_ATTRS = ("multiplier", "mul", "mult")
+DIVIDER_ATTRS = ("divider", "div", "divide", "prescaler")
+MODULE_CLOCK_ATTRS = ("clock", "clock_source", "clock_ref", "clock_id", "source")
+CLOCK_TAGS = frozenset(["clock", "clock_node", "clock_source", "clock_output", "oscillator", "pll", "divider"])
+MODULE_TAGS = frozenset(["module", "peripheral", "module_clock", "peripheral_clock"])
+CLOCK_REF_TAGS = CLOCK_TAGS | {"clock_ref", "clock_select"}
+
+# Largest relative error accepted between the requested and the achievable rate
+UART_TOLERANCE = 0.02
+I2S_TOLERANCE = 0.01
+
+_FREQUENCY = re.compile(r"^([0-9]*\.?[0-9]+(?:e[+-]?\d+)?)\s*([kmg]?)(?:hz)?$")
+_UNITS = {"": 1.0, "k": 1e3, "m": 1e6, "g": 1e9}
+
+
+def parse_frequency(value: Any) -> Optional[float]:
+    """Frequency in Hz from 50000000, "12e6", "120 MHz" or "32.768kHz"; None when unreadable."""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value) if value > 0 else None
+    match = _FREQUENCY.match(str(value).strip().lower())
+    if not match:
+        return None
+    hz = float(match.group(1)) * _UNITS[match.group(2)]
+    return hz if hz > 0 else None
+
+
+def _number(value: Optional[str]) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _local(tag: Any) -> str:
+    """Tag without its namespace, lower case."""
+    return tag.rsplit("}", 1)[-1].lower() if isinstance(tag, str) else ""
+
+
+def _first(element: ET.Element, names: Iterable[str]) -> Optional[str]:
+    for name in names:
+        value = element.get(name)
+        if value:
+            return value.strip()
+    return None
+
+
+@dataclass(frozen=True)
+class ClockNode:
+    """
+    A clock. A node with a frequency is a fixed source; otherwise its output is the output of
+    its source times multiplier over divider.
+    """
+    id: str
+    frequency: Optional[float] = None
+    source: Optional[str] = None
+    multiplier: float = 1.0
+    divider: float = 1.0
+
+
+_MISSING = object()
+
+
+class ClockTree:
+    """
+    Clock nodes and the clock feeding each peripheral module. Frequencies are evaluated on
+    first use by walking up to the nearest known value and are cached per node, so evaluating
+    every peripheral of a board visits each clock once. with_overrides() derives variants that
+    keep the cached values of every node not downstream of an override.
+    """
+
+    def __init__(self, nodes: Mapping[str, ClockNode], modules: Mapping[str, str],
+                 cache: Optional[Dict[str, Optional[float]]] = None):
+        self.nodes: Dict[str, ClockNode] = dict(nodes)
+        self.modules: Dict[str, str] = dict(modules)
+        self._cache: Dict[str, Optional[float]] = dict(cache or {})
+        self._children: Optional[Dict[str, List[str]]] = None
+
+    def frequency(self, clock_id: str) -> Optional[float]:
+        """Output frequency of a clock in Hz; None for unknown clocks, cycles or missing sources."""
+        cached = self._cache.get(clock_id, _MISSING)
+        if cached is not _MISSING:
+            return cached
+
+        # Walk up until a cached value, a fixed source or a dead end, then fill the cache back down
+        chain: List[ClockNode] = []
+        seen: Set[str] = set()
+        value: Optional[float] = None
+        current: Optional[str] = clock_id
+        while current is not None:
+            cached = self._cache.get(current, _MISSING)
+            if cached is not _MISSING:
+                value = cached
+                break
+            node = self.nodes.get(current)
+            if node is None or current in seen:
+                break
+            if node.frequency is not None:
+                value = self._cache[current] = node.frequency
+                break
+            seen.add(current)
+            chain.append(node)
+            current = node.source
+
+        for node in reversed(chain):
+            if value is not None:
+                value = value * node.multiplier / node.divider if node.divider else None
+            self._cache[node.id] = value
+        return self._cache.get(clock_id)
+
+    def module_clock(self, module: str) -> Optional[str]:
+        return self.modules.get(module)
+
+    def module_frequency(self, module: str) -> Optional[float]:
+        """Frequency of the clock feeding a peripheral module, e.g. "UART0"."""
+        clock_id = self.modules.get(module)
+        return self.frequency(clock_id) if clock_id else None
+
+    def module_frequencies(self, modules: Optional[Iterable[str]] = None) -> Dict[str, Optional[float]]:
+        return {module: self.module_frequency(module) for module in (modules if modules is not None else self.modules)}
+
+    def downstream(self, clock_ids: Iterable[str]) -> Set[str]:
+        """The given clocks and every clock derived from them."""
+        if self._children is None:
+            self._children = {}
+            for node in self.nodes.values():
+                if node.source:
+                    self._children.setdefault(node.source, []).append(node.id)
+        found: Set[str] = set()
+        stack = list(clock_ids)
+        while stack:
+            clock_id = stack.pop()
+            if clock_id in found:
+                continue
+            found.add(clock_id)
+            stack.extend(self._children.get(clock_id, ()))
+        return found
+
+    def with_overrides(self, overrides: Mapping[str, Any]) -> "ClockTree":
+        """
+        A variant of the tree. A plain value sets a clock's frequency ("OSC0": "12 MHz"); a
+        mapping replaces some of its fields ("BUS_CLK": {"divider": 3}).
+        """
+        nodes = dict(self.nodes)
+        for clock_id, value in overrides.items():
+            node = nodes.get(clock_id) or ClockNode(clock_id)
+            if isinstance(value, Mapping):
+                fields: Dict[str, Any] = {}
+                if "frequency" in value:
+                    fields["frequency"] = parse_frequency(value["frequency"])
+                if "source" in value:
+                    fields["source"] = value["source"]
+                for name in ("multiplier", "divider"):
+                    if name in value:
+                        fields[name] = float(value[name])
+                node = replace(node, **fields)
+            else:
+                node = replace(node, frequency=parse_frequency(value))
+            nodes[clock_id] = node
+        stale = self.downstream(overrides)
+        return ClockTree(nodes, self.modules, {k: v for k, v in self._cache.items() if k not in stale})
+
+
+def _collect(element: ET.Element, nodes: Dict[str, ClockNode], modules: Dict[str, str]):
+    tag = _local(element.tag)
+    if tag in MODULE_TAGS:
+        module_id = _first(element, ID_ATTRS)
+        clock_id = _first(element, MODULE_CLOCK_ATTRS)
+        if clock_id is None:
+            # <module id="UART0"><clock_ref id="CORE_CLK"/></module>
+            ref = next((child for child in element if _local(child.tag) in CLOCK_REF_TAGS), None)
+            clock_id = _first(ref, MODULE_CLOCK_ATTRS + ID_ATTRS) if ref is not None else None
+        if module_id and clock_id:
+            modules[module_id] = clock_id
+        # Children of a module are references, not clock definitions
+        return
+
+    if tag in CLOCK_TAGS:
+        clock_id = _first(element, ID_ATTRS)
+        if clock_id:
+            nodes[clock_id] = ClockNode(clock_id,
+                                        frequency=parse_frequency(_first(element, FREQUENCY_ATTRS)),
+                                        source=_first(element, SOURCE_ATTRS),
+                                        multiplier=_number(_first(element, MULTIPLIER_ATTRS)) or 1.0,
+                                        divider=_number(_first(element, DIVIDER_ATTRS)) or 1.0)
+    for child in element:
+        _collect(child, nodes, modules)
+
+
+@lru_cache(maxsize=16)
+def parse_module_clocks(data: bytes) -> ClockTree:
+    """
+    Reads module_clocks.xml into a ClockTree. Unknown elements and unreadable values are
+    skipped rather than rejected. Trees are memoized by document content; callers wanting
+    to change one use with_overrides().
+    """
+    nodes: Dict[str, ClockNode] = {}
+    modules: Dict[str, str] = {}
+    _collect(ET.fromstring(data), nodes, modules)
+    return ClockTree(nodes, modules)
+
+
+@dataclass(frozen=True)
+class RateCheck:
+    """A requested peripheral rate compared with the closest rate its clock can produce."""
+    peripheral: str
+    option: str
+    requested: float
+    clock_hz: float
+    achieved: Optional[float]
+    tolerance: float
+
+    @property
+    def error(self) -> Optional[float]:
+        return abs(self.achieved - self.requested) / self.requested if self.achieved else None
+
+    @property
+    def ok(self) -> bool:
+        return self.achieved is not None and self.error <= self.tolerance
+
+
+@lru_cache(maxsize=4096)
+def uart_baud(clock_hz: float, baud: float, oversampling: bool = False) -> Optional[float]:
+    """
+    Closest achievable baud rate. UART: clock / (16 * (SBR + BRFA/32)) with a 13-bit SBR and
+    5-bit BRFA. LPUART (oversampling): clock / (OSR * SBR) with OSR 4..32.
+    """
+    if baud <= 0 or clock_hz <= 0:
+        return None
+    if oversampling:
+        best = None
+        for osr in range(4, 33):
+            sbr = round(clock_hz / (osr * baud))
+            if 1 <= sbr <= 8191:
+                achieved = clock_hz / (osr * sbr)
+                if best is None or abs(achieved - baud) < abs(best - baud):
+                    best = achieved
+        return best
+    # Divisor in 1/32 steps: SBR * 32 + BRFA
+    steps = round(clock_hz * 2 / baud)
+    if not 32 <= steps <= 8191 * 32 + 31:
+        return None
+    return clock_hz * 2 / steps
+
+
+@lru_cache(maxsize=4096)
+def i2s_sample_rate(clock_hz: float, rate: float, slot_bits: int = 16, channels: int = 2,
+                    mclk_ratio: int = 256) -> Optional[float]:
+    """
+    Closest achievable sample rate. MCLK = clock * (FRACT + 1) / (DIVIDE + 1), FRACT up to 255
+    and DIVIDE up to 4095, targeting mclk_ratio * rate; the bit clock is MCLK / (2 * (DIV + 1)).
+    """
+    if rate <= 0 or clock_hz <= 0:
+        return None
+    frame_bits = channels * slot_bits
+    target = rate * mclk_ratio
+    best = None
+    for fract in range(1, 257):
+        divide = round(fract * clock_hz / target)
+        if divide < fract or divide > 4096:
+            continue
+        mclk = clock_hz * fract / divide
+        bclk_div = max(1, round(mclk / (2 * rate * frame_bits)))
+        if bclk_div > 256:
+            continue
+        achieved = mclk / (2 * bclk_div) / frame_bits
+        if best is None or abs(achieved - rate) < abs(best - rate):
+            best = achieved
+            if best == rate:
+                break
+    return best
@@ -0,0 +1,183 @@
+import logging
+import os
+import re
+import threading
+import zipfile
+from collections import OrderedDict
+from dataclasses import dataclass
+from logging import Logger
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple
+from .mex_config import controller_type_of
+from .pin_decoders import PinLocation
+from .pin_properties import PinPropertyIndex
+from .signal_config import SignalConfiguration
+from ..profiling import stage
+
+DEFAULT_CACHE_SIZE = 8
+
+# (real path, mtime ns, size, processor, package)
+DeviceKey = Tuple[str, int, int, str, str]
+
+
+def freeze(value: Any) -> Any:
+    """Recursively turns dicts into read-only mappings and lists into tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+@dataclass(frozen=True)
+class DeviceModel:
+    """
+    Fully parsed, read-only data of one processor package. Mappings are read-only views and
+    lists are tuples, so a model can be shared between threads without copying or locking.
+    The attribute names match SignalConfiguration, so a model can be passed wherever the
+    builders expect one.
+    """
+    archive_path: str
+    processor: str
+    package: str
+    data_version: str
+    part_num: Optional[str]
+    peripheral_types: Mapping[str, Any]
+    peripherals: Mapping[str, Any]
+    functional_properties: Mapping[str, Any]
+    pin_properties: PinPropertyIndex
+    controller_type: Optional[str]
+    pin_locations: Mapping[str, PinLocation]
+    signal_to_pin_map: Mapping[str, Any]
+    counts: Mapping[str, int]
+
+
+class _DeviceCache:
+    """
+    LRU of parsed devices. A per-key lock makes concurrent first accesses of the same device
+    share one parse, while different devices parse in parallel. Every parse opens its own
+    ZipFile, so no zip handle is ever shared between threads.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[DeviceKey, DeviceModel]" = OrderedDict()
+        self._key_locks: Dict[DeviceKey, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: DeviceKey, load) -> DeviceModel:
+        with self._lock:
+            model = self._entries.get(key)
+            if model is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return model
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            try:
+                # Another thread may have finished the parse while this one waited
+                with self._lock:
+                    model = self._entries.get(key)
+                    if model is not None:
+                        self._entries.move_to_end(key)
+                        self.hits += 1
+                        return model
+                    self.misses += 1
+
+                model = load()
+
+                with self._lock:
+                    self._entries[key] = model
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.maxsize:
+                        self._entries.popitem(last=False)
+            finally:
+                # Also when load() raises, so that failed keys do not accumulate locks
+                with self._lock:
+                    self._key_locks.pop(key, None)
+        return model
+
+    def resize(self, maxsize: int):
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._entries) > maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def info(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "maxsize": self.maxsize}
+
+
+_cache = _DeviceCache()
+
+
+def archive_identity(archive_path: str) -> Tuple[str, int, int]:
+    """Real path, modification time and size; a rewritten archive gets a new identity."""
+    real_path = os.path.realpath(archive_path)
+    st = os.stat(real_path)
+    return real_path, st.st_mtime_ns, st.st_size
+
+
+def _parse_device(archive_path: str, processor: str, package: str, log: Logger) -> DeviceModel:
+    member = f"processors/{processor}/ksdk2_0/{package}/signal_configuration.xml"
+    data_version = "unknown"
+    with stage(log, "device.read", path=member):
+        with zipfile.ZipFile(archive_path) as archive:
+            names = set(archive.namelist())
+            if member not in names:
+                raise KeyError(f"{member} not found in {archive_path}")
+            data = archive.read(member)
+            if "npidata.mf" in names:
+                match = re.search(r"data_version=([\d\.]+)", archive.read("npidata.mf").decode("utf-8"))
+                if match:
+                    data_version = match.group(1)
+
+    with stage(log, "device.parse"):
+        signal_data = SignalConfiguration(data, log, controller_type=controller_type_of(processor))
+    return DeviceModel(archive_path=archive_path,
+                       processor=processor,
+                       package=package,
+                       data_version=data_version,
+                       part_num=signal_data.part_num,
+                       peripheral_types=freeze(signal_data.peripheral_types),
+                       peripherals=freeze(signal_data.peripherals),
+                       functional_properties=freeze(signal_data.functional_properties),
+                       pin_properties=signal_data.pin_properties,
+                       controller_type=signal_data.controller_type,
+                       pin_locations=MappingProxyType(dict(signal_data.pin_locations)),
+                       signal_to_pin_map=freeze(signal_data.signal_to_pin_map),
+                       counts=freeze(signal_data.element_counts()))
+
+
+def load_device(archive: str, processor: str, package: str, log: Optional[Logger] = None) -> DeviceModel:
+    """
+    Returns the parsed device model of processors/<processor>/ksdk2_0/<package> in a
+    ConfigToolsData archive. Models are memoized by archive identity, processor and package;
+    the call is thread-safe.
+    """
+    log = log or logging.getLogger("nxp_utils")
+    real_path, mtime_ns, size = archive_identity(archive)
+    key = (real_path, mtime_ns, size, processor, package)
+    return _cache.get(key, lambda: _parse_device(real_path, processor, package, log))
+
+
+def clear_device_cache():
+    _cache.clear()
+
+
+def device_cache_info() -> Dict[str, int]:
+    """Hit and miss counts and the current and maximum size of the device cache."""
+    return _cache.info()
+
+
+def set_device_cache_size(maxsize: int):
+    """Changes the number of devices kept; the least recently used ones are dropped first."""
+    _cache.resize(maxsize)
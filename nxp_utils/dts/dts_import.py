@@ -0,0 +1,310 @@
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from logging import Logger
+from typing import Any, Dict, List, Optional, Tuple
+from .builders.generate_gpio_logic_nodes import INTERRUPT_MAP
+from .builders.generate_node_i2c import I2C_TEMPLATE
+from .builders.generate_node_i2s import I2S_TEMPLATE
+from .builders.generate_node_spi import SPI_TEMPLATE
+from .builders.generate_node_uart import UART_TEMPLATE
+from .builders.node_generators import NodeTemplate, peripheral_type_of
+from .builders.pin_entry import PinEntry
+from .dts_parser import DtsSyntaxError, load_dts
+from .source_tree import DtsCells, DtsChange, DtsDocument, DtsNode, diff_documents
+from ..logger import redirect_stdout_handlers
+from ..profiling import record_count, stage
+
+# K64_PSEL(B, 22, 0x1)
+PSEL_PATTERN = re.compile(r"^\w+_PSEL\(\s*([A-Z]+)\s*,\s*(\d+)\s*,\s*([^)\s]+)\s*\)$")
+GPIO_PORT_PATTERN = re.compile(r"^GPIO[A-Z]+$")
+
+# Peripheral type -> template its node was rendered from, used to read the options back
+TEMPLATES: Dict[str, NodeTemplate] = {
+    "UART": UART_TEMPLATE,
+    "LPUART": UART_TEMPLATE,
+    "I2C": I2C_TEMPLATE,
+    "LPI2C": I2C_TEMPLATE,
+    "I2S": I2S_TEMPLATE,
+    "SAI": I2S_TEMPLATE,
+    "SPI": SPI_TEMPLATE,
+    "DSPI": SPI_TEMPLATE,
+    "LPSPI": SPI_TEMPLATE,
+}
+
+INTERRUPT_FLAGS = {flag: interrupt for interrupt, flag in INTERRUPT_MAP.items()}
+
+# Pinctrl group properties -> PinEntry fields, see generate_pinctrl_entry
+FLAG_FIELDS = {
+    "drive-open-drain": "open_drain",
+    "passive-filter": "passive_filter",
+    "digital-filter": "digital_filter",
+}
+
+
+@dataclass
+class ImportedBoard:
+    """Pin groups and peripheral options recovered from a DTS document."""
+    groups: Dict[str, List[PinEntry]] = field(default_factory=dict)
+    options: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    unresolved: List[str] = field(default_factory=list)
+
+
+def _recover_signal(peri_id: str, pin: str, index: str, mux_value: str, label: Optional[str],
+                    signal_to_pin_map: Optional[Dict[str, Any]]) -> Tuple[Optional[str], Optional[str]]:
+    """(func_label, user_label) of a muxed pin; func_label is None when the signal cannot be told."""
+    if GPIO_PORT_PATTERN.match(peri_id):
+        func_label = f"{peri_id}_{index}"
+        return func_label, label if label and label != func_label else None
+    for sig_id, options in (signal_to_pin_map or {}).get(peri_id, {}).items():
+        if any(opt["base_pin"] == pin and opt["mux_value"] == mux_value for opt in options):
+            func_label = f"{peri_id}_{sig_id}"
+            return func_label, label if label and label != func_label else None
+    # Without the signal configuration, only default labels name the signal
+    if label and label.startswith(f"{peri_id}_"):
+        return label, None
+    return None, label
+
+
+def _group_fields(group: DtsNode) -> Dict[str, Any]:
+    fields: Dict[str, Any] = {}
+    for pull in ("up", "down"):
+        if f"bias-pull-{pull}" in group.properties:
+            fields["pull"] = pull
+    for prop_name, field_name in (("drive-strength", "drive_strength"), ("slew-rate", "slew_rate")):
+        prop = group.properties.get(prop_name)
+        if prop is not None and isinstance(prop.value, str):
+            fields[field_name] = prop.value
+    for prop_name, field_name in FLAG_FIELDS.items():
+        if prop_name in group.properties:
+            fields[field_name] = True
+    return fields
+
+
+def _gpio_logic(document: DtsDocument) -> Dict[Tuple[str, str], Dict[str, Any]]:
+    """(GPIO port, pin index) -> gpio_init_state / gpio_interrupt from the &gpioX nodes."""
+    logic: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for name, node in document.nodes.items():
+        if not name.startswith("&gpio"):
+            continue
+        port = name[1:].upper()
+        for child in node.children.values():
+            gpios = child.properties.get("gpios")
+            if gpios is None or not isinstance(gpios.value, DtsCells) or len(gpios.value.items) < 2:
+                continue
+            flags = re.findall(r"\w+", gpios.value.items[2]) if len(gpios.value.items) > 2 else []
+            fields: Dict[str, Any] = {}
+            if "output-high" in child.properties:
+                fields["gpio_init_state"] = True
+            elif "output-low" in child.properties:
+                fields["gpio_init_state"] = False
+            interrupt = next((INTERRUPT_FLAGS[flag] for flag in flags if flag in INTERRUPT_FLAGS), None)
+            if interrupt:
+                fields["gpio_interrupt"] = interrupt
+            logic[(port, gpios.value.items[1])] = fields
+    return logic
+
+
+def import_document(document: DtsDocument,
+                    signal_to_pin_map: Optional[Dict[str, Any]] = None,
+                    peripherals: Optional[Dict[str, Any]] = None) -> ImportedBoard:
+    """
+    Reads the pin groups and peripheral options back from a document in the emitted subset:
+    &pinctrl <peripheral>_default groups of K64_PSEL cells, &gpioX logic nodes and peripheral
+    nodes rendered from the registered templates. With the signal configuration, pins whose
+    comment is a user label are resolved to their signal; otherwise they are reported as unresolved.
+    """
+    board = ImportedBoard()
+    logic = _gpio_logic(document)
+    pinctrl = document.nodes.get("&pinctrl")
+
+    for state in (pinctrl.children.values() if pinctrl else ()):
+        peri_id = state.name.upper()
+        if peri_id.endswith("_DEFAULT"):
+            peri_id = peri_id[:-len("_DEFAULT")]
+        for group in state.children.values():
+            pinmux = group.properties.get("pinmux")
+            if pinmux is None or not isinstance(pinmux.value, DtsCells):
+                continue
+            electrical = _group_fields(group)
+            comments = pinmux.value.comments or []
+            for i, item in enumerate(pinmux.value.items):
+                match = PSEL_PATTERN.match(item)
+                if not match:
+                    board.unresolved.append(f"{peri_id}: unsupported pinmux cell {item}")
+                    continue
+                port, index, mux_value = match.groups()
+                pin = f"PT{port}{index}"
+                label = comments[i] if i < len(comments) else None
+                func_label, user_label = _recover_signal(peri_id, pin, index, mux_value, label, signal_to_pin_map)
+                if func_label is None:
+                    board.unresolved.append(f"{peri_id}: no signal for {pin} ({label})")
+                    continue
+                fields = dict(electrical)
+                if GPIO_PORT_PATTERN.match(peri_id):
+                    fields.update(logic.get((peri_id, index), {}))
+                board.groups.setdefault(peri_id, []).append(
+                    PinEntry(base_pin=pin, mux_value=mux_value, func_label=func_label, user_label=user_label, **fields))
+
+    for name, node in document.nodes.items():
+        if not name.startswith("&"):
+            continue
+        peri_id = name[1:].upper()
+        template = TEMPLATES.get(peripheral_type_of(peri_id, peripherals))
+        if template is None:
+            continue
+        options = template.options_of(node)
+        if options:
+            board.options[peri_id] = options
+
+    record_count("dts_import.pins", sum(len(pins) for pins in board.groups.values()))
+    return board
+
+
+def board_config_from_import(board: ImportedBoard, name: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Board config mapping of the imported pins, in document order. Peripheral options go on the
+    first entry of their peripheral, as collect_peripheral_options expects.
+    """
+    mapping: List[Dict[str, Any]] = []
+    for peri_id, pins in board.groups.items():
+        options = board.options.get(peri_id, {})
+        for i, p in enumerate(pins):
+            entry: Dict[str, Any] = {"signal": p.func_label, "pin": p.base_pin}
+            for key, value in (("label", p.user_label), ("pull", p.pull), ("drive_strength", p.drive_strength),
+                               ("slew_rate", p.slew_rate), ("open_drain", p.open_drain),
+                               ("passive_filter", p.passive_filter), ("digital_filter", p.digital_filter),
+                               ("gpio_init_state", p.gpio_init_state), ("gpio_interrupt", p.gpio_interrupt)):
+                if value is not None:
+                    entry[key] = value
+            if i == 0:
+                entry.update(options)
+            mapping.append(entry)
+    board_config: Dict[str, Any] = {"mapping": mapping}
+    if name:
+        board_config = {"name": name, **board_config}
+    return {"board_config": board_config}
+
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, DtsNode):
+        return "\n".join(value.iter_lines())
+    if isinstance(value, DtsCells):
+        return repr(value)
+    # A boolean property has no value
+    return True if value is None else value
+
+
+def change_json(change: DtsChange) -> Dict[str, Any]:
+    """A DtsChange as plain data: nodes become their DTS text, cells their `<...>` form."""
+    result: Dict[str, Any] = {"path": change.path, "kind": change.kind, "name": change.name}
+    if change.kind != "added":
+        result["before"] = _json_value(change.before)
+    if change.kind != "removed":
+        result["after"] = _json_value(change.after)
+    return result
+
+
+class DtsImport:
+    """Compares existing DTS files structurally and migrates them to board_config.yaml."""
+
+    def __init__(self, logger: Logger, **kwargs):
+        self.log = logger
+        self.dts_paths: List[str] = kwargs.get("dts_paths") or []
+        self.report_path: Optional[str] = kwargs.get("diff_report_path")
+        self.output_board_config_path: Optional[str] = kwargs.get("output_board_config_path")
+        self.config_tools_data_file: Optional[str] = kwargs.get("config_tools_data_file_path")
+        self.mex_file: Optional[str] = kwargs.get("mex_file_path")
+        self.board_name: Optional[str] = kwargs.get("board_name")
+
+    def _load(self, path: str) -> Optional[DtsDocument]:
+        with stage(self.log, "dts.parse", path=path) as info:
+            try:
+                document = load_dts(path)
+            except (OSError, DtsSyntaxError) as e:
+                self.log.error("Failed to read DTS file: %s", e, extra={"path": path})
+                return None
+            info["nodes"] = len(document.nodes)
+        return document
+
+    def diff(self) -> bool:
+        log: Logger = self.log
+        if len(self.dts_paths) != 2:
+            log.error("DTS diff needs exactly two files", extra={"dts_paths": self.dts_paths})
+            return False
+        documents = [self._load(path) for path in self.dts_paths]
+        if None in documents:
+            return False
+
+        with stage(log, "dts.diff") as info:
+            changes = diff_documents(*documents)
+            info["changes"] = len(changes)
+        record_count("dts_diff.changes", len(changes))
+
+        report = {
+            "files": self.dts_paths,
+            "summary": {
+                "changes": len(changes),
+                **{kind: sum(1 for c in changes if c.kind == kind) for kind in ("changed", "added", "removed")},
+            },
+            "changes": [change_json(c) for c in changes],
+        }
+
+        if self.report_path:
+            with open(self.report_path, "w") as f:
+                json.dump(report, f, indent=2)
+            log.info("DTS diff report written to %s", self.report_path, extra=report["summary"])
+        else:
+            # stdout carries the report
+            redirect_stdout_handlers(log)
+            print(json.dumps(report, indent=2))
+        return True
+
+    def _signal_data(self, document: DtsDocument):
+        """Signal configuration of the document's peripherals, when the archive is available."""
+        if not self.config_tools_data_file or not os.path.exists(self.config_tools_data_file):
+            return None
+        # Deferred: the loader pulls in the parsers and zipfile (checked by dtsperf --import-time)
+        from .loader import ConfigToolsDataLoader
+        loader = ConfigToolsDataLoader(logger=self.log, user_board_config_file=None, data_file=self.config_tools_data_file,
+                                       mex_file=self.mex_file, mode="import_dts")
+        if not loader.load_all():
+            return None
+        peripherals = {name[1:].upper() for name in document.nodes if name.startswith("&")}
+        pinctrl = document.nodes.get("&pinctrl")
+        for state in (pinctrl.children.values() if pinctrl else ()):
+            peripherals.add(state.name.upper().rsplit("_DEFAULT", 1)[0])
+        return loader.load_signal_config(selection=peripherals)
+
+    def import_config(self) -> bool:
+        log: Logger = self.log
+        if len(self.dts_paths) != 1:
+            log.error("DTS import needs exactly one file", extra={"dts_paths": self.dts_paths})
+            return False
+        document = self._load(self.dts_paths[0])
+        if document is None:
+            return False
+
+        signal_data = self._signal_data(document)
+        with stage(log, "dts.import"):
+            board = import_document(document,
+                                    signal_data.signal_to_pin_map if signal_data else None,
+                                    signal_data.peripherals if signal_data else None)
+        for problem in board.unresolved:
+            log.warning("Skipped pin while importing: %s", problem, extra={"path": self.dts_paths[0]})
+
+        # Deferred like the loader: yaml is only needed to write the result
+        import yaml
+        config = board_config_from_import(board, self.board_name)
+        text = yaml.safe_dump(config, default_flow_style=False, sort_keys=False)
+        if self.output_board_config_path:
+            with open(self.output_board_config_path, "w") as f:
+                f.write(text)
+            log.info("Board config written to %s", self.output_board_config_path,
+                     extra={"entries": len(config["board_config"]["mapping"]), "unresolved": len(board.unresolved)})
+        else:
+            # stdout carries the board config
+            redirect_stdout_handlers(log)
+            print(text, end="")
+        return True
@@ -0,0 +1,252 @@
+import re
+from functools import lru_cache
+from typing import Iterator, List, Optional, Tuple
+from .source_tree import DtsCells, DtsDocument, DtsNode, DtsProperty, PropertyValue
+
+# One pass over the source: every alternative is anchored at the current position, so the
+# scan is linear in the input size. Cell lists are taken whole and split by _CELL_TOKEN.
+_TOKEN = re.compile(
+    r"""
+    (?P<ws>\s+)
+    |(?P<comment>/\*.*?\*/|//[^\n]*)
+    |(?P<directive>\#(?:include|define|undef|if|ifdef|ifndef|elif|else|endif|pragma)\b[^\n]*|/dts-v1/|/plugin/|/include/)
+    |(?P<string>"(?:[^"\\]|\\.)*")
+    |(?P<cells><(?:[^<>]|<<|>>)*>)
+    |(?P<bytes>\[[^\]]*\])
+    |(?P<label>[A-Za-z_][A-Za-z0-9_]*:)
+    |(?P<word>[A-Za-z0-9,._+\-@#&/?]+)
+    |(?P<punct>[{};=])
+    |(?P<error>.)
+    """, re.S | re.X)
+
+# Items of a cell list: comments, separators, macro calls and parenthesized expressions, plain words
+_CELL_TOKEN = re.compile(r"\s+|/\*(.*?)\*/|,|[^\s,()/]*\((?:[^()]|\((?:[^()]|\([^()]*\))*\))*\)|[^\s,/]+|/", re.S)
+
+# Token kinds that can span lines
+_MULTILINE_KINDS = frozenset(["ws", "comment", "string", "cells", "bytes"])
+
+_COMMA = re.compile(r"\s*,\s*")
+_PIPE = re.compile(r"\s*\|\s*")
+_OPEN = re.compile(r"\(\s+")
+_CLOSE = re.compile(r"\s+\)")
+
+# (kind, text, line)
+Token = Tuple[str, str, int]
+
+
+class DtsSyntaxError(ValueError):
+
+    def __init__(self, message: str, source: str, line: int):
+        super().__init__(f"{source}:{line}: {message}")
+        self.source = source
+        self.line = line
+
+
+def tokenize_dts(text: str, source: str = "<string>") -> Iterator[Token]:
+    """Yields the tokens of a DTS source with their line numbers; whitespace is dropped."""
+    line = 1
+    for m in _TOKEN.finditer(text):
+        kind = m.lastgroup
+        value = m.group()
+        if kind == "error":
+            raise DtsSyntaxError(f"unexpected character {value!r}", source, line)
+        if kind != "ws":
+            yield kind, value, line
+        if kind in _MULTILINE_KINDS:
+            line += value.count("\n")
+
+
+@lru_cache(maxsize=4096)
+def canonical_cell(item: str) -> str:
+    """Normalizes spacing inside macro calls and expressions, e.g. K64_PSEL(B,22,0x1) -> K64_PSEL(B, 22, 0x1)."""
+    if "(" not in item:
+        return item
+    item = _PIPE.sub(" | ", _COMMA.sub(", ", item))
+    return _CLOSE.sub(")", _OPEN.sub("(", item))
+
+
+def parse_cells(token: str) -> DtsCells:
+    """Parses a `< ... >` token. Comments after an item are kept as that item's comment."""
+    body = token[1:-1]
+    items: List[str] = []
+    comments: List[Optional[str]] = []
+    for m in _CELL_TOKEN.finditer(body):
+        text = m.group()
+        if text.isspace() or text == ",":
+            continue
+        if m.group(1) is not None:
+            if items:
+                comments[-1] = m.group(1).strip()
+            continue
+        items.append(canonical_cell(text))
+        comments.append(None)
+    has_comments = any(c is not None for c in comments)
+    return DtsCells(items, comments if has_comments else None, multiline="\n" in body)
+
+
+def _comment_text(token: str) -> str:
+    return token[2:-2].strip() if token.startswith("/*") else token[2:].strip()
+
+
+class _Parser:
+    """
+    Recursive descent over the token stream. A comment on its own line is kept for the node
+    or property that follows it; a comment after a property on the same line becomes that
+    property's comment.
+    """
+
+    def __init__(self, text: str, source: str):
+        self.source = source
+        self.tokens = tokenize_dts(text, source)
+        self.pending: Optional[str] = None
+        self.trailing: Optional[DtsProperty] = None
+        self.trailing_line = 0
+        self.line = 1
+        self.lookahead: Optional[Token] = None
+
+    def peek(self) -> Optional[Token]:
+        if self.lookahead is None:
+            self.lookahead = self._next_significant()
+        return self.lookahead
+
+    def take(self) -> Optional[Token]:
+        token = self.peek()
+        self.lookahead = None
+        if token is not None:
+            self.line = token[2]
+        return token
+
+    def _next_significant(self) -> Optional[Token]:
+        for kind, text, line in self.tokens:
+            if kind == "comment":
+                if self.trailing is not None and line == self.trailing_line:
+                    self.trailing.comment = _comment_text(text)
+                else:
+                    self.pending = _comment_text(text)
+                self.trailing = None
+                continue
+            if kind == "directive":
+                continue
+            self.trailing = None
+            return kind, text, line
+        return None
+
+    def error(self, message: str, token: Optional[Token] = None) -> DtsSyntaxError:
+        return DtsSyntaxError(message, self.source, token[2] if token else self.line)
+
+    def expect(self, text: str) -> Token:
+        token = self.take()
+        if token is None or token[1] != text:
+            raise self.error(f"expected {text!r}, got {token[1]!r}" if token else f"expected {text!r} at end of input", token)
+        return token
+
+    def parse_document(self) -> DtsDocument:
+        document = DtsDocument()
+        while self.peek() is not None:
+            if self.peek()[1] == ";":
+                # Stray terminators, e.g. after /dts-v1/
+                self.take()
+                continue
+            item = self.parse_item()
+            if isinstance(item, DtsNode):
+                document.add(item)
+        return document
+
+    def parse_item(self):
+        """A node or a property, starting at its labels or name."""
+        labels: List[str] = []
+        while self.peek() is not None and self.peek()[0] == "label":
+            labels.append(self.take()[1][:-1])
+        name_token = self.take()
+        if name_token is None:
+            raise self.error("unexpected end of input")
+        kind, name, line = name_token
+        if kind != "word":
+            raise self.error(f"expected a node or property name, got {name!r}", name_token)
+
+        if name.startswith("/delete-"):
+            # /delete-node/ and /delete-property/ statements are not part of the supported subset
+            while self.take()[1] != ";":
+                pass
+            return None
+
+        following = self.peek()
+        if following is not None and following[1] == "{":
+            return self.parse_node(name, labels[-1] if labels else None)
+        return self.parse_property(name)
+
+    def parse_node(self, name: str, label: Optional[str]) -> DtsNode:
+        node = DtsNode(name, label=label, comment=self.pending)
+        self.pending = None
+        self.expect("{")
+        while True:
+            token = self.peek()
+            if token is None:
+                raise self.error(f"unterminated node {name}")
+            if token[1] == "}":
+                break
+            item = self.parse_item()
+            if isinstance(item, DtsNode):
+                node.add_child(item)
+            elif isinstance(item, DtsProperty):
+                node.properties[item.name] = item
+        self.take()
+        self.expect(";")
+        return node
+
+    def parse_property(self, name: str) -> DtsProperty:
+        leading, self.pending = self.pending, None
+        token = self.take()
+        if token is None:
+            raise self.error(f"unterminated property {name}")
+        value: PropertyValue = None
+        if token[1] == "=":
+            value = self.parse_value()
+            token = self.take()
+        if token is None or token[1] != ";":
+            raise self.error(f"expected ';' after property {name}", token)
+        prop = DtsProperty(name, value, leading_comment=leading)
+        self.trailing = prop
+        self.trailing_line = token[2]
+        return prop
+
+    def parse_value(self) -> PropertyValue:
+        """Cell lists are merged; strings and byte strings are kept as text."""
+        cells: Optional[DtsCells] = None
+        strings: List[str] = []
+        while True:
+            token = self.take()
+            if token is None:
+                raise self.error("unterminated property value")
+            kind, text, _ = token
+            if kind == "cells":
+                parsed = parse_cells(text)
+                if cells is None:
+                    cells = parsed
+                else:
+                    cells.items.extend(parsed.items)
+            elif kind == "string":
+                strings.append(text[1:-1])
+            elif kind in ("bytes", "word"):
+                strings.append(text)
+            else:
+                raise self.error(f"unexpected {text!r} in property value", token)
+            following = self.peek()
+            if following is not None and following[0] == "word" and following[1] == ",":
+                self.take()
+                continue
+            break
+        if cells is not None and not strings:
+            return cells
+        # A string list is kept as the text between its outer quotes
+        return '", "'.join(strings)
+
+
+def parse_dts(text: str, source: str = "<string>") -> DtsDocument:
+    """Parses DTS source into a DtsDocument; nodes of the same name are merged as dtc does."""
+    return _Parser(text, source).parse_document()
+
+
+def load_dts(path: str) -> DtsDocument:
+    with open(path, encoding="utf-8") as f:
+        return parse_dts(f.read(), path)
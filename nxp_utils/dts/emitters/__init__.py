@@ -0,0 +1,2 @@
+from .registry import EMITTERS, EmitterContext, emit_targets, register_emitter
+from . import zephyr, linux, mcux
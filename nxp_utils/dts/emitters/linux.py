@@ -0,0 +1,62 @@
+from pathlib import Path
+from typing import List
+from ..source_tree import DtsCells, DtsDocument, DtsNode
+from .registry import EmitterContext, register_emitter
+
+SLEW_RATES = {"fast": 0, "slow": 1}
+
+
+def linux_output_path(output_path: str) -> str:
+    """frdm_k64f-pinctrl.dtsi -> frdm_k64f-pinctrl-linux.dtsi"""
+    path = Path(output_path)
+    return str(path.with_name(f"{path.stem}-linux{path.suffix or '.dtsi'}"))
+
+
+@register_emitter("linux")
+def emit_linux(ctx: EmitterContext) -> List[str]:
+    """
+    Linux-style pinctrl DTS: one `pinctrl_<peripheral>` group per peripheral using generic
+    pin configuration properties, plus a consumer node referencing it.
+    Passive and digital filters have no generic pinconf equivalent and are not emitted.
+    """
+    document = DtsDocument()
+    pinctrl = document.add(DtsNode("&pinctrl"))
+    peripheral_tables = ctx.pin_table.group_by("peripheral")
+
+    for peri_id, pins in peripheral_tables.items():
+        name = peri_id.lower()
+        group_node = pinctrl.add_child(DtsNode(f"{name}grp", label=f"pinctrl_{name}"))
+
+        for i, (sig_id, group) in enumerate(pins.group_by("signature").items(), 1):
+            pull, drive, slew, od, p_filter, d_filter = pins.signature_of(sig_id)
+            pins_node = group_node.add_child(DtsNode(f"pins{i}"))
+
+            psels = []
+            labels = []
+            for p, port, idx in zip(group.entry, group.port, group.index):
+                if port is None or not group.port_controlled:
+                    continue
+                psels.append(f"K64_PSEL({port}, {idx}, {p.mux_value})")
+                labels.append(p.user_label or p.func_label or p.base_pin)
+            pins_node.set("pinmux", DtsCells(psels, labels, multiline=True))
+
+            if pull in ['up', 'down']:
+                pins_node.set(f"bias-pull-{pull}")
+            else:
+                pins_node.set("bias-disable")
+            if drive:
+                pins_node.set("drive-strength", drive)
+            if slew in SLEW_RATES:
+                pins_node.set("slew-rate", DtsCells([SLEW_RATES[slew]]))
+            if od in [True, 'enable']:
+                pins_node.set("drive-open-drain")
+
+        consumer = document.add(DtsNode(f"&{name}"))
+        consumer.set("pinctrl-names", "default")
+        consumer.set("pinctrl-0", DtsCells([f"&pinctrl_{name}"]))
+        consumer.set("status", "okay")
+
+    path = linux_output_path(ctx.output_path)
+    with open(path, "w") as f:
+        document.write(f)
+    return [path]
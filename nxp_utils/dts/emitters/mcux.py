@@ -0,0 +1,168 @@
+import re
+from collections import Counter
+from typing import List, Optional
+from ..builders.pin_table import PinTable
+from .registry import EmitterContext, register_emitter
+
+MUX_NAMES = {
+    0: "kPORT_PinDisabledOrAnalog",
+    1: "kPORT_MuxAsGpio",
+}
+
+PULL_NAMES = {"up": "kPORT_PullUp", "down": "kPORT_PullDown"}
+
+
+def _mux_name(mux_value: Optional[str]) -> str:
+    """PORT mux constant of a MUX assign value; a connection without one leaves the pin disabled."""
+    try:
+        value = int(mux_value, 0)
+    except (TypeError, ValueError):
+        reason = "no MUX value" if mux_value is None else f"unrecognized MUX value {mux_value}"
+        return f"{MUX_NAMES[0]} /* {reason} */"
+    return MUX_NAMES.get(value, f"kPORT_MuxAlt{value}")
+
+
+def _enabled(value) -> bool:
+    return value in [True, 'enable']
+
+
+def _c_identifier(text: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_]", "_", text).upper()
+
+
+def pin_identifiers(table: PinTable) -> List[Optional[str]]:
+    """
+    C identifier stem of every row written to pin_mux.c/.h, None for rows that are not.
+    Rows share a label when a signal is routed to several pins; those stems get the pin
+    as a suffix, e.g. UART0_RX_PTA15. Raises ValueError if stems still collide.
+    """
+    stems: List[Optional[str]] = []
+    for p, port in zip(table.entry, table.port):
+        written = port is not None and table.port_controlled
+        stems.append(_c_identifier(p.user_label or p.func_label) if written else None)
+    repeated = {stem for stem, count in Counter(s for s in stems if s).items() if count > 1}
+    for i, stem in enumerate(stems):
+        if stem in repeated:
+            stems[i] = f"{stem}_PT{table.port[i]}{table.index[i]}"
+
+    duplicates = sorted(stem for stem, count in Counter(s for s in stems if s).items() if count > 1)
+    if duplicates:
+        raise ValueError(f"Duplicate pin_mux identifiers: {', '.join(duplicates)}")
+    return stems
+
+
+def generate_pin_mux_header(ctx: EmitterContext) -> List[str]:
+    lines = [
+        f"/* Pin routing for {ctx.board_name}, generated by dtsbuilder. */",
+        "",
+        "#ifndef _PIN_MUX_H_",
+        "#define _PIN_MUX_H_",
+        "",
+    ]
+
+    table = ctx.pin_table
+    for p, port, idx, name in zip(table.entry, table.port, table.index, pin_identifiers(table)):
+        if name is None:
+            continue
+        lines.append(f"#define BOARD_{name}_PORT PORT{port} /*!< PORT device name: PORT{port} */")
+        lines.append(f"#define BOARD_{name}_PIN {idx}U     /*!< PORT{port} pin index: {idx} */")
+        if "GPIO" in p.func_label:
+            lines.append(f"#define BOARD_{name}_GPIO GPIO{port} /*!< GPIO device name: GPIO{port} */")
+        lines.append("")
+
+    lines += [
+        "#if defined(__cplusplus)",
+        "extern \"C\" {",
+        "#endif",
+        "",
+        "/*! @brief Calls initialization functions. */",
+        "void BOARD_InitBootPins(void);",
+        "",
+        "/*! @brief Configures pin routing and optionally pin electrical features. */",
+        "void BOARD_InitPins(void);",
+        "",
+        "#if defined(__cplusplus)",
+        "}",
+        "#endif",
+        "",
+        "#endif /* _PIN_MUX_H_ */",
+    ]
+    return lines
+
+
+def generate_pin_mux_source(ctx: EmitterContext) -> List[str]:
+    table = ctx.pin_table
+    lines = [
+        f"/* Pin routing for {ctx.board_name}, generated by dtsbuilder. */",
+        "",
+        "#include \"fsl_common.h\"",
+        "#include \"fsl_port.h\"",
+        "#include \"fsl_gpio.h\"",
+        "#include \"pin_mux.h\"",
+        "",
+        "void BOARD_InitBootPins(void)",
+        "{",
+        "    BOARD_InitPins();",
+        "}",
+        "",
+        "void BOARD_InitPins(void)",
+        "{",
+    ]
+
+    ports = table.port if table.port_controlled else []
+    for port in sorted({port for port in ports if port is not None}):
+        lines.append(f"    /* Port {port} Clock Gate Control: Clock enabled */")
+        lines.append(f"    CLOCK_EnableClock(kCLOCK_Port{port});")
+        lines.append("")
+
+    for p, port, idx, name in zip(table.entry, table.port, table.index, pin_identifiers(table)):
+        if name is None:
+            continue
+        label = p.user_label or p.func_label
+        var = f"{name.lower()}_config"
+        gpio_var = f"{name.lower()}_gpio_config"
+
+        if "GPIO" in p.func_label and p.gpio_init_state is not None:
+            lines.append(f"    gpio_pin_config_t {gpio_var} = {{")
+            lines.append("        .pinDirection = kGPIO_DigitalOutput,")
+            lines.append(f"        .outputLogic = {1 if p.gpio_init_state else 0}U")
+            lines.append("    };")
+            lines.append(f"    /* Initialize GPIO functionality on pin PT{port}{idx} ({label}) */")
+            lines.append(f"    GPIO_PinInit(GPIO{port}, {idx}U, &{gpio_var});")
+            lines.append("")
+
+        lines.append(f"    const port_pin_config_t {var} = {{")
+        lines.append(f"        .pullSelect = {PULL_NAMES.get(p.pull, 'kPORT_PullDisable')},")
+        lines.append(f"        .slewRate = {'kPORT_SlowSlewRate' if p.slew_rate == 'slow' else 'kPORT_FastSlewRate'},")
+        lines.append(
+            f"        .passiveFilterEnable = {'kPORT_PassiveFilterEnable' if _enabled(p.passive_filter) else 'kPORT_PassiveFilterDisable'},")
+        lines.append(f"        .openDrainEnable = {'kPORT_OpenDrainEnable' if _enabled(p.open_drain) else 'kPORT_OpenDrainDisable'},")
+        lines.append(
+            f"        .driveStrength = {'kPORT_HighDriveStrength' if p.drive_strength == 'high' else 'kPORT_LowDriveStrength'},")
+        lines.append(f"        .mux = {_mux_name(p.mux_value)},")
+        lines.append("        .lockRegister = kPORT_UnlockRegister")
+        lines.append("    };")
+        lines.append(f"    /* PORT{port}{idx} is configured as {p.func_label} */")
+        lines.append(f"    PORT_SetPinConfig(PORT{port}, {idx}U, &{var});")
+        if p.gpio_interrupt:
+            lines.append(f"    PORT_SetPinInterruptConfig(PORT{port}, {idx}U, {p.gpio_interrupt});")
+        lines.append("")
+
+    if lines[-1] == "":
+        lines.pop()
+    lines.append("}")
+    return lines
+
+
+@register_emitter("mcux")
+def emit_mcux(ctx: EmitterContext) -> List[str]:
+    """MCUXpresso-style pin_mux.c/pin_mux.h placed next to the main output file."""
+    written = []
+    for file_name, generate in (("pin_mux.h", generate_pin_mux_header), ("pin_mux.c", generate_pin_mux_source)):
+        path = ctx.sibling_path(file_name)
+        with open(path, "w") as f:
+            for line in generate(ctx):
+                f.write(line)
+                f.write("\n")
+        written.append(path)
+    return written
@@ -0,0 +1,73 @@
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from logging import Logger
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from ..builders.pin_entry import PinEntry
+from ..builders.pin_table import PinTable
+from ...profiling import concurrent_stages, stage
+
+
+@dataclass(frozen=True)
+class EmitterContext:
+    """
+    Everything an emitter needs, resolved once per run and shared read-only by all targets.
+    """
+    board_name: str
+    board_config: Dict[str, Any]
+    peripheral_groups: Dict[str, List[PinEntry]]
+    pin_table: PinTable
+    signal_config: Any
+    output_path: str
+    log: Logger
+    # ClockTree of the package, None when the archive has no clock data
+    clock_tree: Any = None
+
+    def sibling_path(self, file_name: str) -> str:
+        """Path of a file placed next to the main output file."""
+        return str(Path(self.output_path).parent / file_name)
+
+
+# An emitter writes its files and returns the list of paths it wrote.
+Emitter = Callable[[EmitterContext], List[str]]
+
+EMITTERS: Dict[str, Emitter] = {}
+
+
+def register_emitter(name: str) -> Callable[[Emitter], Emitter]:
+    """Decorator registering an output target under the given name, e.g. @register_emitter("zephyr")."""
+
+    def decorator(fn: Emitter) -> Emitter:
+        EMITTERS[name] = fn
+        return fn
+
+    return decorator
+
+
+def emit_targets(ctx: EmitterContext, targets: Sequence[str], max_workers: Optional[int] = None) -> Dict[str, List[str]]:
+    """
+    Runs the selected emitters concurrently over the same context.
+    Returns the written paths per target. Raises if a target is unknown or any emitter fails.
+    """
+    unknown = [t for t in targets if t not in EMITTERS]
+    if unknown:
+        raise ValueError(f"Unsupported output target(s): {', '.join(unknown)}. Available: {', '.join(sorted(EMITTERS))}")
+
+    # Keep the first occurrence of every target so repeated flags do not write twice
+    selected = list(dict.fromkeys(targets))
+    results: Dict[str, List[str]] = {}
+    # The emitters' peak memory is measured for the fan-out as a whole
+    with stage(ctx.log, "emit"), ThreadPoolExecutor(max_workers=max_workers or len(selected) or 1) as pool:
+        # Each worker runs in a copy of the caller's context so stage timings reach the active recorder
+        with concurrent_stages():
+            futures = {target: pool.submit(contextvars.copy_context().run, _run_emitter, target, ctx) for target in selected}
+        for target, future in futures.items():
+            results[target] = future.result()
+            ctx.log.info("Emitted %s target", target, extra={"target": target, "paths": results[target]})
+    return results
+
+
+def _run_emitter(target: str, ctx: EmitterContext) -> List[str]:
+    with stage(ctx.log, f"emit.{target}"):
+        return EMITTERS[target](ctx)
@@ -0,0 +1,15 @@
+from typing import List
+from ..builders.generate_board_dtsi import generate_board_document
+from ...profiling import stage
+from .registry import EmitterContext, register_emitter
+
+
+@register_emitter("zephyr")
+def emit_zephyr(ctx: EmitterContext) -> List[str]:
+    """Zephyr board-level pinctrl DTSI, written to the main output path."""
+    document = generate_board_document(ctx.pin_table, ctx.board_config, ctx.signal_config.peripherals, ctx.log,
+                                       ctx.clock_tree)
+    with stage(ctx.log, "write.zephyr_dtsi", path=ctx.output_path):
+        with open(ctx.output_path, "w") as f:
+            document.write(f)
+    return [ctx.output_path]
@@ -1,75 +1,77 @@
 import os
 import re
 import zipfile
-import json
-import yaml
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, List
 from logging import Logger
 import traceback
-from .mex_config import MicrocontrollerExportConfiguration
+import xml.etree.ElementTree as ET
+from .board_config import BoardConfigError, ConfigIssue, load_board_config, load_fragment, resolve_board_config
+from .mex_config import MicrocontrollerExportConfiguration, controller_type_of
 from .signal_config import SignalConfiguration
+from .clock_tree import MODULE_CLOCKS_FILE, ClockTree, parse_module_clocks
+from ..logger import lazy
+from ..profiling import stage
 
 
 class ConfigToolsDataLoader:
     """Handles the extraction and indexing of NXP Config Tools data archives."""
 
-    def __init__(self, logger: Logger, user_board_config_file: str, data_file: str, mex_file: Optional[str] = None, mode: str = "build_dts"):
+    def __init__(self, logger: Logger, user_board_config_file: str, data_file: str, mex_file: Optional[str] = None, mode: str = "build_dts",
+                 parse_workers: int = 1):
         self.log: Logger = logger
         self.data_file = data_file
         self.mex_file = mex_file
         self.user_board_config_file = user_board_config_file
         self.mode = mode
+        self.parse_workers = parse_workers
 
         self.archive: zipfile.ZipFile = None
         self.mex_config: MicrocontrollerExportConfiguration = None
         self.user_board_config: dict = None
+        self.board_config_issues: List[ConfigIssue] = []
         self.data_version: str = "unknown"
         self.processor_data_path: str = ""
         self.is_mex_file_archived: bool = not bool(mex_file)
 
     def load_all(self) -> bool:
         """Sequential execution of the loading pipeline."""
-        if self.mode not in ["query_dts"]:
-            if not self._load_user_board_config(): return False
-        if not self._load_config_tools_data_archive(): return False
-        if not self._load_mex_config(): return False
-        if not self._load_processor_data_files(): return False
+        # Queries, archive diffs and DTS imports do not need a board config
+        if self.mode not in ["query_dts", "query_stream", "diff_archives", "import_dts"]:
+            with stage(self.log, "board_config.load"):
+                if not self._load_user_board_config(): return False
+        with stage(self.log, "archive.open"):
+            if not self._load_config_tools_data_archive(): return False
+        with stage(self.log, "mex.parse"):
+            if not self._load_mex_config(): return False
+        with stage(self.log, "processor_path.check"):
+            if not self._load_processor_data_files(): return False
         return True
 
     def parse_user_board_config(self, file_path: str) -> Dict[str, Any]:
         """
         Parses a file path and returns a dictionary.
-        Supports .json, .yaml, and .yml extensions.
+        Supports .json, .yaml, and .yml extensions. The board_config section is resolved with
+        the fragments it extends or includes, see resolve_board_config.
         """
-        _, ext = os.path.splitext(file_path.lower())
-        
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                if ext == '.json':
-                    data = json.load(file)
-                elif ext in ['.yaml', '.yml']:
-                    data = yaml.safe_load(file)
-                else:
-                    # Attempt to guess format if extension is non-standard
-                    content = file.read()
-                    try:
-                        data = json.loads(content)
-                    except json.JSONDecodeError:
-                        data = yaml.safe_load(content)
-                
-                # Ensure the output is actually a dictionary
-                if isinstance(data, dict):
-                    return data
-                else:
-                    raise ValueError(f"File content is {type(data)}, expected dict.")
-
-        except (FileNotFoundError, yaml.YAMLError, json.JSONDecodeError) as e:
-            print(f"Parsing error: {e}")
+            data = load_fragment(file_path)
+            if isinstance(data.get("board_config"), dict):
+                return {**data, "board_config": resolve_board_config(file_path)}
+            return dict(data)
+        except FileNotFoundError as e:
+            self.log.error("Board configuration file does not exist: %s", e.filename, extra={"path": file_path})
             return {}
-            
+        except BoardConfigError as e:
+            self._log_board_config_issues(e.issues)
+            return {}
+
+    def _log_board_config_issues(self, issues: Iterable[ConfigIssue]):
+        for issue in issues:
+            self.log.error("Invalid board configuration: %s", issue, extra={"path": issue.path, "line": issue.line})
+
     def _load_user_board_config(self) -> bool:
         """
-        Loads the user selection for board configuration. 
+        Loads the user selection for board configuration and validates it, see load_board_config.
         """
         if not self.user_board_config_file:
             self.log.error("No input user-selected board configuration file found")
@@ -80,27 +82,29 @@ class ConfigToolsDataLoader:
             return False
 
         try:
-            self.user_board_config = self.parse_user_board_config(self.user_board_config_file).get("board_config", {})
-            if self.user_board_config:
-                self.log.info("User-selected board configuration loaded successfully", extra={"count": len(self.user_board_config)})
-
-                # Debugging print to see what we got
-                self.log.debug("Loaded mappings: %s", self.user_board_config)
-
-                # Validate for electrical/logical overlaps
-                if not self.validate_user_board_config():
-                    self.log.error("Generation aborted due to pin conflicts.")
-                    return False
-                return True
-            self.log.warning("Board configuration file was loaded but appeared empty.")
-            return False
-        except json.JSONDecodeError as e:
-            self.log.error("Failed to parse JSON in %s: %s", self.user_board_config_file, e)
+            self.user_board_config, self.board_config_issues = load_board_config(self.user_board_config_file)
+        except BoardConfigError as e:
+            self.board_config_issues = e.issues
+            self.validate_user_board_config()
             return False
         except Exception as e:
             self.log.error("Failed to load user-selected board configuration data: %s", e, exc_info=True)
             return False
 
+        # Validate the schema and check for electrical/logical overlaps
+        if not self.validate_user_board_config():
+            self.log.error("Generation aborted due to invalid board configuration.", extra={"issues": len(self.board_config_issues)})
+            return False
+        if self.user_board_config.get("mapping"):
+            self.log.info("User-selected board configuration loaded successfully",
+                          extra={"count": len(self.user_board_config["mapping"])})
+
+            # Debugging print to see what we got; %s defers the formatting to DEBUG
+            self.log.debug("Loaded mappings: %s", self.user_board_config)
+            return True
+        self.log.warning("Board configuration file was loaded but appeared empty.")
+        return False
+
     def _load_config_tools_data_archive(self) -> bool:
         """
         Loads the config tools data zip file and lists its contents.
@@ -122,16 +126,18 @@ class ConfigToolsDataLoader:
             all_files = self._archive.namelist()
 
             # Filter for .mex files
-            mex_files = [f for f in all_files if f.lower().endswith('.mex')]
+            def find_mex_files() -> List[str]:
+                return [f for f in all_files if f.lower().endswith('.mex')]
 
             self.log.debug("Data file loaded and indexed",
                            extra={
                                "path": self.data_file,
                                "total_files": len(all_files),
-                               "mex_files_found": mex_files
+                               "mex_files_found": lazy(find_mex_files)
                            })
 
             if self.is_mex_file_archived:
+                mex_files = find_mex_files()
                 if len(mex_files) < 0:
                     raise Exception(f"no .mex file found in {self.data_file}")
                 elif len(mex_files) > 1:
@@ -143,7 +149,7 @@ class ConfigToolsDataLoader:
                     content = stream.read().decode('utf-8')
                     match = re.search(r'data_version=([\d\.]+)', content)
                     if match:
-                        self.config_tools_data_version = match.group(1)
+                        self.config_tools_data_version = self.data_version = match.group(1)
                         self.log.debug("Discovered config tools data version", extra={"version": self.config_tools_data_version})
             else:
                 self.log.warning("npidata.mf not found in archive root; version defaults to 0.0")
@@ -236,36 +242,52 @@ class ConfigToolsDataLoader:
 
     def validate_user_board_config(self) -> bool:
         """
-        Ensures no physical pin is assigned to multiple signals in board.json.
+        Reports the issues found while loading the board config: schema violations and
+        physical pins assigned to multiple signals, each with its file and line.
         """
-        # Track usage: { "PTB16": "UART0_RX", ... }
-        pin_usage = {}
-        conflicts = []
-
-        mapping_list = self.user_board_config.get('board_config', {}).get('mapping', [])
-        for entry in mapping_list:
-            # Extract from the new list structure
-            signal_key = entry.get('signal') # e.g., "UART0_RX"
-            chosen_pin = entry.get('pin')    # e.g., "PTB16"
-            if chosen_pin in pin_usage:
-                conflicts.append(
-                    f"CONFLICT: Pin {chosen_pin} is assigned to both "
-                    f"'{pin_usage[chosen_pin]}' and '{signal_key}'"
-                )
-            else:
-                pin_usage[chosen_pin] = signal_key
-
-        if conflicts:
-            for error in conflicts:
-                self.log.error(error)
+        if self.board_config_issues:
+            self._log_board_config_issues(self.board_config_issues)
             return False
-        
+
         self.log.info("Board configuration validation passed: No pin conflicts detected.")
         return True
-        
-    def load_signal_config(self) -> Optional[SignalConfiguration]:
+
+    def load_clock_tree(self) -> Optional[ClockTree]:
+        """
+        Reads module_clocks.xml from the package directory, or from the processor directories
+        above it. Returns None when the archive has no usable clock data.
+        """
+        log: Logger = self.log
+        if not self._archive or not self.processor_data_path:
+            return None
+
+        names = set(self._archive.namelist())
+        parts = self.processor_data_path.split("/")
+        # processors/<proc>/ksdk2_0/<pkg>, processors/<proc>/ksdk2_0, processors/<proc>
+        for depth in range(len(parts), 1, -1):
+            target_path = "/".join(parts[:depth] + [MODULE_CLOCKS_FILE])
+            if target_path not in names:
+                continue
+            with stage(log, "clocks.parse", path=target_path) as info:
+                try:
+                    clock_tree = parse_module_clocks(self._archive.read(target_path))
+                except ET.ParseError as e:
+                    log.warning("Ignoring unreadable clock data", extra={"path": target_path, "reason": str(e)})
+                    return None
+                info["clocks"] = len(clock_tree.nodes)
+                info["modules"] = len(clock_tree.modules)
+            return clock_tree
+
+        log.debug("No clock data in archive", extra={"processor_path": self.processor_data_path})
+        return None
+
+    def load_signal_config(self, selection: Optional[Iterable[str]] = None,
+                           controller_type: Optional[str] = None) -> Optional[SignalConfiguration]:
         """
         Reads signal_configuration.xml from the internal processor path.
+        With `selection`, only those peripheral ids are parsed; see SignalConfiguration.
+        The pins section is parsed by `parse_workers` processes. Pin names are decoded for
+        `controller_type`, by default the controller family of the MEX processor.
         """
         log: Logger = self.log
         if not self._archive or not self.processor_data_path:
@@ -280,9 +302,16 @@ class ConfigToolsDataLoader:
                 log.error("signal_configuration.xml missing from archive", extra={"path": target_path})
                 return None
 
-            with self._archive.open(target_path) as stream:
-                # Read binary data and pass to the dedicated parser
-                return SignalConfiguration(stream.read(), self.log)
+            # Read binary data and pass to the dedicated parser
+            with stage(log, "signal_config.decompress", path=target_path) as info:
+                with self._archive.open(target_path) as stream:
+                    data = stream.read()
+                info["bytes"] = len(data)
+
+            with stage(log, "signal_config.parse"):
+                controller_type = controller_type or controller_type_of(self.mex_config.get_processor_name() or "")
+                return SignalConfiguration(data, self.log, selection, workers=self.parse_workers,
+                                           controller_type=controller_type)
 
         except Exception as e:
             traceback.print_exc()
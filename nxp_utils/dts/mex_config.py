@@ -8,6 +8,30 @@ from typing import Optional, Union
 PathOrData = Union[str, Path, bytes, io.BytesIO]
 
 
+def controller_type_of(processor_name: str) -> Optional[str]:
+    """Pin controller family of a processor: PORT, IOMUX or IOCON; None when unknown."""
+    # Select family of pin controller based on SOC type
+    if "IMXRT1" in processor_name:
+        # Use IMX config tools
+        return 'IOMUX'
+    if "IMXRT6" in processor_name:
+        # LPC config tools
+        return 'IOCON'
+    if "IMXRT5" in processor_name:
+        # LPC config tools
+        return 'IOCON'
+    if "LPC55" in processor_name:
+        # LPC config tools
+        return 'IOCON'
+    if "MK" in processor_name:
+        # Kinetis config tools
+        return 'PORT'
+    if "MCX" in processor_name:
+        # Kinetis config tools
+        return 'PORT'
+    return None
+
+
 class MicrocontrollerExportConfiguration:
     """
     Convenience methods used to get board and processor data from NXP configuration files.
@@ -108,24 +132,8 @@ class MicrocontrollerExportConfiguration:
 
     def get_controller_type(self) -> Optional[str]:
         processor_name = self.get_processor_name()
-        # Select family of pin controller based on SOC type
-        if "IMXRT1" in processor_name:
-            # Use IMX config tools
-            return 'IOMUX'
-        if "IMXRT6" in processor_name:
-            # LPC config tools
-            return 'IOCON'
-        if "IMXRT5" in processor_name:
-            # LPC config tools
-            return 'IOCON'
-        if "LPC55" in processor_name:
-            # LPC config tools
-            return 'IOCON'
-        if "MK" in processor_name:
-            # Kinetis config tools
-            return 'PORT'
-        if "MCX" in processor_name:
-            # Kinetis config tools
-            return 'PORT'
+        controller_type = controller_type_of(processor_name)
+        if controller_type is not None:
+            return controller_type
         # Unknown processor family
         raise Exception(f"Unsupported processor name: {processor_name}")
\ No newline at end of file
@@ -0,0 +1,159 @@
+import re
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+# Name kinds
+PERIPHERAL = "peripheral"
+SIGNAL = "signal"            # "<peripheral>_<signal>", the key used by board configs
+FUNC_LABEL = "func_label"    # package function name, e.g. "UART0_RX" or "ADC0_SE12"
+PIN = "pin"                  # base pin, e.g. "PTB16"
+GPIO_KEY = "gpio_key"        # GPIO signal key of a pin, e.g. "GPIOB_16"
+
+# Kinds a board config may use as its `signal` key
+SIGNAL_KINDS = (SIGNAL, FUNC_LABEL, GPIO_KEY)
+
+_TERMINAL = ""
+_DIGITS = re.compile(r"(\d+)")
+
+
+def natural_key(name: str) -> Tuple[Any, ...]:
+    """Sort key ordering PTC9 before PTC10."""
+    return tuple(int(part) if part.isdigit() else part for part in _DIGITS.split(name))
+
+
+def trigrams(name: str) -> Set[str]:
+    """Character trigrams of a name padded with "$" on both ends, so short names still index."""
+    padded = f"${name}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex:
+    """
+    Case-insensitive index over every name in a signal_to_pin_map: peripherals, signal keys,
+    function labels, pins and GPIO keys.
+
+    A prefix trie answers completions by walking only the subtree under the prefix. A trigram
+    index answers "did you mean" lookups by scoring only names that share a trigram with the
+    query.
+    """
+
+    def __init__(self):
+        self.names: List[str] = []
+        self.kinds: List[Set[str]] = []
+        # Pins on which each name can be used
+        self.pins: List[Set[str]] = []
+        self._ids: Dict[str, int] = {}
+        self._trie: Dict[str, Any] = {}
+        self._trigrams: Dict[str, List[int]] = {}
+        self._trigram_counts: List[int] = []
+        # Pin -> ids of the signal names usable on it
+        self._pin_names: Dict[str, Set[int]] = {}
+
+    @classmethod
+    def from_signal_to_pin_map(cls, signal_to_pin_map: Dict[str, Any]) -> "NameIndex":
+        index = cls()
+        for peri_id, signals in signal_to_pin_map.items():
+            for sig_id, options in signals.items():
+                pins = [opt["base_pin"] for opt in options]
+                index.add(peri_id, PERIPHERAL, pins)
+                index.add(f"{peri_id}_{sig_id}", SIGNAL, pins)
+                for opt in options:
+                    base_pin = opt["base_pin"]
+                    index.add(base_pin, PIN, [base_pin])
+                    if opt.get("func_label"):
+                        index.add(opt["func_label"], FUNC_LABEL, [base_pin])
+                    if sig_id == "GPIO" and base_pin.startswith("PT"):
+                        # Board configs name GPIO pins as GPIO<port>_<index>, e.g. PTB22 -> GPIOB_22
+                        index.add(f"{peri_id}_{base_pin[3:]}", GPIO_KEY, [base_pin])
+        return index
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name.upper() in self._ids
+
+    def add(self, name: str, kind: str, pins: Iterable[str] = ()):
+        key = name.upper()
+        name_id = self._ids.get(key)
+        if name_id is None:
+            name_id = self._ids[key] = len(self.names)
+            self.names.append(name)
+            self.kinds.append(set())
+            self.pins.append(set())
+
+            node = self._trie
+            for ch in key:
+                node = node.setdefault(ch, {})
+            node[_TERMINAL] = name_id
+
+            grams = trigrams(key)
+            for gram in grams:
+                self._trigrams.setdefault(gram, []).append(name_id)
+            self._trigram_counts.append(len(grams))
+        self.kinds[name_id].add(kind)
+        self.pins[name_id].update(pins)
+        if kind in SIGNAL_KINDS:
+            for pin in pins:
+                self._pin_names.setdefault(pin, set()).add(name_id)
+
+    def kinds_of(self, name: str) -> Set[str]:
+        name_id = self._ids.get(name.upper())
+        return set(self.kinds[name_id]) if name_id is not None else set()
+
+    def pins_for(self, name: str) -> List[str]:
+        """Pins on which the name can be used, e.g. every pin carrying UART0_RX."""
+        name_id = self._ids.get(name.upper())
+        return sorted(self.pins[name_id], key=natural_key) if name_id is not None else []
+
+    def signals_on(self, pin: str, kinds: Iterable[str] = SIGNAL_KINDS) -> List[str]:
+        """Signal names usable on a pin, e.g. PTB16 -> GPIOB_16, UART0_RX, ..."""
+        wanted = set(kinds)
+        ids = self._pin_names.get(pin, ())
+        return sorted((self.names[i] for i in ids if self.kinds[i] & wanted), key=natural_key)
+
+    def complete(self, prefix: str, limit: int = 20, kinds: Optional[Iterable[str]] = None) -> List[str]:
+        """Names starting with prefix in alphabetical order, at most `limit` of them."""
+        node = self._trie
+        for ch in prefix.upper():
+            node = node.get(ch)
+            if node is None:
+                return []
+        wanted = set(kinds) if kinds else None
+
+        results: List[str] = []
+        # Depth-first in reverse-sorted push order pops children alphabetically
+        stack = [node]
+        while stack and len(results) < limit:
+            node = stack.pop()
+            name_id = node.get(_TERMINAL)
+            if name_id is not None and (wanted is None or self.kinds[name_id] & wanted):
+                results.append(self.names[name_id])
+            stack.extend(node[ch] for ch in sorted((ch for ch in node if ch), reverse=True))
+        return results
+
+    def suggest(self, query: str, limit: int = 5, kinds: Optional[Iterable[str]] = None,
+                min_score: float = 0.3) -> List[Tuple[str, float]]:
+        """Closest names by trigram (Dice) similarity, best first."""
+        grams = trigrams(query.upper())
+        wanted = set(kinds) if kinds else None
+
+        # Candidates come from the rare trigrams only; "$PT" alone matches every pin of a large
+        # part. Shared trigrams are then counted exactly for the candidates.
+        postings = sorted((self._trigrams.get(gram, ()) for gram in grams), key=len)
+        cutoff = max(256, len(self.names) // 20)
+        candidates: Set[int] = set()
+        for ids in postings:
+            if candidates and len(ids) > cutoff:
+                break
+            candidates.update(ids)
+
+        scored = []
+        for name_id in candidates:
+            if wanted is not None and not self.kinds[name_id] & wanted:
+                continue
+            common = len(grams & trigrams(self.names[name_id].upper()))
+            score = 2 * common / (len(grams) + self._trigram_counts[name_id])
+            if score >= min_score:
+                scored.append((self.names[name_id], round(score, 3)))
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return scored[:limit]
@@ -1,7 +1,7 @@
 from ..utils import print_xml
 from logging import Logger
 import xml.etree.ElementTree as ET
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Set
 from pprint import pprint
 
 
@@ -17,7 +17,8 @@ def _parse_channels(signal_node: ET.Element) -> List[Dict[str, str]]:
         })
     return channels
 
-def parse_peripheral_types(root=ET.Element, log=Logger) -> Dict[str, Any]:
+def parse_peripheral_types(root=ET.Element, log=Logger, only: Optional[Set[str]] = None) -> Dict[str, Any]:
+    """Parses <peripheral_types>. With `only`, other types are skipped."""
     entries = {}
     log.debug("Parsing peripheral types")
 
@@ -34,7 +35,7 @@ def parse_peripheral_types(root=ET.Element, log=Logger) -> Dict[str, Any]:
         # print_xml(node)
 
         entry_id = node.get("id")
-        if not entry_id:
+        if not entry_id or (only is not None and entry_id not in only):
             continue
 
         entry = {
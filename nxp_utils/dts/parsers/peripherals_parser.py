@@ -1,10 +1,11 @@
 from ..utils import print_xml
 from logging import Logger
 import xml.etree.ElementTree as ET
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Set
 from pprint import pprint
 
-def parse_peripherals(root=ET.Element, peripheral_types: Dict[str, Any]={}, log=Logger) -> Dict[str, Any]:
+def parse_peripherals(root=ET.Element, peripheral_types: Dict[str, Any]={}, log=Logger, only: Optional[Set[str]] = None) -> Dict[str, Any]:
+    """Parses <peripherals>. With `only`, other peripherals are skipped."""
     entries = {}
     log.debug("Parsing peripherals")
 
@@ -20,7 +21,7 @@ def parse_peripherals(root=ET.Element, peripheral_types: Dict[str, Any]={}, log=
         # print('\n')
         # print_xml(node)
         entry_id = node.get("id")
-        if not entry_id:
+        if not entry_id or (only is not None and entry_id not in only):
             continue
         entry_type = node.get("peripheral_type")
         entry = {
@@ -0,0 +1,36 @@
+import re
+from typing import Iterable, List, Optional, Tuple
+
+PINS_OPEN = b"<pins>"
+PINS_CLOSE = b"</pins>"
+PIN_CLOSE = b"</pin>"
+
+
+def split_pins_section(data: bytes) -> Optional[Tuple[bytes, List[bytes], bytes]]:
+    """
+    Splits signal_configuration.xml into the part before <pins>, the raw <pin> elements and
+    the part after </pins>, without parsing it. Returns None when the layout is not the
+    expected one, in which case callers fall back to parsing the whole document.
+    """
+    start = data.find(PINS_OPEN)
+    end = data.rfind(PINS_CLOSE)
+    if start < 0 or end < start:
+        return None
+    body = data[start + len(PINS_OPEN):end]
+    pins = [chunk + PIN_CLOSE for chunk in body.split(PIN_CLOSE)[:-1]]
+    # Anything between the last </pin> and </pins> must be whitespace
+    if body.rsplit(PIN_CLOSE, 1)[-1].strip():
+        return None
+    return data[:start], pins, data[end + len(PINS_CLOSE):]
+
+
+def peripheral_reference_pattern(peripherals: Iterable[str]) -> "re.Pattern[bytes]":
+    """Matches a peripheral_signal_ref to any of the given peripherals, e.g. peripheral="UART0"."""
+    names = b"|".join(re.escape(p.encode("utf-8")) for p in sorted(peripherals))
+    return re.compile(rb"""peripheral=(["'])(?:""" + names + rb""")\1""")
+
+
+def select_pins(pins: List[bytes], peripherals: Iterable[str]) -> List[bytes]:
+    """Raw <pin> elements with at least one connection to one of the peripherals."""
+    pattern = peripheral_reference_pattern(peripherals)
+    return [pin for pin in pins if pattern.search(pin)]
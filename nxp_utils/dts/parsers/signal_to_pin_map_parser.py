@@ -1,30 +1,28 @@
 from ..utils import print_xml
 from logging import Logger
 import xml.etree.ElementTree as ET
-from typing import Dict, Any, List
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Iterable, List, Optional, Set, Tuple
 from pprint import pprint
+from ..pin_decoders import PinDecoder, PinLocation, decoder_for
+from ..pin_properties import PinStates, pin_functional_properties
+from .pins_section import PINS_CLOSE, PINS_OPEN
 
 
-def parse_signal_to_pin_map(root=ET.Element,
-                            peripheral_types: Dict[str, Any] = {},
-                            peripherals: Dict[str, Any] = {},
-                            log=Logger) -> Dict[str, Any]:
-
+def map_pins(pins: Iterable[ET.Element], only: Optional[Set[str]] = None,
+             pin_properties: Optional[PinStates] = None,
+             decoder: Optional[PinDecoder] = None,
+             pin_locations: Optional[Dict[str, PinLocation]] = None) -> Dict[str, Any]:
     """
-    Parses the <pins> section to create a mapping of:
-    Peripheral -> Signal -> Pin Options (Mux, Coords, Properties)
+    Builds the Peripheral -> Signal -> Pin Options map of the given <pin> elements, in
+    document order. A pin is routable when one of its labels is a pin name of the
+    controller family of `decoder` (default PORT); that label is its base pin.
+    With `pin_properties` and `pin_locations`, the functional properties and decoded
+    location of each routable pin are collected into them on the same pass.
     """
-    log.debug("Parsing hardware pin-to-signal mapping table")
+    decoder = decoder or decoder_for(None)
     mapping = {}
-
-    # Locate the container node
-    node_key = "pins"
-    pins_node = root.find(node_key)
-    if pins_node is None:
-        log.warning("No %s found in XML for building hardware pin-to-signal mapping table", node_key)
-        return mapping
-
-    for pin in pins_node.findall("pin"):
+    for pin in pins:
         # print_xml(pin)
         entry = {}
         # The 'name' attribute looks like: "ADC1_SE4a/PTE0/SPI1_PCS1/UART1_TX/..."
@@ -43,21 +41,34 @@ def parse_signal_to_pin_map(root=ET.Element,
             raise Exception(f"Malformed name {pin.get("name", "")} or {pin.get("description", "")}")
 
         # Identify the Base GPIO name (e.g., PTA1). If None, it's non-routable.
-        base_pin = next((l for l in labels if l.startswith("PT")), None)
-
-        # A pin is "routable" only if it has a Port Control Register (starts with PT)
+        base_pin, location = None, None
+        for label in labels:
+            location = decoder.decode(label)
+            if location is not None:
+                base_pin = label
+                break
+
+        # A pin is "routable" only if it has a mux register (e.g. a Port Control Register)
         is_routable = base_pin is not None
+        if is_routable and pin_locations is not None:
+            pin_locations[base_pin] = location
+        if is_routable and pin_properties is not None:
+            properties = pin_functional_properties(pin)
+            if properties:
+                pin_properties[base_pin] = properties
 
         for connections in pin.findall("connections"):
             name_part = connections.get("name_part")
             alt_mode = connections.get("package_function")
-            
+
             for conn in connections.findall("connection"):
                 sig_ref = conn.find("peripheral_signal_ref")
                 if sig_ref is None:
                     continue
 
                 peri_id = sig_ref.get("peripheral")
+                if only is not None and peri_id not in only:
+                    continue
                 sig_id = sig_ref.get("signal")
 
                 # Extract Mux Value
@@ -85,7 +96,37 @@ def parse_signal_to_pin_map(root=ET.Element,
                     "description": label_meta.get(name_part, ""),
                 }
                 mapping[peri_id][sig_id].append(entry)
-    
+    return mapping
+
+
+def parse_signal_to_pin_map(root=ET.Element,
+                            peripheral_types: Dict[str, Any] = {},
+                            peripherals: Dict[str, Any] = {},
+                            log=Logger,
+                            only: Optional[Set[str]] = None,
+                            pin_properties: Optional[PinStates] = None,
+                            controller_type: Optional[str] = None,
+                            pin_locations: Optional[Dict[str, PinLocation]] = None) -> Dict[str, Any]:
+
+    """
+    Parses the <pins> section to create a mapping of:
+    Peripheral -> Signal -> Pin Options (Mux, Coords, Properties)
+    With `only`, connections to other peripherals are skipped. With `pin_properties` and
+    `pin_locations`, the functional properties and the locations of each pin are collected
+    into them; pin names are decoded for `controller_type`, see map_pins.
+    """
+    log.debug("Parsing hardware pin-to-signal mapping table")
+    mapping = {}
+
+    # Locate the container node
+    node_key = "pins"
+    pins_node = root.find(node_key)
+    if pins_node is None:
+        log.warning("No %s found in XML for building hardware pin-to-signal mapping table", node_key)
+        return mapping
+
+    mapping = map_pins(pins_node.findall("pin"), only, pin_properties, decoder_for(controller_type), pin_locations)
+
     log.debug("Mapped signals for %d peripherals", len(mapping))
     # pprint(mapping)
 
@@ -94,3 +135,60 @@ def parse_signal_to_pin_map(root=ET.Element,
 
     # pprint(routable_uart_tx)
     return mapping
+
+
+def parse_pins_chunk(chunk: bytes, only: Optional[Set[str]] = None,
+                     controller_type: Optional[str] = None) -> Tuple[Dict[str, Any], PinStates, Dict[str, PinLocation]]:
+    """Worker: maps a run of raw <pin> elements cut from the <pins> section, with their functional properties and locations."""
+    pin_properties: PinStates = {}
+    pin_locations: Dict[str, PinLocation] = {}
+    mapping = map_pins(ET.fromstring(PINS_OPEN + chunk + PINS_CLOSE).findall("pin"), only, pin_properties,
+                       decoder_for(controller_type), pin_locations)
+    return mapping, pin_properties, pin_locations
+
+
+def merge_signal_to_pin_maps(chunk_maps: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merges per-chunk maps in chunk order. Peripherals, signals and options then appear in
+    the same order as in a single pass over the whole section.
+    """
+    mapping: Dict[str, Any] = {}
+    for chunk_map in chunk_maps:
+        for peri_id, signals in chunk_map.items():
+            merged = mapping.setdefault(peri_id, {})
+            for sig_id, options in signals.items():
+                merged.setdefault(sig_id, []).extend(options)
+    return mapping
+
+
+def parse_signal_to_pin_map_parallel(pins: List[bytes],
+                                     workers: int,
+                                     log=Logger,
+                                     only: Optional[Set[str]] = None,
+                                     pin_properties: Optional[PinStates] = None,
+                                     controller_type: Optional[str] = None,
+                                     pin_locations: Optional[Dict[str, PinLocation]] = None) -> Dict[str, Any]:
+    """
+    Parses raw <pin> elements (see split_pins_section) in a process pool. The pins are cut
+    into a few contiguous chunks per worker so that a slow chunk does not hold up the rest.
+    The functional properties and locations of the pins are collected into `pin_properties`
+    and `pin_locations`, when given.
+    """
+    if not pins:
+        # e.g. a selection that matches no pin; there is nothing to hand to the pool
+        log.debug("No pins to parse")
+        return {}
+    chunk_count = min(len(pins), workers * 4)
+    size = -(-len(pins) // chunk_count)
+    chunks = [b"".join(pins[i:i + size]) for i in range(0, len(pins), size)]
+    log.debug("Parsing %d pins in %d chunks with %d workers", len(pins), len(chunks), workers)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(parse_pins_chunk, chunks, [only] * len(chunks), [controller_type] * len(chunks)))
+    mapping = merge_signal_to_pin_maps(chunk_map for chunk_map, _, _ in results)
+    for _, chunk_properties, chunk_locations in results:
+        if pin_properties is not None:
+            pin_properties.update(chunk_properties)
+        if pin_locations is not None:
+            pin_locations.update(chunk_locations)
+    log.debug("Mapped signals for %d peripherals", len(mapping))
+    return mapping
@@ -0,0 +1,114 @@
+import re
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, NamedTuple, Optional, Tuple
+
+# Controller family assumed when the processor is not known, e.g. for data without a .mex
+DEFAULT_CONTROLLER = "PORT"
+
+
+class PinLocation(NamedTuple):
+    """
+    Where a pin sits on its pin controller. `offset` is the byte offset of the pin's mux
+    register from the controller block, or None when the pin name does not determine it.
+    """
+    port: str
+    index: int
+    offset: Optional[int]
+
+
+class PinDecoder:
+    """
+    Decodes the pin names of one pin controller family. Names that cannot start with one of
+    `prefixes` are rejected without running the pattern. The first two groups the pattern
+    matches are the port and the pin index.
+    """
+    controller_type: str = ""
+    prefixes: Tuple[str, ...] = ()
+    pattern: "re.Pattern[str]" = re.compile(r"(?!)")
+
+    def decode(self, name: str) -> Optional[PinLocation]:
+        if not name.startswith(self.prefixes):
+            return None
+        match = self.pattern.fullmatch(name)
+        if match is None:
+            return None
+        port, index = [g for g in match.groups() if g is not None][:2]
+        index = int(index)
+        return PinLocation(port, index, self.offset(port, index))
+
+    def offset(self, port: str, index: int) -> Optional[int]:
+        return None
+
+    def locate(self, names: Iterable[str]) -> Dict[str, PinLocation]:
+        """Decodes every routable name at once; names the decoder rejects are left out."""
+        locations: Dict[str, PinLocation] = {}
+        for name in names:
+            if name not in locations:
+                location = self.decode(name)
+                if location is not None:
+                    locations[name] = location
+        return locations
+
+
+PIN_DECODERS: Dict[str, PinDecoder] = {}
+
+
+def register_pin_decoder(*controller_types: str) -> Callable[[type], type]:
+    """Registers a PinDecoder subclass for the controller types of get_controller_type."""
+    def decorator(cls: type) -> type:
+        for controller_type in controller_types:
+            decoder = cls()
+            decoder.controller_type = controller_type
+            PIN_DECODERS[controller_type] = decoder
+        return cls
+    return decorator
+
+
+def decoder_for(controller_type: Optional[str]) -> PinDecoder:
+    """The decoder of a controller type; None selects DEFAULT_CONTROLLER."""
+    decoder = PIN_DECODERS.get(controller_type or DEFAULT_CONTROLLER)
+    if decoder is None:
+        raise ValueError(f"No pin decoder for controller type {controller_type!r}, expected one of {', '.join(PIN_DECODERS)}")
+    return decoder
+
+
+@register_pin_decoder("PORT")
+class PortPinDecoder(PinDecoder):
+    """
+    Kinetis and MCX PORT modules: PTB16 (port B, pin 16) or P1_4 (port 1, pin 4). Each pin
+    has a 32-bit PCR at index * 4 from its PORT block.
+    """
+    prefixes = ("PT", "P0", "P1", "P2", "P3", "P4", "P5", "P6", "P7", "P8", "P9")
+    pattern = re.compile(r"PT([A-Z]{1,2})(\d+)|P(\d+)_(\d+)")
+
+    def offset(self, port: str, index: int) -> Optional[int]:
+        return index * 4
+
+
+@register_pin_decoder("IOCON")
+class IoconPinDecoder(PinDecoder):
+    """
+    LPC and i.MX RT5xx/6xx IOCON: PIO0_12 (port 0, pin 12). The PIO registers of all
+    ports follow each other, 32 pins per port.
+    """
+    prefixes = ("PIO",)
+    pattern = re.compile(r"PIO(\d+)_(\d+)")
+
+    def offset(self, port: str, index: int) -> Optional[int]:
+        return (int(port) * 32 + index) * 4
+
+
+@register_pin_decoder("IOMUX")
+class IomuxPinDecoder(PinDecoder):
+    """
+    i.MX RT1xxx IOMUXC pads: GPIO_AD_B0_03 (pad group GPIO_AD_B0, pad 3) or GPIO_EMC_12.
+    The SW_MUX_CTL register of a pad is not derived from its name, so the offset is None.
+    """
+    prefixes = ("GPIO_",)
+    pattern = re.compile(r"(GPIO_[A-Z0-9_]*?[A-Z][A-Z0-9]*)_(\d+)")
+
+
+@lru_cache(maxsize=4096)
+def decode_pin(name: str, controller_type: Optional[str] = None) -> Optional[PinLocation]:
+    """Memoized decode of one name, for callers without a precomputed location table."""
+    return decoder_for(controller_type).decode(name)
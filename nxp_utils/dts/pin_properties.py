@@ -0,0 +1,84 @@
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, List, Mapping, Optional, Tuple
+import xml.etree.ElementTree as ET
+
+# Pin -> functional property id -> state ids the pin accepts
+PinStates = Dict[str, Dict[str, FrozenSet[str]]]
+
+# Electrical settings of a board config entry that map to functional properties. Each field
+# names its property, except pull, which spans pull_enable and pull_select.
+CHECKED_FIELDS = ("pull", "drive_strength", "slew_rate", "open_drain", "passive_filter", "digital_filter")
+# Fields given as a bool or "enable"/"disable"
+ENABLE_FIELDS = frozenset(["open_drain", "passive_filter", "digital_filter"])
+
+
+def pin_functional_properties(pin: ET.Element) -> Dict[str, FrozenSet[str]]:
+    """
+    The functional properties of a <pin> element and their states, e.g.
+    <functional_properties><functional_property id="pull_select"><state id="up"/>...
+    """
+    properties: Dict[str, FrozenSet[str]] = {}
+    node = pin.find("functional_properties")
+    if node is None:
+        return properties
+    for prop in node.findall("functional_property"):
+        prop_id = prop.get("id")
+        if prop_id:
+            properties[prop_id] = frozenset(s.get("id") for s in prop.findall("state") if s.get("id"))
+    return properties
+
+
+def requested_states(field: str, value: Any) -> List[Tuple[str, str]]:
+    """(property id, state id) pairs a PinEntry setting asks for, e.g. pull "up" -> pull_enable/enable, pull_select/up."""
+    if value is None:
+        return []
+    if field == "pull":
+        if value in ("none", "disable"):
+            return [("pull_enable", "disable")]
+        return [("pull_enable", "enable"), ("pull_select", str(value))]
+    if field in ENABLE_FIELDS and isinstance(value, bool):
+        return [(field, "enable" if value else "disable")]
+    return [(field, str(value))]
+
+
+class PinPropertyIndex:
+    """
+    Functional property states each pin accepts, built while the <pins> section is parsed.
+
+    Pins that list their own functional properties are checked against that list, so a
+    property missing from it is unsupported on the pin. Other pins fall back to the
+    functional_properties_declarations of the part, where only the states of declared
+    properties can be checked. Every lookup is two dictionary probes and a set membership test.
+    """
+
+    def __init__(self, declarations: Optional[Mapping[str, Any]] = None, pins: Optional[PinStates] = None):
+        self.declared: Mapping[str, FrozenSet[str]] = MappingProxyType(
+            {prop_id: frozenset(prop.get("states", {})) for prop_id, prop in (declarations or {}).items()})
+        self.pins: Mapping[str, Mapping[str, FrozenSet[str]]] = MappingProxyType(
+            {pin: MappingProxyType(dict(props)) for pin, props in (pins or {}).items()})
+
+    def __bool__(self) -> bool:
+        return bool(self.declared) or bool(self.pins)
+
+    def states_of(self, pin: str, property_id: str) -> Optional[FrozenSet[str]]:
+        """Accepted states of a property on a pin; None when the data does not say."""
+        own = self.pins.get(pin)
+        if own is not None:
+            return own.get(property_id, frozenset())
+        return self.declared.get(property_id)
+
+    def check(self, pin: str, settings: Mapping[str, Any]) -> List[Tuple[str, str]]:
+        """Violations of the electrical settings of one board config entry, as (field, message) pairs."""
+        violations: List[Tuple[str, str]] = []
+        for field in CHECKED_FIELDS:
+            for property_id, state in requested_states(field, settings.get(field)):
+                allowed = self.states_of(pin, property_id)
+                if allowed is None or state in allowed:
+                    continue
+                if not allowed:
+                    violations.append((field, f"{pin} does not support {property_id} ({field}: {settings[field]})"))
+                else:
+                    shown = ", ".join(sorted(allowed))
+                    violations.append((field, f"{pin} does not support {property_id} state {state!r} "
+                                              f"({field}: {settings[field]}), allowed: {shown}"))
+        return violations
@@ -0,0 +1,215 @@
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+from .name_index import natural_key
+
+# Cell values of the mux code matrix
+NO_CONNECTION = 0xFF
+FIXED = 0xFE
+
+# A peripheral and the signals it needs; None means every signal of the peripheral
+Requirement = Tuple[str, Optional[Tuple[str, ...]]]
+
+_ALT = re.compile(r"(\d+)$")
+
+
+def parse_requirement(spec: str) -> Requirement:
+    """"UART1" -> ("UART1", None), "UART1:TX,RX" -> ("UART1", ("TX", "RX"))."""
+    name, _, signals = spec.partition(":")
+    return name.strip(), tuple(s.strip() for s in signals.split(",") if s.strip()) or None
+
+
+def mux_code(option: Dict[str, Any]) -> int:
+    """Mux register value of a pin option, or its ALT number when the option has none."""
+    if not option.get("is_routable", True) or option.get("mux_value") == "FIXED":
+        return FIXED
+    for value in (option.get("mux_value"), option.get("alt_mode")):
+        if not value:
+            continue
+        try:
+            return int(value, 0)
+        except ValueError:
+            match = _ALT.search(value)
+            if match:
+                return int(match.group(1))
+    return FIXED
+
+
+def iter_bits(bits: int) -> Iterator[int]:
+    """Indexes of the set bits, lowest first."""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+class PinmuxMatrix:
+    """
+    Dense pins x (peripheral, signal) view of a signal_to_pin_map.
+
+    Every column holds the mux code of each pin (NO_CONNECTION when the pin cannot carry the
+    signal) and a bitset of the pins that can. Bitsets are Python ints indexed by pin id, so
+    unions, intersections and population counts over all pins are single C-level operations.
+    Routing questions are answered by bipartite matching of the required signals to distinct
+    pins, with already used peripherals free to move to their alternative pins.
+    """
+
+    def __init__(self, pins: Sequence[str]):
+        self.pins: List[str] = list(pins)
+        self.pin_ids: Dict[str, int] = {pin: i for i, pin in enumerate(self.pins)}
+        self.columns: List[Tuple[str, str]] = []
+        self.codes: List[bytearray] = []
+        self.column_pins: List[int] = []
+        self.signals: Dict[str, List[str]] = {}
+        self.peripheral_pins: Dict[str, int] = {}
+        self._column_ids: Dict[Tuple[str, str], int] = {}
+
+    @classmethod
+    def from_signal_to_pin_map(cls, signal_to_pin_map: Mapping[str, Any]) -> "PinmuxMatrix":
+        pins = {opt["base_pin"] for signals in signal_to_pin_map.values() for options in signals.values() for opt in options}
+        matrix = cls(sorted(pins, key=natural_key))
+        for peri_id, signals in signal_to_pin_map.items():
+            for sig_id, options in signals.items():
+                matrix._add_column(peri_id, sig_id, options)
+        return matrix
+
+    def _add_column(self, peri_id: str, sig_id: str, options: Iterable[Dict[str, Any]]):
+        column_id = len(self.columns)
+        codes = bytearray([NO_CONNECTION]) * len(self.pins)
+        bits = 0
+        for opt in options:
+            pin_id = self.pin_ids[opt["base_pin"]]
+            codes[pin_id] = mux_code(opt)
+            bits |= 1 << pin_id
+        self.columns.append((peri_id, sig_id))
+        self.codes.append(codes)
+        self.column_pins.append(bits)
+        self._column_ids[(peri_id, sig_id)] = column_id
+        self.signals.setdefault(peri_id, []).append(sig_id)
+        self.peripheral_pins[peri_id] = self.peripheral_pins.get(peri_id, 0) | bits
+
+    def code(self, pin: str, peripheral: str, signal: str) -> Optional[int]:
+        """Mux code routing the signal to the pin, None when the pin cannot carry it."""
+        column_id = self._column_ids.get((peripheral, signal))
+        pin_id = self.pin_ids.get(pin)
+        if column_id is None or pin_id is None or self.codes[column_id][pin_id] == NO_CONNECTION:
+            return None
+        return self.codes[column_id][pin_id]
+
+    def pin_bits(self, pins: Iterable[str]) -> int:
+        """Bitset of the given pins; unknown pins are ignored."""
+        bits = 0
+        for pin in pins:
+            pin_id = self.pin_ids.get(pin)
+            if pin_id is not None:
+                bits |= 1 << pin_id
+        return bits
+
+    def pin_names(self, bits: int) -> List[str]:
+        return [self.pins[i] for i in iter_bits(bits)]
+
+    def peripherals_matching(self, name: str) -> List[str]:
+        """The peripheral itself if it exists, otherwise its instances, e.g. "I2C" -> I2C0, I2C1."""
+        if name in self.signals:
+            return [name]
+        return sorted((p for p in self.signals if p.startswith(name) and p[len(name):].isdigit()), key=natural_key)
+
+    def columns_of(self, requirement: Requirement) -> List[int]:
+        """Column ids of a requirement; KeyError for unknown peripherals or signals."""
+        peripheral, signals = requirement
+        if peripheral not in self.signals:
+            raise KeyError(f"Unknown peripheral {peripheral}")
+        unknown = [sig for sig in signals or () if (peripheral, sig) not in self._column_ids]
+        if unknown:
+            raise KeyError(f"Unknown signal {peripheral}_{unknown[0]}")
+        return [self._column_ids[(peripheral, sig)] for sig in (signals or self.signals[peripheral])]
+
+    def assign(self, requirements: Iterable[Requirement], blocked: int = 0) -> Optional[Dict[Tuple[str, str], str]]:
+        """
+        Routes every required signal to its own pin, avoiding the blocked pins. Returns the
+        (peripheral, signal) -> pin assignment, or None when no such routing exists.
+        """
+        columns = [column_id for requirement in requirements for column_id in self.columns_of(requirement)]
+        owners = self._match(columns, {}, blocked)
+        if owners is None:
+            return None
+        return {self.columns[columns[slot]]: self.pins[pin_id] for pin_id, slot in sorted(owners.items(), key=lambda item: item[1])}
+
+    def _match(self, columns: List[int], owners: Dict[int, int], blocked: int, start: int = 0) -> Optional[Dict[int, int]]:
+        """
+        Kuhn's augmenting path matching of columns[start:] on top of an existing matching
+        (pin id -> index into columns). Returns the extended matching or None.
+        """
+        owners = dict(owners)
+        for slot in range(start, len(columns)):
+            visited = [blocked]
+            if not self._augment(columns, owners, slot, visited):
+                return None
+        return owners
+
+    def _augment(self, columns: List[int], owners: Dict[int, int], slot: int, visited: List[int]) -> bool:
+        candidates = self.column_pins[columns[slot]] & ~visited[0]
+        for pin_id in iter_bits(candidates):
+            if visited[0] >> pin_id & 1:
+                continue
+            visited[0] |= 1 << pin_id
+            owner = owners.get(pin_id)
+            if owner is None or self._augment(columns, owners, owner, visited):
+                owners[pin_id] = slot
+                return True
+        return False
+
+    def routable(self,
+                 candidates: Iterable[Requirement],
+                 used: Iterable[Requirement] = (),
+                 blocked: int = 0) -> Dict[str, Dict[str, Any]]:
+        """
+        For each candidate, whether it can be routed together with every used peripheral.
+        Candidates are checked independently of each other. Each result holds the pins the
+        candidate would take, the number of its pins left free by the used peripherals and
+        blocked pins, and the used peripherals it shares pins with.
+        """
+        used = list(used)
+        used_columns = [column_id for requirement in used for column_id in self.columns_of(requirement)]
+        base = self._match(used_columns, {}, blocked)
+        if base is None:
+            raise ValueError("The used peripherals cannot be routed together")
+        occupied = blocked
+        for pin_id in base:
+            occupied |= 1 << pin_id
+
+        results: Dict[str, Dict[str, Any]] = {}
+        for requirement in candidates:
+            peripheral = requirement[0]
+            columns = self.columns_of(requirement)
+            result: Dict[str, Any] = {
+                "routable": False,
+                "pins": None,
+                "free_pins": (self.peripheral_pins[peripheral] & ~occupied).bit_count(),
+                "conflicts": sorted({p for p, _ in used if p != peripheral and self.peripheral_pins[p] & self.peripheral_pins[peripheral]},
+                                    key=natural_key),
+            }
+            # Every column needs at least one unblocked pin before matching is worth trying
+            if all(self.column_pins[column_id] & ~blocked for column_id in columns):
+                offset = len(used_columns)
+                owners = self._match(used_columns + columns, base, blocked, start=offset)
+                if owners is not None:
+                    slots = {slot: pin_id for pin_id, slot in owners.items() if slot >= offset}
+                    result["routable"] = True
+                    result["pins"] = {self.columns[columns[slot - offset]][1]: self.pins[slots[slot]] for slot in sorted(slots)}
+            results[peripheral] = result
+        return results
+
+    def exclusive(self, a: Requirement, b: Requirement, blocked: int = 0) -> bool:
+        """True when both can be routed on their own but not together."""
+        if self.assign([a], blocked) is None or self.assign([b], blocked) is None:
+            return False
+        return self.assign([a, b], blocked) is None
+
+    def sweep(self,
+              variants: Mapping[str, Iterable[str]],
+              candidates: Iterable[Requirement],
+              used: Iterable[Requirement] = ()) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """routable() for each board variant, given as variant name -> pins already taken."""
+        candidates = list(candidates)
+        used = list(used)
+        return {name: self.routable(candidates, used, self.pin_bits(pins)) for name, pins in variants.items()}
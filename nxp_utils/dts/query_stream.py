@@ -0,0 +1,231 @@
+import json
+import queue
+import sys
+import threading
+from logging import Logger
+from typing import Any, Callable, Dict, IO, List, Optional, Tuple
+from .loader import ConfigToolsDataLoader
+from ..logger import redirect_stdout_handlers
+from ..profiling import record_count, stage
+
+# Input lines read ahead of the query being answered
+DEFAULT_MAX_PENDING = 1024
+# Results written before stdout is flushed even when more input is waiting
+DEFAULT_FLUSH_EVERY = 256
+
+QueryHandler = Callable[["PinQueryIndex", Dict[str, Any]], Any]
+QUERY_HANDLERS: Dict[str, QueryHandler] = {}
+
+
+def register_query(*names: str) -> Callable[[QueryHandler], QueryHandler]:
+    """Registers a stream query handler: fn(index, query) -> JSON-serializable result."""
+    def decorator(fn: QueryHandler) -> QueryHandler:
+        for name in names:
+            QUERY_HANDLERS[name] = fn
+        return fn
+    return decorator
+
+
+class QueryError(ValueError):
+    """A malformed query; reported in the query's result line."""
+
+
+class PinQueryIndex:
+    """
+    Lookup tables over a signal_to_pin_map for the stream queries. Keys are upper-cased, so
+    lookups are case-insensitive. Every answer is prepared when the index is built; a query
+    is a dictionary lookup.
+    """
+
+    def __init__(self, signal_to_pin_map: Dict[str, Any]):
+        # "UART0_RX" -> [{pin, coords, mux_value, alt_mode, func_label}]
+        self.signal_pins: Dict[str, List[Dict[str, Any]]] = {}
+        # "PTB16" -> [{signal, peripheral, mux_value, alt_mode, func_label}]
+        self.pin_signals: Dict[str, List[Dict[str, Any]]] = {}
+        # Pin and function labels -> base pins, e.g. "UART0_RX" -> ["PTB16", "PTA15"]
+        self.label_pins: Dict[str, List[str]] = {}
+        # "PTB16" -> {pin, coords, routable} and coords -> the same record
+        self.pins: Dict[str, Dict[str, Any]] = {}
+        self.coords: Dict[str, Dict[str, Any]] = {}
+
+        for peri_id, signals in signal_to_pin_map.items():
+            for sig_id, options in signals.items():
+                signal_key = f"{peri_id}_{sig_id}"
+                rows = self.signal_pins.setdefault(signal_key.upper(), [])
+                for opt in options:
+                    base_pin = opt["base_pin"]
+                    rows.append({"pin": base_pin, "coords": opt["coords"], "mux_value": opt["mux_value"],
+                                 "alt_mode": opt["alt_mode"], "func_label": opt["func_label"]})
+                    self.pin_signals.setdefault(base_pin.upper(), []).append(
+                        {"signal": signal_key, "peripheral": peri_id, "mux_value": opt["mux_value"],
+                         "alt_mode": opt["alt_mode"], "func_label": opt["func_label"]})
+                    if base_pin.upper() not in self.pins:
+                        record = {"pin": base_pin, "coords": opt["coords"], "routable": opt["is_routable"]}
+                        self.pins[base_pin.upper()] = record
+                        self.coords[str(opt["coords"])] = record
+                    for label in (base_pin, opt["func_label"]):
+                        if label:
+                            pins = self.label_pins.setdefault(label.upper(), [])
+                            if base_pin not in pins:
+                                pins.append(base_pin)
+
+    def pin(self, name: str) -> Dict[str, Any]:
+        record = self.pins.get(name.upper())
+        if record is None:
+            raise QueryError(f"unknown pin {name!r}")
+        return record
+
+
+def _argument(query: Dict[str, Any], *names: str) -> str:
+    for name in names:
+        value = query.get(name)
+        if isinstance(value, (dict, list)):
+            raise QueryError(f"argument {name!r} must be a string, got {value!r}")
+        if value is not None:
+            return str(value)
+    raise QueryError(f"missing argument {names[0]!r}")
+
+
+@register_query("find_base_pin")
+def find_base_pin(index: PinQueryIndex, query: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """{"query": "find_base_pin", "name": "UART0_RX"}: base pins carrying a pin or function label."""
+    name = _argument(query, "name", "pin")
+    return [index.pins[pin.upper()] for pin in index.label_pins.get(name.upper(), ())]
+
+
+@register_query("pins_for_signal")
+def pins_for_signal(index: PinQueryIndex, query: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """{"query": "pins_for_signal", "signal": "UART0_RX"}: every pin option of a signal."""
+    return index.signal_pins.get(_argument(query, "signal").upper(), [])
+
+
+@register_query("signals_for_pin")
+def signals_for_pin(index: PinQueryIndex, query: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """{"query": "signals_for_pin", "pin": "PTB16"}: every signal a pin can carry."""
+    pin = _argument(query, "pin")
+    index.pin(pin)
+    return index.pin_signals.get(pin.upper(), [])
+
+
+@register_query("coords")
+def coords(index: PinQueryIndex, query: Dict[str, Any]) -> Dict[str, Any]:
+    """{"query": "coords", "pin": "PTB16"} or {"query": "coords", "coords": "63"}: a pin and its package coordinates."""
+    if query.get("coords") is not None:
+        at = _argument(query, "coords")
+        record = index.coords.get(at)
+        if record is None:
+            raise QueryError(f"no pin at coords {at!r}")
+        return record
+    return index.pin(_argument(query, "pin"))
+
+
+def answer(index: PinQueryIndex, line: str, line_number: int = 0) -> Tuple[Dict[str, Any], bool]:
+    """The result object of one NDJSON query line, and whether it succeeded."""
+    query_id = None
+    try:
+        query = json.loads(line)
+        if not isinstance(query, dict):
+            raise QueryError("a query must be a JSON object")
+        query_id = query.get("id")
+        name = query.get("query")
+        if not isinstance(name, str):
+            raise QueryError(f"\"query\" must be a string, got {name!r}")
+        handler = QUERY_HANDLERS.get(name)
+        if handler is None:
+            raise QueryError(f"unknown query {name!r}, expected one of {', '.join(QUERY_HANDLERS)}")
+        return {"id": query_id, "ok": True, "result": handler(index, query)}, True
+    except json.JSONDecodeError as e:
+        return {"id": query_id, "ok": False, "error": f"line {line_number}: invalid JSON: {e}"}, False
+    except QueryError as e:
+        return {"id": query_id, "ok": False, "error": str(e)}, False
+    except Exception as e:
+        # A failing handler fails its own query, not the stream
+        return {"id": query_id, "ok": False, "error": f"{type(e).__name__}: {e}"}, False
+
+
+def _read_ahead(stream: IO[str], lines: "queue.Queue[Optional[str]]"):
+    """Reader thread: queues input lines, blocking when `lines` is full; None marks the end."""
+    try:
+        for line in stream:
+            lines.put(line)
+    finally:
+        lines.put(None)
+
+
+def serve(index: PinQueryIndex, input_stream: IO[str], output_stream: IO[str],
+          max_pending: int = DEFAULT_MAX_PENDING, flush_every: int = DEFAULT_FLUSH_EVERY) -> Tuple[int, int]:
+    """
+    Answers NDJSON queries from input_stream with one NDJSON result line each, in input
+    order. A reader thread keeps at most `max_pending` lines ahead of the answers. Output is
+    flushed whenever no further input is waiting and after every `flush_every` results, so
+    an interactive client gets each answer at once while a batch is written in blocks.
+    Returns the number of answered and failed queries.
+    """
+    lines: "queue.Queue[Optional[str]]" = queue.Queue(maxsize=max(1, max_pending))
+    reader = threading.Thread(target=_read_ahead, args=(input_stream, lines), name="query-stream-reader", daemon=True)
+    reader.start()
+
+    answered = failed = unflushed = line_number = 0
+    dumps = json.JSONEncoder(separators=(",", ":")).encode
+    while True:
+        line = lines.get()
+        if line is None:
+            break
+        line_number += 1
+        if not line.strip():
+            continue
+        result, ok = answer(index, line, line_number)
+        answered += 1
+        failed += not ok
+        output_stream.write(dumps(result) + "\n")
+        unflushed += 1
+        if unflushed >= flush_every or lines.empty():
+            output_stream.flush()
+            unflushed = 0
+    output_stream.flush()
+    return answered, failed
+
+
+class QueryStream:
+    """Loads a ConfigToolsData archive once and answers NDJSON pin/signal queries from stdin."""
+
+    def __init__(self, logger: Logger, **kwargs):
+        self.log = logger
+        self.controller_type: Optional[str] = kwargs.get("controller_type")
+        self.input_stream: IO[str] = kwargs.get("input_stream") or sys.stdin
+        self.output_stream: IO[str] = kwargs.get("output_stream") or sys.stdout
+        self.max_pending: int = kwargs.get("max_pending") or DEFAULT_MAX_PENDING
+        self.loader = ConfigToolsDataLoader(logger=logger,
+                                            user_board_config_file=None,
+                                            data_file=kwargs.get("config_tools_data_file_path"),
+                                            mex_file=kwargs.get("mex_file_path"),
+                                            mode="query_stream",
+                                            parse_workers=kwargs.get("parse_workers") or 1)
+
+    def run(self) -> bool:
+        log: Logger = self.log
+        if self.output_stream is sys.stdout:
+            # stdout carries the results
+            redirect_stdout_handlers(log)
+
+        if not self.loader.load_all():
+            log.error("Failed to load ConfigToolsData archive", extra={"path": self.loader.data_file})
+            return False
+        signal_data = self.loader.load_signal_config(controller_type=self.controller_type)
+        if not signal_data:
+            log.error("Could not obtain signal configuration data. Aborting.")
+            return False
+
+        with stage(log, "query_stream.index") as info:
+            index = PinQueryIndex(signal_data.signal_to_pin_map)
+            info["pins"] = len(index.pins)
+            info["signals"] = len(index.signal_pins)
+        log.info("Ready for queries", extra={"queries": list(QUERY_HANDLERS)})
+
+        with stage(log, "query_stream.serve") as info:
+            answered, failed = serve(index, self.input_stream, self.output_stream, max_pending=self.max_pending)
+            info["answered"] = answered
+            info["failed"] = failed
+        record_count("query_stream.answered", answered)
+        record_count("query_stream.failed", failed)
+        return True
@@ -1,43 +1,155 @@
 import xml.etree.ElementTree as ET
 from logging import Logger
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable, FrozenSet
 from .utils import print_xml
 from pprint import pprint
-from .parsers import parse_functional_properties, parse_peripheral_types, parse_peripherals, parse_signal_to_pin_map
+from .parsers import (parse_functional_properties, parse_peripheral_types, parse_peripherals, parse_signal_to_pin_map,
+                      parse_signal_to_pin_map_parallel)
+from .pin_decoders import PinLocation
+from .pin_properties import PinPropertyIndex, PinStates
+from .parsers.pins_section import PINS_CLOSE, PINS_OPEN, select_pins, split_pins_section
+from ..profiling import record_count, stage
 
 
 class SignalConfiguration:
     """
     Parses signal_configuration.xml to provide mappings between 
     peripherals, signals, and physical pins.
+
+    With `selection`, only the given peripheral ids are materialized: pins without a
+    connection to them are dropped before XML parsing, and other peripherals, their types
+    and their connections are skipped. full() parses the complete data on first use.
+
+    With `workers` > 1, the <pins> section is cut out of the document and parsed in chunks
+    by a process pool; the result is the same as the serial parse.
+
+    Pin names are decoded once, during the parse, with the decoder of `controller_type`
+    (PORT, IOMUX or IOCON; default PORT). `pin_locations` maps every routable pin to its
+    port, index and register offset.
     """
 
-    def __init__(self, data: bytes, logger: Logger):
+    def __init__(self, data: bytes, logger: Logger, selection: Optional[Iterable[str]] = None, workers: int = 1,
+                 controller_type: Optional[str] = None):
         self.log = logger
+        self.controller_type = controller_type
+        self.selection: Optional[FrozenSet[str]] = frozenset(selection) if selection is not None else None
+        self.workers = max(1, workers or 1)
+        self._data = data
+        # Raw <pin> elements left to the process pool, when parsing in parallel
+        self._pins: Optional[List[bytes]] = None
+        self._full: Optional["SignalConfiguration"] = None
         self._root: Optional[ET.Element] = None
         self.part_num: str = None
         self.peripherals: Dict[str, Dict[str, Any]] = {}
         self.peripheral_types: Dict[str, Dict[str, Any]] = {}
         self.functional_properties: Dict[str, Dict[str, Any]] = {}
         self.signal_to_pin_map: Dict[str, Dict[str, Any]] = {}
+        # Functional property states accepted by each pin, see PinPropertyIndex
+        self.pin_properties: PinPropertyIndex = PinPropertyIndex()
+        # Base pin -> (port, index, register offset), see pin_decoders
+        self.pin_locations: Dict[str, PinLocation] = {}
 
         try:
             # Parse from bytes directly from the zip stream
-            self._root = ET.fromstring(data)
+            if self.selection is not None or self.workers > 1:
+                data = self._split_pins(data)
+            with stage(self.log, "parse.xml"):
+                self._root = ET.fromstring(data)
             self.log.debug("Signal configuration XML parsed successfully")
         except ET.ParseError as e:
             self.log.error(f"Failed to parse signal configuration XML: {e}")
 
         self._parse_xml()
 
+    @property
+    def is_complete(self) -> bool:
+        return self.selection is None
+
+    def full(self) -> "SignalConfiguration":
+        """The complete configuration; self when nothing was left out."""
+        if self.selection is None:
+            return self
+        if self._full is None:
+            with stage(self.log, "parse.full"):
+                self._full = SignalConfiguration(self._data, self.log, workers=self.workers, controller_type=self.controller_type)
+        return self._full
+
+    def _split_pins(self, data: bytes) -> bytes:
+        """
+        Cuts the <pin> elements out of the document. Pins not referencing a selected
+        peripheral are dropped; the rest are either put back or kept for the process pool.
+        """
+        with stage(self.log, "parse.select_pins") as info:
+            sections = split_pins_section(data)
+            if sections is None:
+                self.log.debug("Unexpected <pins> layout, parsing the whole document serially")
+                return data
+            head, pins, tail = sections
+            info["pins"] = len(pins)
+            if self.selection is not None:
+                selected = select_pins(pins, self.selection)
+                info["selected"] = len(selected)
+                record_count("parse.pins_skipped", len(pins) - len(selected))
+                pins = selected
+        if self.workers > 1:
+            self._pins = pins
+            return b"".join([head, PINS_OPEN, PINS_CLOSE, tail])
+        return b"".join([head, PINS_OPEN, *pins, PINS_CLOSE, tail])
+
     def _parse_xml(self):
         log: Logger = self.log
         self.part_num = self._root.find("./part_information/part_number").get('id')
         log.debug("Discovert part number: %s", self.part_num)
-        self.peripheral_types = parse_peripheral_types(self._root, self.log)
-        self.peripherals = parse_peripherals(self._root, self.peripheral_types, self.log)
-        self.functional_properties = parse_functional_properties(self._root, self.log)
-        self.signal_to_pin_map = parse_signal_to_pin_map(self._root, self.peripheral_types, self.peripherals, self.log)
+
+        selected_types = None
+        if self.selection is not None:
+            peripherals_node = self._root.find("peripherals")
+            selected_types = {node.get("peripheral_type") for node in (peripherals_node if peripherals_node is not None else [])
+                              if node.get("id") in self.selection}
+
+        with stage(log, "parse.peripheral_types"):
+            self.peripheral_types = parse_peripheral_types(self._root, self.log, only=selected_types)
+        with stage(log, "parse.peripherals"):
+            self.peripherals = parse_peripherals(self._root, self.peripheral_types, self.log, only=self.selection)
+        with stage(log, "parse.functional_properties"):
+            self.functional_properties = parse_functional_properties(self._root, self.log)
+        # The per-pin functional properties and locations are collected by the same pass over <pins>
+        pin_states: PinStates = {}
+        if self._pins is not None:
+            with stage(log, "parse.signal_to_pin_map", workers=self.workers, pins=len(self._pins)):
+                self.signal_to_pin_map = parse_signal_to_pin_map_parallel(self._pins, self.workers, self.log,
+                                                                          only=self.selection, pin_properties=pin_states,
+                                                                          controller_type=self.controller_type,
+                                                                          pin_locations=self.pin_locations)
+        else:
+            with stage(log, "parse.signal_to_pin_map"):
+                self.signal_to_pin_map = parse_signal_to_pin_map(self._root, self.peripheral_types, self.peripherals, self.log,
+                                                                 only=self.selection, pin_properties=pin_states,
+                                                                 controller_type=self.controller_type,
+                                                                 pin_locations=self.pin_locations)
+        self.pin_properties = PinPropertyIndex(self.functional_properties, pin_states)
+
+        for name, value in self.element_counts().items():
+            record_count(name, value)
+
+    def element_counts(self) -> Dict[str, int]:
+        """Sizes of the parsed data, used for statistics reports."""
+        if self._pins is not None:
+            pin_count = len(self._pins)
+        else:
+            pins_node = self._root.find("pins") if self._root is not None else None
+            pin_count = len(pins_node.findall("pin")) if pins_node is not None else 0
+        return {
+            "pins": pin_count,
+            "connections": sum(len(options) for signals in self.signal_to_pin_map.values() for options in signals.values()),
+            "peripherals": len(self.peripherals),
+            "peripheral_types": len(self.peripheral_types),
+            "signals": sum(len(spec["signals"]) for spec in self.peripheral_types.values()),
+            "functional_properties": len(self.functional_properties),
+            "functional_property_states": sum(len(prop["states"]) for prop in self.functional_properties.values()),
+            "pins_with_functional_properties": len(self.pin_properties.pins),
+            "decoded_pins": len(self.pin_locations),
+        }
 
     def get_peripheral_info(self, peripheral_id: str) -> Optional[Dict[str, Any]]:
         """Returns the full data tree for a given peripheral type (e.g., 'ADC')."""
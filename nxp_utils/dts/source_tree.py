@@ -0,0 +1,259 @@
+import hashlib
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Union
+
+INDENT = "    "
+
+
+class DtsCells:
+    """
+    A `< ... >` property value. Cells are kept as raw DTS text, e.g. "115200",
+    "&gpiob 22 (GPIO_ACTIVE_LOW)" or "K64_PSEL(B, 22, 0x1)".
+    Multiline values put every cell on its own line, comma separated, with an optional comment.
+    """
+    __slots__ = ("items", "comments", "multiline")
+
+    def __init__(self, items: Iterable[Any], comments: Optional[Iterable[Optional[str]]] = None, multiline: bool = False):
+        self.items: List[str] = [str(i) for i in items]
+        self.comments: Optional[List[Optional[str]]] = list(comments) if comments is not None else None
+        self.multiline = multiline
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, DtsCells) and self.items == other.items
+
+    def __hash__(self) -> int:
+        return hash(tuple(self.items))
+
+    def __repr__(self) -> str:
+        return f"<{' '.join(self.items)}>"
+
+
+# None is a boolean flag (`bias-pull-up;`), str is a quoted string, DtsCells is a cell list.
+PropertyValue = Union[None, str, DtsCells]
+
+
+@dataclass
+class DtsProperty:
+    name: str
+    value: PropertyValue = None
+    comment: Optional[str] = None
+    # A comment on its own line above the property, e.g. /* Audio Format Configuration */
+    leading_comment: Optional[str] = None
+
+    def __eq__(self, other) -> bool:
+        # Comments are cosmetic and do not take part in structural comparison
+        return isinstance(other, DtsProperty) and self.name == other.name and self.value == other.value
+
+    def __hash__(self) -> int:
+        return hash((self.name, self.value))
+
+
+class DtsNode:
+    """
+    A device tree node. Reference nodes (overlays) simply use a name such as "&pinctrl".
+    Properties and children are kept in insertion order and indexed by name.
+    """
+
+    def __init__(self, name: str, label: Optional[str] = None, comment: Optional[str] = None):
+        self.name = name
+        self.label = label
+        self.comment = comment
+        self.properties: Dict[str, DtsProperty] = {}
+        self.children: Dict[str, "DtsNode"] = {}
+
+    def __repr__(self) -> str:
+        return f"DtsNode({self.header()}, {len(self.properties)} properties, {len(self.children)} children)"
+
+    def header(self) -> str:
+        return f"{self.label}: {self.name}" if self.label else self.name
+
+    def set(self, name: str, value: PropertyValue = None, comment: Optional[str] = None,
+            leading_comment: Optional[str] = None) -> "DtsNode":
+        """Adds or replaces a property. Returns the node to allow chaining."""
+        self.properties[name] = DtsProperty(name, value, comment, leading_comment)
+        return self
+
+    def add_child(self, child: "DtsNode") -> "DtsNode":
+        """Adds a child node. A child with the same name is merged, as dtc would do."""
+        existing = self.children.get(child.name)
+        if existing is None:
+            self.children[child.name] = child
+            return child
+        existing.merge(child)
+        return existing
+
+    def merge(self, other: "DtsNode") -> "DtsNode":
+        """Merges another node into this one. Properties of `other` win; children merge recursively."""
+        if other.label:
+            self.label = other.label
+        for name, prop in other.properties.items():
+            self.properties[name] = prop
+        for child in other.children.values():
+            self.add_child(child)
+        return self
+
+    def iter_lines(self, depth: int = 0) -> Iterator[str]:
+        """Yields the serialized node line by line."""
+        pad = INDENT * depth
+        if self.comment:
+            yield f"{pad}/* {self.comment} */"
+        yield f"{pad}{self.header()} {{"
+        for prop in self.properties.values():
+            yield from _iter_property_lines(prop, depth + 1)
+        for child in self.children.values():
+            yield from child.iter_lines(depth + 1)
+        yield f"{pad}}};"
+
+
+def _iter_property_lines(prop: DtsProperty, depth: int) -> Iterator[str]:
+    pad = INDENT * depth
+    trailer = f" /* {prop.comment} */" if prop.comment else ""
+    value = prop.value
+    if prop.leading_comment:
+        yield f"{pad}/* {prop.leading_comment} */"
+
+    if value is None:
+        yield f"{pad}{prop.name};{trailer}"
+    elif isinstance(value, DtsCells):
+        if not value.multiline:
+            yield f"{pad}{prop.name} = <{' '.join(value.items)}>;{trailer}"
+            return
+        yield f"{pad}{prop.name} = <"
+        comments = value.comments or []
+        last = len(value.items) - 1
+        for i, item in enumerate(value.items):
+            comma = "," if i < last else ""
+            comment = comments[i] if i < len(comments) else None
+            note = f" /* {comment} */" if comment else ""
+            yield f"{pad}{INDENT}{item}{comma}{note}"
+        yield f"{pad}>;{trailer}"
+    else:
+        yield f"{pad}{prop.name} = \"{value}\";{trailer}"
+
+
+class DtsDocument:
+    """An ordered collection of top-level nodes, serialized with a blank line between them."""
+
+    def __init__(self, nodes: Optional[Iterable[DtsNode]] = None):
+        self.nodes: Dict[str, DtsNode] = {}
+        for node in nodes or []:
+            self.add(node)
+
+    def __repr__(self) -> str:
+        return f"DtsDocument({len(self.nodes)} nodes)"
+
+    def add(self, node: DtsNode) -> DtsNode:
+        """Adds a top-level node, merging it into an existing node of the same name."""
+        existing = self.nodes.get(node.name)
+        if existing is None:
+            self.nodes[node.name] = node
+            return node
+        existing.merge(node)
+        return existing
+
+    def merge(self, other: "DtsDocument") -> "DtsDocument":
+        for node in other.nodes.values():
+            self.add(node)
+        return self
+
+    def iter_lines(self) -> Iterator[str]:
+        for i, node in enumerate(self.nodes.values()):
+            if i:
+                yield ""
+            yield from node.iter_lines()
+
+    def write(self, stream: TextIO) -> int:
+        """Streams the document to a text stream. Returns the number of characters written."""
+        written = 0
+        for line in self.iter_lines():
+            written += stream.write(line)
+            written += stream.write("\n")
+        return written
+
+    def to_string(self) -> str:
+        return "".join(f"{line}\n" for line in self.iter_lines())
+
+
+@dataclass(frozen=True)
+class DtsChange:
+    path: str    # e.g. "&pinctrl/gpiob_default/group1"
+    kind: str    # "added", "removed" or "changed"
+    name: str    # property or node name
+    before: Any = None
+    after: Any = None
+
+
+def _property_key(prop: DtsProperty) -> tuple:
+    """The parts of a property that take part in comparison, see DtsProperty.__eq__."""
+    value = prop.value
+    return (prop.name, tuple(value.items) if isinstance(value, DtsCells) else value)
+
+
+def _digest(node: DtsNode, memo: Dict[int, bytes]) -> bytes:
+    """
+    Structural blake2b digest of a node; computed once per node within a diff call. Unlike
+    hash(), a 128-bit digest makes skipping a subtree on equal digests safe in practice.
+    """
+    key = id(node)
+    cached = memo.get(key)
+    if cached is None:
+        h = hashlib.blake2b(digest_size=16)
+        h.update(repr((node.name, node.label, [_property_key(p) for p in node.properties.values()])).encode("utf-8"))
+        for child in node.children.values():
+            h.update(_digest(child, memo))
+        cached = memo[key] = h.digest()
+    return cached
+
+
+def diff_nodes(before: DtsNode, after: DtsNode, path: str = "", memo: Optional[Dict[int, bytes]] = None) -> List[DtsChange]:
+    """
+    Compares two nodes structurally. Subtrees with equal digests are skipped without
+    being walked, so identical regions of large trees cost a single hash comparison.
+    """
+    memo = {} if memo is None else memo
+    changes: List[DtsChange] = []
+    node_path = f"{path}/{after.name}" if path else after.name
+
+    if _digest(before, memo) == _digest(after, memo):
+        return changes
+
+    if before.label != after.label:
+        changes.append(DtsChange(node_path, "changed", "label", before.label, after.label))
+
+    for name, prop in before.properties.items():
+        other = after.properties.get(name)
+        if other is None:
+            changes.append(DtsChange(node_path, "removed", name, prop.value, None))
+        elif other != prop:
+            changes.append(DtsChange(node_path, "changed", name, prop.value, other.value))
+    for name, prop in after.properties.items():
+        if name not in before.properties:
+            changes.append(DtsChange(node_path, "added", name, None, prop.value))
+
+    for name, child in before.children.items():
+        other = after.children.get(name)
+        if other is None:
+            changes.append(DtsChange(node_path, "removed", name, child, None))
+        else:
+            changes.extend(diff_nodes(child, other, node_path, memo))
+    for name, child in after.children.items():
+        if name not in before.children:
+            changes.append(DtsChange(node_path, "added", name, None, child))
+
+    return changes
+
+
+def diff_documents(before: DtsDocument, after: DtsDocument) -> List[DtsChange]:
+    """Structural diff of two documents, see diff_nodes."""
+    memo: Dict[int, bytes] = {}
+    changes: List[DtsChange] = []
+    for name, node in before.nodes.items():
+        other = after.nodes.get(name)
+        if other is None:
+            changes.append(DtsChange("", "removed", name, node, None))
+        else:
+            changes.extend(diff_nodes(node, other, "", memo))
+    for name, node in after.nodes.items():
+        if name not in before.nodes:
+            changes.append(DtsChange("", "added", name, None, node))
+    return changes
@@ -1,7 +1,45 @@
+import atexit
 import logging
 import json
 import sys
 from datetime import datetime, timezone
+from typing import Any, Callable
+
+# LogRecord attributes that are never copied into the JSON output
+STANDARD_ATTRS = frozenset([
+    'args', 'asctime', 'created', 'exc_info', 'exc_text',
+    'filename',
+    'funcName', 'levelname', 'levelno',
+    'lineno',
+    'module', 'msecs',
+    'message', 'msg', 'name', 'pathname', 'process', 'processName',
+    'relativeCreated', 'stack_info', 'thread', 'threadName'
+])
+# Attributes copied only when set
+NON_STANDARD_ATTRS = frozenset(['taskName'])
+
+
+class LazyValue:
+    """
+    Wraps an expensive log payload. The callable runs only when a record is actually
+    formatted, i.e. never for disabled levels, and on the writer thread for async loggers.
+    """
+    __slots__ = ("fn",)
+
+    def __init__(self, fn: Callable[[], Any]):
+        self.fn = fn
+
+    def __call__(self) -> Any:
+        return self.fn()
+
+    def __str__(self) -> str:
+        return str(self.fn())
+
+
+def lazy(fn: Callable[[], Any]) -> LazyValue:
+    """Marks a log argument or `extra` value for deferred evaluation, e.g. extra={"files": lazy(archive.namelist)}."""
+    return LazyValue(fn)
+
 
 class JsonFormatter(logging.Formatter):
     """Custom formatter to output logs in JSON format including 'extra' fields."""
@@ -13,26 +51,17 @@ class JsonFormatter(logging.Formatter):
             "name": record.name,
             "message": record.getMessage(),
         }
-        
+
         # Add 'extra' fields. Standard attributes are filtered out.
         # We check the record's __dict__ for custom attributes.
-        standard_attrs = [
-            'args', 'asctime', 'created', 'exc_info', 'exc_text', 
-            'filename',
-            'funcName', 'levelname', 'levelno', 
-            'lineno',
-            'module', 'msecs',
-            'message', 'msg', 'name', 'pathname', 'process', 'processName',
-            'relativeCreated', 'stack_info', 'thread', 'threadName'
-        ]
-        non_standard_attrs = ['taskName']
-
         for key, value in record.__dict__.items():
             # Skip standard boring stuff
-            if key in standard_attrs:
+            if key in STANDARD_ATTRS:
                 continue
-            if key in non_standard_attrs and value is None:
+            if value is None and key in NON_STANDARD_ATTRS:
                 continue
+            if isinstance(value, LazyValue):
+                value = value()
             log_record[key] = value
 
         return json.dumps(log_record)
@@ -43,15 +72,79 @@ class AssistantFilter(logging.Filter):
         record.taskName = "assistant"
         return True
 
-def setup_logger(name: str) -> logging.Logger:
-    """Configures and returns a logger with JSON formatting."""
+
+class DeferredQueueHandler(logging.Handler):
+    """
+    Queues records as they are. Unlike logging.handlers.QueueHandler, the message is not
+    rendered on the caller's thread; the listener's handlers format it on the writer thread.
+    """
+    def __init__(self, log_queue, listener=None):
+        super().__init__()
+        self.queue = log_queue
+        self.listener = listener
+
+    def emit(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except Exception:
+            self.handleError(record)
+
+
+def enable_async_logging(logger: logging.Logger):
+    """
+    Moves the logger's handlers behind a queue drained by a background writer thread.
+    The caller only pays for creating the record; formatting and I/O happen on the writer.
+    The queue is flushed when the process exits.
+    """
+    existing = [h for h in logger.handlers if isinstance(h, DeferredQueueHandler)]
+    if existing:
+        return existing[0].listener
+
+    # Imported here: logging.handlers pulls in socket and pickle
+    import queue
+    from logging.handlers import QueueListener
+
+    handlers = list(logger.handlers)
+    for handler in handlers:
+        logger.removeHandler(handler)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    queue_handler = DeferredQueueHandler(log_queue, listener)
+    logger.addHandler(queue_handler)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+
+def setup_logger(name: str, asynchronous: bool = False) -> logging.Logger:
+    """Configures and returns a logger with JSON formatting, optionally with an asynchronous writer."""
     logger = logging.getLogger(name)
-    
+
     if not logger.handlers:
         handler = logging.StreamHandler(sys.stdout)
         handler.setFormatter(JsonFormatter())
         logger.addHandler(handler)
         # Default level
         logger.setLevel(logging.INFO)
-        
-    return logger
\ No newline at end of file
+
+    if asynchronous:
+        enable_async_logging(logger)
+
+    return logger
+
+
+def redirect_stdout_handlers(logger: logging.Logger, stream=None):
+    """
+    Points the logger's handlers that write to stdout at `stream` (default stderr), also
+    behind an asynchronous writer. Used when stdout carries data, e.g. NDJSON results.
+    """
+    stream = stream or sys.stderr
+    handlers = list(logger.handlers)
+    for handler in logger.handlers:
+        listener = getattr(handler, "listener", None)
+        if listener is not None:
+            handlers.extend(listener.handlers)
+    for handler in handlers:
+        if isinstance(handler, logging.StreamHandler) and handler.stream is sys.stdout:
+            handler.setStream(stream)
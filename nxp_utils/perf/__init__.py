@@ -0,0 +1 @@
+"""Performance checks for the command line tools. Nothing here is imported by the CLI itself."""
@@ -0,0 +1,211 @@
+import json
+import logging
+import os
+import statistics
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import yaml
+
+from ..dts.artifacts import dump_device_data, load_device_data, normalize_device_data
+from ..dts.board_config import clear_fragment_cache, load_board_config
+from ..dts.builders import generate_board_dtsi, parse_peripheral_groups
+from ..dts.loader import ConfigToolsDataLoader
+from ..dts.signal_config import SignalConfiguration
+from .synthetic import SCALES, SyntheticPart, generate_board_config, generate_signal_configuration, write_archive
+
+DEFAULT_BASELINE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "benchmarks", "baseline.json"))
+DEFAULT_SCALES = ("k64f", "rt")
+DEFAULT_MAX_SLOWDOWN = 1.5
+
+# Board config entries used per scale
+BOARD_CONFIG_SIZES = {"k64f": 32, "rt": 128, "large": 1024}
+
+
+@dataclass
+class BenchmarkResult:
+    scale: str
+    case: str
+    runs: int
+    best_ms: float
+    median_ms: float
+
+    @property
+    def key(self) -> str:
+        return f"{self.scale}/{self.case}"
+
+    def baseline_entry(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class Regression:
+    key: str
+    baseline_ms: float
+    best_ms: float
+
+    @property
+    def slowdown(self) -> float:
+        return self.best_ms / self.baseline_ms if self.baseline_ms else float("inf")
+
+
+def _time(fn: Callable[[], Any], repeat: int) -> List[float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def calibrate(repeat: int = 9) -> float:
+    """
+    Best time of a fixed CPU-bound workload, in ms. Stored with the baseline so results
+    from a slower or busier machine are compared after scaling by the speed difference.
+    """
+    def workload():
+        table: Dict[str, int] = {}
+        for i in range(100000):
+            key = f"PT{'ABCDE'[i % 5]}{i % 32}"
+            table[key] = table.get(key, 0) + i
+        return sorted(table.items())
+
+    return round(min(_time(workload, repeat)), 3)
+
+
+def _quiet_logger() -> logging.Logger:
+    log = logging.getLogger("nxp_utils.bench")
+    log.setLevel(logging.CRITICAL)
+    log.propagate = False
+    return log
+
+
+def bench_scale(scale: str, part: SyntheticPart, workdir: str, repeat: int = 5) -> List[BenchmarkResult]:
+    """Benchmarks the loader, the signal configuration parser, the resolver and the DTSI generator on one part."""
+    log = _quiet_logger()
+    archive_path = write_archive(part, os.path.join(workdir, f"{scale}.zip"))
+    board_config_path = os.path.join(workdir, f"{scale}.yaml")
+    board_config_file = generate_board_config(part, BOARD_CONFIG_SIZES.get(scale, 64))
+    with open(board_config_path, "w") as f:
+        yaml.safe_dump(board_config_file, f, sort_keys=False)
+    board_config = board_config_file["board_config"]
+
+    def load_board_config_cold():
+        clear_fragment_cache()
+        load_board_config(board_config_path)
+
+    def load_all():
+        # Parsed board configs are cached per process; every run should read the file again
+        clear_fragment_cache()
+        loader = ConfigToolsDataLoader(logger=log, user_board_config_file=board_config_path, data_file=archive_path)
+        if not loader.load_all():
+            raise RuntimeError(f"Synthetic archive {archive_path} failed to load")
+
+    data = generate_signal_configuration(part)
+    signal_config = SignalConfiguration(data, log)
+    signal_to_pin_map = signal_config.signal_to_pin_map
+    device_data_path = os.path.join(workdir, f"{scale}.device_data.yaml")
+    dump_device_data(normalize_device_data(signal_config), device_data_path)
+
+    cases: Dict[str, Callable[[], Any]] = {
+        "loader.load_all": load_all,
+        "board_config.load": load_board_config_cold,
+        "signal_config.parse": lambda: SignalConfiguration(data, log),
+        "parse_peripheral_groups": lambda: parse_peripheral_groups(board_config, signal_to_pin_map, log,
+                                                                   pin_properties=signal_config.pin_properties),
+        "generate_board_dtsi": lambda: generate_board_dtsi(board_config, signal_to_pin_map, log, signal_config.peripherals,
+                                                           pin_properties=signal_config.pin_properties,
+                                                           pin_locations=signal_config.pin_locations,
+                                                           controller_type=signal_config.controller_type),
+        "artifacts.dump": lambda: dump_device_data(normalize_device_data(signal_config), device_data_path),
+        "artifacts.load": lambda: load_device_data(device_data_path),
+    }
+
+    results = []
+    for case, fn in cases.items():
+        timings = _time(fn, repeat)
+        results.append(BenchmarkResult(scale, case, repeat, round(min(timings), 3), round(statistics.median(timings), 3)))
+    return results
+
+
+def run_benchmarks(scales: Sequence[str] = DEFAULT_SCALES, repeat: int = 5) -> List[BenchmarkResult]:
+    unknown = [s for s in scales if s not in SCALES]
+    if unknown:
+        raise ValueError(f"Unknown benchmark scale(s): {', '.join(unknown)}; available: {', '.join(SCALES)}")
+    results: List[BenchmarkResult] = []
+    with tempfile.TemporaryDirectory(prefix="nxp_utils_bench_") as workdir:
+        for scale in scales:
+            results.extend(bench_scale(scale, SCALES[scale], workdir, repeat))
+    return results
+
+
+def load_baseline(path: str = DEFAULT_BASELINE_PATH) -> Dict[str, Any]:
+    """
+    Reads stored results: {"calibration_ms": float, "results": {"<scale>/<case>": {...}}}.
+    A missing file is an empty baseline.
+    """
+    if not os.path.exists(path):
+        return {"calibration_ms": None, "results": {}}
+    with open(path) as f:
+        data = json.load(f)
+    return {"calibration_ms": data.get("calibration_ms"), "results": data.get("results", {})}
+
+
+def save_baseline(results: Sequence[Any], calibration_ms: float, path: str = DEFAULT_BASELINE_PATH):
+    """
+    Stores results (anything with `key`, `best_ms` and `baseline_entry()`), keeping baseline
+    entries that were not run. Entries kept from an earlier run are rescaled to the new calibration.
+    """
+    stored = load_baseline(path)
+    factor = calibration_ms / stored["calibration_ms"] if stored["calibration_ms"] else 1.0
+    merged = {key: {**entry, "best_ms": round(entry["best_ms"] * factor, 3), "median_ms": round(entry["median_ms"] * factor, 3)}
+              for key, entry in stored["results"].items()}
+    merged.update({r.key: r.baseline_entry() for r in results})
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"calibration_ms": calibration_ms, "results": dict(sorted(merged.items()))}, f, indent=2)
+        f.write("\n")
+
+
+def machine_factor(baseline: Dict[str, Any], calibration_ms: Optional[float]) -> float:
+    """How much slower this machine currently is than the one that recorded the baseline."""
+    if not calibration_ms or not baseline.get("calibration_ms"):
+        return 1.0
+    return calibration_ms / baseline["calibration_ms"]
+
+
+def find_regressions(results: Sequence[Any],
+                     baseline: Dict[str, Any],
+                     max_slowdown: float = DEFAULT_MAX_SLOWDOWN,
+                     calibration_ms: Optional[float] = None) -> List[Regression]:
+    """Cases whose best time exceeds the (machine-adjusted) stored best time by more than max_slowdown times."""
+    factor = machine_factor(baseline, calibration_ms)
+    regressions = []
+    for r in results:
+        stored = baseline["results"].get(r.key)
+        if stored and r.best_ms > stored["best_ms"] * factor * max_slowdown:
+            regressions.append(Regression(r.key, round(stored["best_ms"] * factor, 3), r.best_ms))
+    return regressions
+
+
+def format_results(results: Sequence[Any],
+                   baseline: Optional[Dict[str, Any]] = None,
+                   calibration_ms: Optional[float] = None) -> str:
+    """Renders results as a table. Baseline times are shown adjusted to this machine."""
+    factor = machine_factor(baseline, calibration_ms) if baseline else 1.0
+    baseline = baseline["results"] if baseline else {}
+    width = max([len("case")] + [len(r.key) for r in results])
+    header = f"{'case':<{width}}  {'runs':>4}  {'best ms':>10}  {'median ms':>10}  {'baseline':>10}  {'ratio':>6}"
+    lines = [header, "-" * len(header)]
+    for r in results:
+        stored = baseline.get(r.key)
+        line = f"{r.key:<{width}}  {r.runs:>4}  {r.best_ms:>10.2f}  {r.median_ms:>10.2f}"
+        if stored:
+            expected = stored["best_ms"] * factor
+            line += f"  {expected:>10.2f}  {r.best_ms / expected:>6.2f}"
+        lines.append(line)
+    if calibration_ms:
+        lines.append(f"calibration {calibration_ms:.2f} ms, machine factor {factor:.2f}")
+    return "\n".join(lines)
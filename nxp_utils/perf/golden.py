@@ -0,0 +1,131 @@
+import difflib
+import glob
+import os
+import statistics
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+from ..assistant import Assistant
+from .bench import machine_factor
+
+REPO_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+DEFAULT_CORPUS_PATH = os.path.join(REPO_PATH, "config")
+DEFAULT_ARCHIVE_PATH = os.path.join("downloads", "ConfigToolsData_FRDM-K64F_v25_12.zip")
+DEFAULT_GOLDEN_BASELINE_PATH = os.path.join(REPO_PATH, "benchmarks", "golden_baseline.json")
+
+
+@dataclass
+class GoldenCase:
+    name: str
+    board_config_path: str
+    golden_path: str
+
+
+@dataclass
+class GoldenResult:
+    case: str
+    runs: int
+    best_ms: float
+    median_ms: float
+    peak_memory_bytes: int
+    # Unified diff against the golden file; empty when the output matches
+    diff: List[str] = field(default_factory=list, repr=False)
+
+    @property
+    def key(self) -> str:
+        return self.case
+
+    @property
+    def matches(self) -> bool:
+        return not self.diff
+
+    def baseline_entry(self) -> Dict[str, Any]:
+        return {"case": self.case, "runs": self.runs, "best_ms": self.best_ms, "median_ms": self.median_ms,
+                "peak_memory_bytes": self.peak_memory_bytes}
+
+
+def discover_cases(corpus_path: str = DEFAULT_CORPUS_PATH) -> List[GoldenCase]:
+    """Every board config (.yaml, .yml or .json) in the corpus directory with a sibling .dtsi golden file."""
+    cases = []
+    for path in sorted(glob.glob(os.path.join(corpus_path, "*"))):
+        stem, ext = os.path.splitext(path)
+        if ext.lower() not in (".yaml", ".yml", ".json"):
+            continue
+        golden_path = f"{stem}.dtsi"
+        if os.path.exists(golden_path):
+            cases.append(GoldenCase(os.path.basename(stem), path, golden_path))
+    return cases
+
+
+def _build(assistant: Assistant, case: GoldenCase, archive_path: str, output_path: str) -> float:
+    start = time.perf_counter()
+    ok = assistant.run(action="build_dts",
+                       config_tools_data_file_path=archive_path,
+                       user_board_config_file_path=case.board_config_path,
+                       output_dts_path=output_path)
+    elapsed = (time.perf_counter() - start) * 1000
+    if not ok:
+        raise RuntimeError(f"Build failed for golden case {case.name}")
+    return elapsed
+
+
+def run_case(case: GoldenCase, archive_path: str, workdir: str, repeat: int = 3,
+             assistant: Optional[Assistant] = None) -> GoldenResult:
+    """
+    Builds the case through Assistant.run(action="build_dts") and diffs the DTSI against its
+    golden file. Wall time is the best of `repeat` runs; peak memory comes from one extra
+    run under tracemalloc, which would otherwise inflate the timings.
+    """
+    assistant = assistant or Assistant(name="dtsperf")
+    output_path = os.path.join(workdir, case.name, os.path.basename(case.golden_path))
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+
+    timings = [_build(assistant, case, archive_path, output_path) for _ in range(max(1, repeat))]
+
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    try:
+        _build(assistant, case, archive_path, output_path)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+
+    with open(case.golden_path) as f:
+        expected = f.readlines()
+    with open(output_path) as f:
+        actual = f.readlines()
+    diff = list(difflib.unified_diff(expected, actual, fromfile=case.golden_path, tofile=output_path))
+
+    return GoldenResult(case.name, len(timings), round(min(timings), 3), round(statistics.median(timings), 3), peak_memory, diff)
+
+
+def run_golden(cases: Sequence[GoldenCase], archive_path: str, workdir: str, repeat: int = 3) -> List[GoldenResult]:
+    assistant = Assistant(name="dtsperf")
+    assistant.set_log_level("WARNING")
+    return [run_case(case, archive_path, workdir, repeat, assistant) for case in cases]
+
+
+def format_golden_results(results: Sequence[GoldenResult],
+                          baseline: Optional[Dict[str, Any]] = None,
+                          calibration_ms: Optional[float] = None) -> str:
+    """Renders results as a table. Baseline times are shown adjusted to this machine."""
+    factor = machine_factor(baseline, calibration_ms) if baseline else 1.0
+    stored_results = baseline["results"] if baseline else {}
+    width = max([len("case")] + [len(r.case) for r in results])
+    header = (f"{'case':<{width}}  {'output':>6}  {'best ms':>10}  {'median ms':>10}  {'peak KiB':>10}"
+              f"  {'baseline':>10}  {'ratio':>6}")
+    lines = [header, "-" * len(header)]
+    for r in results:
+        line = (f"{r.case:<{width}}  {'ok' if r.matches else 'DRIFT':>6}  {r.best_ms:>10.2f}  {r.median_ms:>10.2f}"
+                f"  {r.peak_memory_bytes / 1024:>10.1f}")
+        stored = stored_results.get(r.key)
+        if stored:
+            expected = stored["best_ms"] * factor
+            line += f"  {expected:>10.2f}  {r.best_ms / expected:>6.2f}"
+        lines.append(line)
+    return "\n".join(lines)
@@ -0,0 +1,112 @@
+import os
+import re
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+DTSBUILDER_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "bin", "dtsbuilder"))
+
+# Modules that must stay out of `dtsbuilder --help`; they are loaded by the action handlers.
+FORBIDDEN_MODULES = (
+    "yaml",
+    "zipfile",
+    "xml.etree.ElementTree",
+    "nxp_utils.dts.builder",
+    "nxp_utils.dts.loader",
+)
+
+# Handler modules -> modules they must not import at module level; each is imported on its
+# own, so a package __init__ re-exporting everything shows up here.
+HANDLER_FORBIDDEN_MODULES: Dict[str, Tuple[str, ...]] = {
+    "nxp_utils.dts.dts_import": (
+        "yaml",
+        "zipfile",
+        "concurrent.futures.process",
+        "nxp_utils.dts.builder",
+        "nxp_utils.dts.loader",
+        "nxp_utils.dts.signal_config",
+    ),
+}
+
+DEFAULT_BUDGET_MS = 100.0
+
+# import time:       self [us] |  cumulative | imported package
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+@dataclass
+class ImportTimeReport:
+    total_ms: float
+    budget_ms: float
+    # Cumulative time of top-level imports that the bare interpreter does not make, in ms
+    modules: Dict[str, float] = field(default_factory=dict)
+    forbidden: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return self.total_ms <= self.budget_ms and not self.forbidden
+
+    def format(self, top: int = 10) -> str:
+        lines = [f"import time {self.total_ms:.1f} ms (budget {self.budget_ms:.1f} ms)"]
+        for name, ms in sorted(self.modules.items(), key=lambda i: i[1], reverse=True)[:top]:
+            lines.append(f"  {ms:>8.1f} ms  {name}")
+        for name in self.forbidden:
+            lines.append(f"  forbidden import: {name}")
+        lines.append("OK" if self.ok else "FAILED")
+        return "\n".join(lines)
+
+
+def parse_import_time(stderr: str) -> Dict[str, Dict[str, int]]:
+    """
+    Parses `python -X importtime` output into {"top": {module: cumulative_us}, "all": {module: cumulative_us}}.
+    Top-level entries are those with no enclosing import; their cumulative times add up to the total.
+    """
+    top: Dict[str, int] = {}
+    everything: Dict[str, int] = {}
+    for line in stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if not match:
+            continue
+        cumulative = int(match.group(2))
+        name = match.group(4)
+        everything[name] = cumulative
+        # Nesting is shown by two extra spaces per level after the bar
+        if len(match.group(3)) <= 1:
+            top[name] = cumulative
+    return {"top": top, "all": everything}
+
+
+def _import_time(args: Sequence[str], python: str) -> Dict[str, Dict[str, int]]:
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    env.pop("PYTHONPROFILEIMPORTTIME", None)
+    result = subprocess.run([python, "-X", "importtime", *args], capture_output=True, text=True, env=env)
+    return parse_import_time(result.stderr)
+
+
+def measure_import_time(cli_args: Sequence[str] = ("--help",),
+                        budget_ms: float = DEFAULT_BUDGET_MS,
+                        entry: str = DTSBUILDER_PATH,
+                        python: Optional[str] = None,
+                        runs: int = 3) -> ImportTimeReport:
+    """
+    Runs the CLI entry under `python -X importtime` and reports the import time it adds on top
+    of the bare interpreter. The best of `runs` runs is kept to filter out scheduling noise.
+    The handler modules in HANDLER_FORBIDDEN_MODULES are checked for forbidden imports too.
+    """
+    python = python or sys.executable
+    baseline = _import_time(["-c", "pass"], python)["top"]
+
+    best: Optional[ImportTimeReport] = None
+    for _ in range(max(1, runs)):
+        measured = _import_time([entry, *cli_args], python)
+        modules = {name: us / 1000 for name, us in measured["top"].items() if name not in baseline}
+        forbidden = [name for name in FORBIDDEN_MODULES if name in measured["all"]]
+        report = ImportTimeReport(round(sum(modules.values()), 3), budget_ms, modules, forbidden)
+        if best is None or report.total_ms < best.total_ms:
+            best = report
+
+    for module, forbidden_modules in HANDLER_FORBIDDEN_MODULES.items():
+        imported = _import_time(["-c", f"import {module}"], python)["all"]
+        best.forbidden.extend(f"{name} (via {module})" for name in forbidden_modules if name in imported)
+    return best
@@ -0,0 +1,209 @@
+import zipfile
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Tuple
+from xml.sax.saxutils import quoteattr
+
+# Peripheral type -> signals. GPIO is always muxed on alt1, the others rotate over alt2..altN.
+PERIPHERAL_TYPES: Dict[str, List[str]] = {
+    "GPIO": ["GPIO"],
+    "UART": ["TX", "RX", "CTS_b", "RTS_b"],
+    "I2S": ["TX_BCLK", "TX_FS", "RXD0", "TXD0", "MCLK"],
+    "SPI": ["SCK", "SIN", "SOUT", "PCS0"],
+    "I2C": ["SCL", "SDA"],
+    "ADC": ["SE"],
+}
+
+FUNCTIONAL_PROPERTIES: Dict[str, List[str]] = {
+    "pull_select": ["up", "down"],
+    "pull_enable": ["enable", "disable"],
+    "drive_strength": ["low", "high"],
+    "slew_rate": ["fast", "slow"],
+    "open_drain": ["enable", "disable"],
+    "passive_filter": ["enable", "disable"],
+}
+
+
+@dataclass(frozen=True)
+class SyntheticPart:
+    """Shape of a generated ConfigToolsData archive. Pins are named PT<port><index>."""
+    processor: str = "MK64FN1M0xxx12"
+    package: str = "MK64FN1M0VLL12"
+    board: str = "FRDM-K64F"
+    data_version: str = "25.12"
+    ports: str = "ABCDE"
+    pins_per_port: int = 32
+    # Number of package functions per pin, alt1 (GPIO) included
+    alternates: int = 4
+    # Instances per non-GPIO peripheral type
+    instances: Dict[str, int] = field(default_factory=lambda: {"UART": 3, "I2S": 1, "SPI": 3, "I2C": 3, "ADC": 1})
+
+    @property
+    def pin_count(self) -> int:
+        return len(self.ports) * self.pins_per_port
+
+    @property
+    def processor_data_path(self) -> str:
+        return f"processors/{self.processor}/ksdk2_0/{self.package}"
+
+    @property
+    def mex_path(self) -> str:
+        return f"boards/{self.board}/ksdk2_0/{self.board}.mex"
+
+
+# From a K64F-sized part to an i.MX RT-sized pin count and beyond
+SCALES: Dict[str, SyntheticPart] = {
+    "k64f": SyntheticPart(),
+    "rt": SyntheticPart(processor="MKSYN1M0xxx20", package="MKSYN1M0VMM20", board="SYN-RT",
+                        pins_per_port=80, alternates=8,
+                        instances={"UART": 8, "I2S": 4, "SPI": 4, "I2C": 4, "ADC": 2}),
+    "large": SyntheticPart(processor="MKSYN8M0xxx20", package="MKSYN8M0VZZ20", board="SYN-LARGE",
+                           pins_per_port=4000, alternates=8,
+                           instances={"UART": 64, "I2S": 16, "SPI": 32, "I2C": 32, "ADC": 8}),
+}
+
+# (name_part, package_function, peripheral, signal, mux value, description)
+Connection = Tuple[str, str, str, str, str, str]
+
+
+def peripherals_of(part: SyntheticPart) -> Dict[str, str]:
+    """Peripheral instance -> peripheral type, GPIO ports first."""
+    peripherals = {f"GPIO{port}": "GPIO" for port in part.ports}
+    for peri_type, count in part.instances.items():
+        for i in range(count):
+            peripherals[f"{peri_type}{i}"] = peri_type
+    return peripherals
+
+
+def pin_functional_properties(n: int) -> Dict[str, List[str]]:
+    """
+    Functional properties of the n-th pin. Every eighth pin has no passive filter and a
+    low drive strength only, as on parts where some pads lack those options.
+    """
+    if n % 8 != 7:
+        return FUNCTIONAL_PROPERTIES
+    properties = {prop: states for prop, states in FUNCTIONAL_PROPERTIES.items() if prop != "passive_filter"}
+    properties["drive_strength"] = ["low"]
+    return properties
+
+
+def iter_pins(part: SyntheticPart) -> Iterator[Tuple[str, int, int, List[Connection]]]:
+    """Yields (port, index, coords, connections) for every routable pin, deterministically."""
+    peripherals = peripherals_of(part)
+    others = [p for p, t in peripherals.items() if t != "GPIO"]
+    coords = 0
+    for port_number, port in enumerate(part.ports):
+        for index in range(part.pins_per_port):
+            coords += 1
+            n = port_number * part.pins_per_port + index
+            connections: List[Connection] = [(f"PT{port}{index}", "alt1", f"GPIO{port}", "GPIO", "0x1",
+                                              f"General purpose IO, Port {port}, bit {index}")]
+            for alt in range(2, part.alternates + 1):
+                peri_id = others[(n * (part.alternates - 1) + alt) % len(others)]
+                signals = PERIPHERAL_TYPES[peripherals[peri_id]]
+                sig_id = signals[(n + alt) % len(signals)]
+                connections.append((f"{peri_id}_{sig_id}", f"alt{alt}", peri_id, sig_id, f"0x{alt:x}", f"{peri_id} {sig_id}"))
+            yield port, index, coords, connections
+
+
+def generate_signal_configuration(part: SyntheticPart) -> bytes:
+    """Renders signal_configuration.xml for the part."""
+    peripherals = peripherals_of(part)
+    x = ['<?xml version="1.0" encoding="UTF-8"?>', "<signal_configuration>",
+         f"<part_information><part_number id={quoteattr(part.package)}/></part_information>", "<peripheral_types>"]
+    for peri_type, signals in PERIPHERAL_TYPES.items():
+        x.append(f'<peripheral_type id="{peri_type}" name="{peri_type}" description="{peri_type} type">')
+        x.extend(f'<peripheral_signal id="{s}" directions="inOut"/>' for s in signals)
+        x.append("</peripheral_type>")
+    x.append("</peripheral_types>")
+
+    x.append("<peripherals>")
+    x.extend(f'<peripheral id="{p}" name="{p}" peripheral_type="{t}"/>' for p, t in peripherals.items())
+    x.append("</peripherals>")
+
+    x.append("<functional_properties_declarations>")
+    for prop, states in FUNCTIONAL_PROPERTIES.items():
+        x.append(f'<functional_property_declaration id="{prop}" name="{prop}" description="{prop}">'
+                 f'<applicable_mode directions="inOut"/>')
+        x.extend(f'<state_declaration id="{s}" name="{s}" description="{s}"/>' for s in states)
+        x.append("</functional_property_declaration>")
+    x.append("</functional_properties_declarations>")
+
+    x.append("<pins>")
+    coords = 0
+    for port, index, coords, connections in iter_pins(part):
+        names = "/".join(c[0] for c in connections)
+        descriptions = ";".join(c[5] for c in connections)
+        x.append(f'<pin name={quoteattr(names)} description={quoteattr(descriptions)} coords="{coords}">')
+        x.append("<functional_properties>")
+        for prop, states in pin_functional_properties(coords - 1).items():
+            x.append(f'<functional_property id="{prop}" default="{states[-1]}">'
+                     + "".join(f'<state id="{s}"/>' for s in states) + "</functional_property>")
+        x.append("</functional_properties>")
+        for name_part, function, peri_id, sig_id, mux, _ in connections:
+            x.append(f'<connections name_part="{name_part}" package_function="{function}"><connection>'
+                     f'<peripheral_signal_ref peripheral="{peri_id}" signal="{sig_id}"/>'
+                     f'<configuration><assign register="PORT{port}_PCR{index}" bit_field="MUX" bit_field_value="{mux}"/>'
+                     f'</configuration></connection></connections>')
+        x.append("</pin>")
+    # A non-routable supply pin, as found on every real part
+    x.append(f'<pin name="VDD1" description="Power" coords="{coords + 1}"><connections name_part="VDD1" package_function="power">'
+             f'<connection><peripheral_signal_ref peripheral="POWER" signal="VDD"/></connection></connections></pin>')
+    x.append("</pins></signal_configuration>")
+    return "\n".join(x).encode("utf-8")
+
+
+def generate_module_clocks(part: SyntheticPart) -> bytes:
+    """
+    Renders module_clocks.xml with a K64F-like tree: a 50 MHz oscillator, a 120 MHz core and a
+    60 MHz bus clock. The first two UARTs and the I2S instances run from the core clock.
+    """
+    x = ['<?xml version="1.0" encoding="UTF-8"?>', "<module_clocks>",
+         '<clock id="OSC0" frequency="50 MHz"/>',
+         '<clock id="MCGOUTCLK" source="OSC0" multiplier="12" divider="5"/>',
+         '<clock id="CORE_CLK" source="MCGOUTCLK" divider="1"/>',
+         '<clock id="BUS_CLK" source="MCGOUTCLK" divider="2"/>']
+    for peri_id, peri_type in peripherals_of(part).items():
+        if peri_type == "GPIO":
+            continue
+        clock = "CORE_CLK" if peri_id in ("UART0", "UART1") or peri_type == "I2S" else "BUS_CLK"
+        x.append(f'<module id="{peri_id}" clock="{clock}"/>')
+    x.append("</module_clocks>")
+    return "\n".join(x).encode("utf-8")
+
+
+def generate_mex(part: SyntheticPart) -> bytes:
+    """Renders a minimal .mex naming the part's processor, package and board."""
+    # MicrocontrollerExportConfiguration expects the legacy namespace for K64F boards
+    namespace = "mex_configuration_1.8" if "K64F" in part.board else "mex_configuration_14"
+    return (f'<?xml version="1.0" encoding="UTF-8"?>'
+            f'<configuration xmlns="http://mcuxpresso.nxp.com/XSD/{namespace}">'
+            f'<common><processor>{part.processor}</processor><package>{part.package}</package><board>{part.board}</board></common>'
+            f'<tools><pins version="1.8"/></tools></configuration>').encode("utf-8")
+
+
+def write_archive(part: SyntheticPart, path: str) -> str:
+    """Writes a ConfigToolsData-like zip: npidata.mf, the board .mex and processors/<proc>/ksdk2_0/<pkg>."""
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("npidata.mf", f"data_version={part.data_version}\n")
+        archive.writestr(part.mex_path, generate_mex(part))
+        archive.writestr(f"{part.processor_data_path}/signal_configuration.xml", generate_signal_configuration(part))
+        archive.writestr(f"{part.processor_data_path}/module_clocks.xml", generate_module_clocks(part))
+    return path
+
+
+def generate_board_config(part: SyntheticPart, count: int = 64) -> Dict[str, Any]:
+    """
+    A board config using `count` distinct pins: every fourth pin as a GPIO, the rest on the
+    peripheral function of one of their alternates. Every entry resolves against the part.
+    """
+    mapping: List[Dict[str, Any]] = []
+    for n, (port, index, _, connections) in enumerate(iter_pins(part)):
+        if len(mapping) >= count:
+            break
+        if n % 4 == 0 or len(connections) == 1:
+            mapping.append({"signal": f"GPIO{port}_{index}", "pin": f"PT{port}{index}", "label": f"GPIO_{port}{index}",
+                            "pull": "up", "drive_strength": "low"})
+            continue
+        name_part = connections[1 + n % (len(connections) - 1)][0]
+        mapping.append({"signal": name_part, "pin": f"PT{port}{index}", "slew_rate": "fast" if n % 2 else "slow"})
+    return {"board_config": {"name": f"{part.board}-synthetic", "mapping": mapping}}
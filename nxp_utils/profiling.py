@@ -0,0 +1,230 @@
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from logging import Logger
+from typing import Any, Callable, Dict, Iterator, List, Optional, TextIO
+
+
+@dataclass
+class StageRecord:
+    stage: str
+    start: float
+    duration_ms: float
+    depth: int
+    fields: Dict[str, Any] = field(default_factory=dict)
+    # Peak traced memory while the stage ran, when tracemalloc is active
+    peak_memory: Optional[int] = None
+
+
+class _MemoryFrame:
+    """Peak memory seen by a running stage, including its nested stages."""
+    __slots__ = ("peak",)
+
+    def __init__(self):
+        self.peak = 0
+
+
+class StageRecorder:
+    """Collects stage timings of one run. Safe to share between the threads of that run."""
+
+    def __init__(self):
+        self.records: List[StageRecord] = []
+        self.counts: Dict[str, int] = {}
+        self.outputs: Dict[str, int] = {}
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def add(self, record: StageRecord):
+        with self._lock:
+            self.records.append(record)
+
+    def count(self, name: str, value: int = 1):
+        with self._lock:
+            self.counts[name] = self.counts.get(name, 0) + value
+
+    def output(self, path: str):
+        """Records the size of a written output file."""
+        size = os.path.getsize(path)
+        with self._lock:
+            self.outputs[str(path)] = size
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Aggregates records per stage, in order of first start so nested stages follow their parent."""
+        rows: Dict[str, Dict[str, Any]] = {}
+        for r in sorted(self.records, key=lambda r: r.start):
+            row = rows.get(r.stage)
+            if row is None:
+                row = rows[r.stage] = {"stage": r.stage, "depth": r.depth, "count": 0, "total_ms": 0.0, "max_ms": 0.0}
+            row["count"] += 1
+            row["total_ms"] += r.duration_ms
+            row["max_ms"] = max(row["max_ms"], r.duration_ms)
+            if r.peak_memory is not None:
+                row["peak_memory_bytes"] = max(row.get("peak_memory_bytes", 0), r.peak_memory)
+        return list(rows.values())
+
+    def format_summary(self) -> str:
+        """Renders the per-stage summary as a plain text table."""
+        wall_ms = (time.perf_counter() - self.started) * 1000
+        rows = self.summary()
+        with_memory = any("peak_memory_bytes" in r for r in rows)
+        width = max([len("stage")] + [len(r["stage"]) + 2 * r["depth"] for r in rows])
+        header = f"{'stage':<{width}}  {'count':>5}  {'total ms':>10}  {'max ms':>10}  {'% wall':>6}"
+        if with_memory:
+            header += f"  {'peak KiB':>10}"
+        lines = [header, "-" * len(header)]
+        for r in rows:
+            name = "  " * r["depth"] + r["stage"]
+            share = 100 * r["total_ms"] / wall_ms if wall_ms else 0.0
+            line = f"{name:<{width}}  {r['count']:>5}  {r['total_ms']:>10.2f}  {r['max_ms']:>10.2f}  {share:>6.1f}"
+            if with_memory:
+                line += f"  {r.get('peak_memory_bytes', 0) / 1024:>10.1f}"
+            lines.append(line)
+        lines.append(f"{'wall time':<{width}}  {'':>5}  {wall_ms:>10.2f}")
+        return "\n".join(lines)
+
+    def to_stats(self) -> Dict[str, Any]:
+        """Machine-readable report of stage timings, peak memory, element counts and output sizes."""
+        stats: Dict[str, Any] = {
+            "wall_ms": round((time.perf_counter() - self.started) * 1000, 3),
+            "stages": [{**row, "total_ms": round(row["total_ms"], 3), "max_ms": round(row["max_ms"], 3)} for row in self.summary()],
+            "counts": dict(self.counts),
+            "outputs": dict(self.outputs),
+        }
+        if tracemalloc.is_tracing():
+            stats["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+        return stats
+
+
+_recorder: ContextVar[Optional[StageRecorder]] = ContextVar("nxp_utils_stage_recorder", default=None)
+_depth: ContextVar[int] = ContextVar("nxp_utils_stage_depth", default=0)
+_memory_frame: ContextVar[Optional[_MemoryFrame]] = ContextVar("nxp_utils_memory_frame", default=None)
+# Set for stages that run concurrently with their siblings, see concurrent_stages
+_concurrent: ContextVar[bool] = ContextVar("nxp_utils_concurrent_stages", default=False)
+
+
+def current_recorder() -> Optional[StageRecorder]:
+    return _recorder.get()
+
+
+def record_count(name: str, value: int = 1):
+    """Adds to a named counter of the active recorder, if any."""
+    recorder = _recorder.get()
+    if recorder is not None:
+        recorder.count(name, value)
+
+
+def record_output(path: str):
+    """Records the size of a written file in the active recorder, if any."""
+    recorder = _recorder.get()
+    if recorder is not None:
+        recorder.output(path)
+
+
+@contextmanager
+def recording() -> Iterator[StageRecorder]:
+    """Activates a StageRecorder for the current context (and contexts copied from it)."""
+    recorder = StageRecorder()
+    token = _recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _recorder.reset(token)
+
+
+@contextmanager
+def concurrent_stages() -> Iterator[None]:
+    """
+    Marks the stages started from this context, and from contexts copied from it, as running
+    concurrently. tracemalloc's peak is process-wide, so they record no peak memory of their
+    own; the stage enclosing the fan-out records the peak of all of them together.
+    """
+    token = _concurrent.set(True)
+    try:
+        yield
+    finally:
+        _concurrent.reset(token)
+
+
+@contextmanager
+def stage(log: Optional[Logger], name: str, **fields) -> Iterator[Dict[str, Any]]:
+    """
+    Times a pipeline stage. On exit the duration is logged at debug level as structured
+    `extra` fields and added to the active recorder, if any. The yielded dict may be used
+    to attach fields known only at the end of the stage, e.g. element counts.
+    """
+    depth = _depth.get()
+    token = _depth.set(depth + 1)
+
+    # tracemalloc keeps a single global peak. Fold it into the parent stage before resetting
+    # it for this stage, and fold this stage's peak back into the parent on exit.
+    frame = None
+    frame_token = None
+    if tracemalloc.is_tracing() and not _concurrent.get():
+        parent = _memory_frame.get()
+        if parent is not None:
+            parent.peak = max(parent.peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+        frame = _MemoryFrame()
+        frame_token = _memory_frame.set(frame)
+
+    start = time.perf_counter()
+    try:
+        yield fields
+    finally:
+        duration_ms = (time.perf_counter() - start) * 1000
+        _depth.reset(token)
+        peak_memory = None
+        if frame is not None:
+            frame.peak = peak_memory = max(frame.peak, tracemalloc.get_traced_memory()[1])
+            _memory_frame.reset(frame_token)
+            parent = _memory_frame.get()
+            if parent is not None:
+                parent.peak = max(parent.peak, peak_memory)
+            tracemalloc.reset_peak()
+        if log is not None:
+            log.debug("Stage completed", extra={"stage": name, "duration_ms": round(duration_ms, 3), **fields})
+        recorder = _recorder.get()
+        if recorder is not None:
+            recorder.add(StageRecord(name, start, duration_ms, depth, dict(fields), peak_memory))
+
+
+def run_instrumented(fn: Callable[[], Any],
+                     profile_path: Optional[str] = None,
+                     stats_path: Optional[str] = None,
+                     report: TextIO = sys.stderr) -> Any:
+    """
+    Runs fn with stage recording enabled.
+    With profile_path, fn runs under cProfile; the dump is written there and the per-stage
+    summary table is printed to `report`. With stats_path, tracemalloc is active for the run
+    and the statistics report is written there as JSON.
+    """
+    profiler = cProfile.Profile() if profile_path else None
+    started_tracing = False
+    if stats_path and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        started_tracing = True
+
+    with recording() as recorder:
+        if profiler:
+            profiler.enable()
+        try:
+            return fn()
+        finally:
+            if profiler:
+                profiler.disable()
+                profiler.dump_stats(profile_path)
+                print(recorder.format_summary(), file=report)
+                print(f"cProfile stats written to {profile_path}", file=report)
+            if stats_path:
+                with open(stats_path, "w") as f:
+                    json.dump(recorder.to_stats(), f, indent=2)
+                print(f"Statistics written to {stats_path}", file=report)
+            if started_tracing:
+                tracemalloc.stop()